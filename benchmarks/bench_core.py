@@ -0,0 +1,61 @@
+""" Benchmarks for routing conversions
+
+Run with ``python benchmarks/bench_core.py``.
+"""
+from __future__ import absolute_import, division, print_function
+
+import subprocess
+import sys
+from timeit import default_timer, repeat
+
+
+def import_time(module='odo', n=5):
+    """ Best wall time of importing ``module`` in a fresh interpreter """
+    code = ('from timeit import default_timer; s = default_timer(); '
+            'import %s; print(default_timer() - s)' % module)
+    return min(float(subprocess.check_output([sys.executable, '-c', code]))
+               for _ in range(n))
+
+
+def networkx_is_imported():
+    code = 'import sys, odo; print("networkx" in sys.modules)'
+    return subprocess.check_output([sys.executable, '-c', code]).strip()
+
+
+def path_latency(n=20):
+    """ Best time to find a path with and without the path cache """
+    import pandas as pd
+    from odo import convert
+    from odo.backends.csv import CSV
+
+    def uncached():
+        convert.clear_path_cache()
+        list(convert.path(CSV, pd.DataFrame))
+
+    def cached():
+        list(convert.path(CSV, pd.DataFrame))
+
+    def all_pairs():
+        convert.clear_path_cache()
+        start = default_timer()
+        nodes = convert.graph.nodes()
+        for a in nodes:
+            for b in nodes:
+                try:
+                    convert.path(a, b, ooc_types=())
+                except Exception:
+                    pass
+        return default_timer() - start
+
+    return (min(repeat(uncached, number=1, repeat=n)),
+            min(repeat(cached, number=1, repeat=n)),
+            min(all_pairs() for _ in range(3)))
+
+
+if __name__ == '__main__':
+    print('import odo:              %8.1f ms' % (1e3 * import_time()))
+    print('networkx imported:       %8s' % networkx_is_imported().decode())
+    uncached, cached, all_pairs = path_latency()
+    print('path(CSV, DataFrame):    %8.1f us' % (1e6 * uncached))
+    print('path(...) cached:        %8.1f us' % (1e6 * cached))
+    print('path() for all pairs:    %8.1f ms' % (1e3 * all_pairs))
@@ -0,0 +1,41 @@
+""" Import time of odo
+
+Run with ``python benchmarks/bench_import.py [max seconds]``. Exits with a
+non-zero status if importing odo takes longer than the given number of
+seconds or if it imports one of the heavy libraries that backends load
+lazily, see ``odo.backends``.
+"""
+from __future__ import absolute_import, division, print_function
+
+import subprocess
+import sys
+
+heavy = ['sqlalchemy', 'h5py', 'tables', 'dask.array', 'dask.dataframe',
+         'bokeh', 'pymongo', 'paramiko', 'boto', 'bcolz', 'pyspark']
+
+
+def import_time(code='import odo', n=5):
+    """ Best wall time of running ``code`` in a fresh interpreter """
+    code = ('from timeit import default_timer; s = default_timer(); '
+            '%s; print(default_timer() - s)' % code)
+    return min(float(subprocess.check_output([sys.executable, '-c', code]))
+               for _ in range(n))
+
+
+def imported_heavy_modules():
+    code = ('import sys, odo; '
+            'print(",".join(m for m in %r if m in sys.modules))' % heavy)
+    out = subprocess.check_output([sys.executable, '-c', code])
+    return [m for m in out.decode().strip().split(',') if m]
+
+
+if __name__ == '__main__':
+    lazy = import_time()
+    eager = import_time('import odo; odo.backends.load_all()')
+    print('import odo                     %8.1f ms' % (1e3 * lazy))
+    print('import odo and every backend   %8.1f ms' % (1e3 * eager))
+    modules = imported_heavy_modules()
+    if modules:
+        print('import odo imports %s' % ', '.join(modules))
+    if modules or len(sys.argv) > 1 and lazy > float(sys.argv[1]):
+        sys.exit(1)
@@ -0,0 +1,30 @@
+""" Per call overhead of small in-memory conversions
+
+Run with ``python benchmarks/bench_overhead.py``.
+"""
+from __future__ import absolute_import, division, print_function
+
+from timeit import repeat
+
+import pandas as pd
+
+from odo import odo, convert, resource
+from odo.utils import keywords
+
+
+def per_call(f, number=10000, n=5):
+    """ Best time per call of ``f`` in microseconds """
+    return 1e6 * min(repeat(f, number=number, repeat=n)) / number
+
+
+if __name__ == '__main__':
+    t = (1, 2, 3)
+    for name, f in [
+            ('odo(t, list)', lambda: odo(t, list)),
+            ("odo(t, list, dshape='3 * int64')",
+             lambda: odo(t, list, dshape='3 * int64')),
+            ('convert(list, t)', lambda: convert(list, t)),
+            ('keywords(pd.read_csv)', lambda: keywords(pd.read_csv)),
+            ("resource.dispatch('a.csv')",
+             lambda: resource.dispatch('a.csv'))]:
+        print('%-36s %8.1f us' % (name, per_call(f)))
@@ -1,9 +1,7 @@
 from __future__ import absolute_import, division, print_function
 
-try:
-    import h5py  #  h5py has precedence over pytables
-except:
-    pass
+import sys
+
 from multipledispatch import halt_ordering, restart_ordering
 
 halt_ordering()  # Turn off multipledispatch ordering
@@ -20,49 +18,41 @@ from .drop import drop
 from .temp import Temp
 from .backends.text import TextFile
 from .chunks import chunks, Chunks
-from datashape import discover, dshape
+from .recordbatch import RecordBatch
+from .calibration import calibrate
+from .trace import trace, Trace
+from .explain import explain
+from .plan import plan, Plan
+from .discovery import discover
+from datashape import dshape
 import numpy as np
 
-with ignoring(ImportError):
-    from .backends.sas import sas7bdat
 with ignoring(ImportError):
     from .backends.pandas import pd
-with ignoring(ImportError):
-    from .backends.bcolz import bcolz
-with ignoring(ImportError):
-    from .backends.h5py import h5py
 with ignoring(ImportError):
     from .backends.hdfstore import HDFStore
-with ignoring(ImportError):
-    from .backends.pytables import PyTables
-with ignoring(ImportError):
-    from .backends import sql
-with ignoring(ImportError):
-    from .backends import mongo
 with ignoring(ImportError):
     from .backends.csv import CSV
 with ignoring(ImportError):
     from .backends.json import JSON, JSONLines
-with ignoring(ImportError):
-    from .backends.hdfs import HDFS
-with ignoring(ImportError):
-    from .backends.ssh import SSH
-with ignoring(ImportError):
-    from .backends import sql_csv
-with ignoring(ImportError):
-    from .backends.aws import S3
-with ignoring(ImportError):
-    from .backends import sql_csv
-with ignoring(ImportError):
-    from .backends.bokeh import ColumnDataSource
-with ignoring(ImportError):
-    from .backends.spark import RDD
-with ignoring(ImportError):
-    from .backends.sparksql import SparkDataFrame
-with ignoring(ImportError):
-    from .backends.url import URL
-with ignoring(ImportError):
-    from .backends.dask import dask
+
+# The remaining backends are imported when first needed, see odo.backends
+from . import backends
+backends.install(resource)
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        value = globals()[name] = backends.load_export(name)
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(backends.exports()))
+else:
+    backends.load_all()
+    for _name in backends.exports():
+        with ignoring(AttributeError):
+            globals()[_name] = backends.load_export(_name)
+    del _name
 
 
 restart_ordering()  # Restart multipledispatch ordering and do ordering
@@ -2,6 +2,7 @@ from __future__ import absolute_import, division, print_function
 
 from multipledispatch import Dispatcher
 from datashape.dispatch import namespace
+from .backends import load_triggered
 from .convert import convert
 
 
@@ -10,6 +11,16 @@ if 'append' not in namespace:
 append = namespace['append']
 
 
+def appends_via(target):
+    """ Declare that an ``append`` implementation converts its source to
+    ``target`` and appends the result, see ``odo.explain``
+    """
+    def _(func):
+        func.appends_via = target
+        return func
+    return _
+
+
 @append.register(object, object)
 def append_not_found(a, b, **kwargs):
     """ Append one dataset on to another
@@ -22,6 +33,8 @@ def append_not_found(a, b, **kwargs):
     >>> data
     [1, 2, 3, 4, 5, 6]
     """
+    if load_triggered():
+        return append(a, b, **kwargs)
     raise NotImplementedError("Don't know how to append datasets of type "
             "%s on to type %s" % (type(b), type(a)))
 
@@ -33,6 +46,7 @@ def list_to_list(a, b, **kwargs):
 
 
 @append.register(list, object)
+@appends_via(list)
 def object_to_list(a, b, **kwargs):
     append(a, convert(list, b))
     return a
@@ -45,6 +59,7 @@ def set_to_set(a, b, **kwargs):
 
 
 @append.register(set, object)
+@appends_via(set)
 def object_to_set(a, b, **kwargs):
     append(a, convert(set, b))
     return a
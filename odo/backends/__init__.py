@@ -0,0 +1,216 @@
+""" Lazily loaded backends
+
+Backends that depend on heavy libraries are not imported with odo. Each one
+declares up front
+
+*   the modules to import to load it,
+*   the modules that trigger loading it once they have been imported by
+    anyone: an object of a type from ``sqlalchemy`` can only exist once
+    ``sqlalchemy`` has been imported, and
+*   the regular expressions of the URIs its ``resource`` functions handle,
+    and
+*   the attributes of the ``odo`` module it provides.
+
+``resource`` loads the backends whose patterns match a URI before dispatching
+on it. ``into``, ``NetworkDispatcher.path``, ``odo.discover``,
+``odo.discovery.cached_discover`` and the fallback implementation of
+``append`` load the backends whose trigger modules have been imported.
+``datashape.discover`` itself is left alone.
+"""
+from __future__ import absolute_import, division, print_function
+
+import importlib
+import sys
+from collections import namedtuple
+from threading import RLock
+
+__all__ = ('Backend', 'backends', 'exports', 'load', 'load_all',
+           'load_triggered', 'load_export', 'install')
+
+
+Backend = namedtuple('Backend', 'name modules triggers resources exports')
+
+
+def backend(name, modules=None, triggers=(), resources=(), exports=None):
+    return Backend(name, tuple(modules or ['odo.backends.%s' % name]),
+                   tuple(triggers), tuple(resources), exports or {})
+
+
+backends = [
+    backend('sas', triggers=['sas7bdat'],
+            resources=[r'.+\.(sas7bdat)'],
+            exports={'sas7bdat': 'odo.backends.sas:sas7bdat'}),
+    backend('bcolz', triggers=['bcolz'],
+            resources=[r'.*\.bcolz/?'],
+            exports={'bcolz': 'odo.backends.bcolz:bcolz'}),
+    backend('h5py', triggers=['h5py'],
+            resources=[r'h5py://.+',
+                       r'^(?!hdfstore).+\.(hdf5|h5)'],
+            exports={'h5py': 'odo.backends.h5py:h5py'}),
+    # h5py has precedence over pytables
+    backend('pytables', modules=['h5py', 'odo.backends.pytables'],
+            triggers=['tables'],
+            resources=[r'pytables://.+'],
+            exports={'PyTables': 'odo.backends.pytables:PyTables'}),
+    backend('sql', modules=['odo.backends.sql', 'odo.backends.sql_csv'],
+            triggers=['sqlalchemy'],
+            resources=[r'(.*sql.*|oracle|redshift)(\+\w+)?://.+',
+                       r'impala://.+',
+                       r'monetdb://.+',
+                       r'hive://.+'],
+            exports={'sql': 'odo.backends.sql',
+                     'sql_csv': 'odo.backends.sql_csv'}),
+    backend('mongo', triggers=['pymongo'],
+            resources=[r'mongodb://\w*:\w*@\w*.*',
+                       r'mongodb://.+'],
+            exports={'mongo': 'odo.backends.mongo'}),
+    backend('ssh', triggers=['paramiko'],
+            resources=[r'ssh://.+'],
+            exports={'SSH': 'odo.backends.ssh:SSH'}),
+    backend('hdfs', triggers=['pywebhdfs'],
+            resources=[r'hive://.+::.+',
+                       r'hdfs://.*'],
+            exports={'HDFS': 'odo.backends.hdfs:HDFS'}),
+    backend('aws', triggers=['boto'],
+            resources=[r's3://.*\.csv(\.gz)?',
+                       r's3://.*\*.csv(\.gz)?',
+                       r's3://.*\.txt(\.gz)?',
+                       r's3://.*\.json(\.gz)?',
+                       r's3://.*/$'],
+            exports={'S3': 'odo.backends.aws:S3'}),
+    backend('bokeh', triggers=['bokeh'],
+            exports={'ColumnDataSource':
+                     'odo.backends.bokeh:ColumnDataSource'}),
+    backend('spark', triggers=['pyspark'],
+            exports={'RDD': 'odo.backends.spark:RDD'}),
+    backend('sparksql', triggers=['pyspark'],
+            exports={'SparkDataFrame':
+                     'odo.backends.sparksql:SparkDataFrame'}),
+    backend('url',
+            resources=[r'ftp://.+',
+                       r'http://.+',
+                       r'https://.+'],
+            exports={'URL': 'odo.backends.url:URL'}),
+    backend('arrow', triggers=['pyarrow']),
+    backend('dask', triggers=['dask.array', 'dask.bag', 'dask.dataframe'],
+            exports={'dask': 'odo.backends.dask:dask'}),
+]
+
+
+_lock = RLock()
+_pending = dict((b.name, b) for b in backends)
+_exports = dict((name, b) for b in backends for name in b.exports)
+_checked = 0  # the number of imported modules when triggers were checked
+
+
+def exports():
+    """ The attributes of ``odo`` provided by lazily loaded backends """
+    return sorted(_exports)
+
+
+def load(b):
+    """ Import the modules of the backend ``b``
+
+    Returns whether the backend was loaded by this call. Backends whose
+    dependencies are not installed are skipped, as they were when odo
+    imported every backend eagerly.
+    """
+    from multipledispatch import halt_ordering, restart_ordering
+
+    with _lock:
+        if _pending.pop(b.name, None) is None:
+            return False
+        halt_ordering()
+        try:
+            for module in b.modules:
+                try:
+                    importlib.import_module(module)
+                except ImportError:
+                    pass
+        finally:
+            restart_ordering()
+    return True
+
+
+def load_all():
+    """ Load every backend """
+    for b in backends:
+        load(b)
+
+
+def load_triggered():
+    """ Load the backends whose trigger modules have been imported
+
+    Returns whether any backend was loaded.
+    """
+    global _checked
+    modules = sys.modules
+    if not _pending or len(modules) == _checked:
+        return False
+    _checked = len(modules)
+    triggered = [b for b in list(_pending.values())
+                 if any(t in modules for t in b.triggers)]
+    return any([load(b) for b in triggered])
+
+
+def load_export(name):
+    """ Load the backend that provides the attribute ``name`` of ``odo``
+
+    Raises AttributeError if no backend provides ``name`` or if it can not be
+    loaded.
+    """
+    try:
+        b = _exports[name]
+    except KeyError:
+        raise AttributeError("module 'odo' has no attribute %r" % name)
+    load(b)
+    module, _, attr = b.exports[name].partition(':')
+    try:
+        module = sys.modules[module]
+        return getattr(module, attr) if attr else module
+    except (KeyError, AttributeError):
+        raise AttributeError('%r is not available, the %s backend could not '
+                             'be imported' % (name, b.name))
+
+
+def install(resource):
+    """ Load backends lazily when ``resource`` matches their URIs """
+    for b in backends:
+        for regex in b.resources:
+            resource.add_lazy(regex, _loader(b))
+    import_h5py_first()
+
+
+def installed(name):
+    """ Whether the top level module ``name`` can be imported, without
+    importing it
+    """
+    try:
+        from importlib.util import find_spec
+    except ImportError:  # py2
+        from pkgutil import find_loader as find_spec
+    return find_spec(name) is not None
+
+
+def import_h5py_first():
+    """ Import h5py now if PyTables is installed too
+
+    h5py and PyTables both load the HDF5 library and odo has always imported
+    h5py before PyTables, as some builds of h5py fail to load once PyTables
+    has loaded its own. The ``pytables`` backend imports h5py first too, but
+    PyTables may also be imported by the user or another library before
+    odo's backend is loaded.
+    """
+    if 'h5py' in sys.modules or 'tables' in sys.modules:
+        return
+    if installed('tables') and installed('h5py'):
+        try:
+            importlib.import_module('h5py')
+        except Exception:
+            pass
+
+
+def _loader(b):
+    def loader():
+        return load(b)
+    return loader
@@ -0,0 +1,52 @@
+from __future__ import absolute_import, division, print_function
+
+import pyarrow as pa
+
+from datashape import discover
+
+from ..chunks import chunks
+from ..convert import convert
+from ..recordbatch import RecordBatch
+from ..utils import measure
+
+
+@discover.register((pa.RecordBatch, pa.Table))
+def discover_arrow(t, **kwargs):
+    sample = convert(RecordBatch, t.slice(0, 0))
+    return t.num_rows * discover(sample).subshape[0]
+
+
+@measure.register((pa.RecordBatch, pa.Table))
+def measure_arrow(t):
+    return t.num_rows, t.nbytes
+
+
+@convert.register(RecordBatch, pa.RecordBatch, cost=0.5)
+def arrow_to_record_batch(b, **kwargs):
+    return RecordBatch([(name, col.to_numpy(zero_copy_only=False))
+                        for name, col in zip(b.schema.names, b.columns)])
+
+
+@convert.register(pa.RecordBatch, RecordBatch, cost=0.5)
+def record_batch_to_arrow(b, **kwargs):
+    return pa.RecordBatch.from_arrays([pa.array(col) for col in b.columns],
+                                      names=[str(name) for name in b.names])
+
+
+@convert.register(RecordBatch, pa.Table, cost=1.0)
+def arrow_table_to_record_batch(t, **kwargs):
+    return RecordBatch([(name, col.to_numpy())
+                        for name, col in zip(t.schema.names, t.columns)])
+
+
+@convert.register(chunks(RecordBatch), pa.Table, cost=0.5)
+def arrow_table_to_record_batches(t, **kwargs):
+    batches = t.to_batches()
+    if not batches:
+        return chunks(RecordBatch)([convert(RecordBatch, t)])
+    return chunks(RecordBatch)([arrow_to_record_batch(b) for b in batches])
+
+
+@convert.register(pa.Table, chunks(RecordBatch), cost=1.0)
+def record_batches_to_arrow_table(c, **kwargs):
+    return pa.Table.from_batches([record_batch_to_arrow(b) for b in c])
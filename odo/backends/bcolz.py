@@ -8,11 +8,12 @@ import datashape
 from datashape import discover
 import shutil
 from ..numpy_dtype import dshape_to_numpy
-from ..append import append
+from ..append import append, appends_via
 from ..convert import convert, ooc_types
 from ..resource import resource
 from ..drop import drop
 from ..chunks import chunks
+from ..memory import chunk_rows
 
 keywords = ['cparams', 'dflt', 'expectedlen', 'chunklen', 'rootdir']
 
@@ -30,6 +31,7 @@ def numpy_append_to_bcolz(a, b, **kwargs):
 
 
 @append.register((ctable, carray), object)
+@appends_via(chunks(np.ndarray))
 def numpy_append_to_bcolz(a, b, **kwargs):
     return append(a, convert(chunks(np.ndarray), b, **kwargs), **kwargs)
 
@@ -58,7 +60,10 @@ def append_carray_with_chunks(a, c, **kwargs):
 
 
 @convert.register(chunks(np.ndarray), (ctable, carray), cost=1.2)
-def bcolz_to_numpy_chunks(x, chunksize=2**20, **kwargs):
+def bcolz_to_numpy_chunks(x, chunksize=None, memory_limit=None, **kwargs):
+    chunksize = chunk_rows(kwargs.get('dshape'), chunksize, memory_limit,
+                           data=x)
+
     def load():
         first_n = min(1000, chunksize)
         first = x[:first_n]
@@ -7,16 +7,16 @@ import gzip
 import bz2
 import uuid
 import csv
+from io import BytesIO
 from tempfile import NamedTemporaryFile
 
 from glob import glob
 from contextlib import contextmanager
 
-from toolz import concat, keyfilter, keymap, merge, valfilter
+from toolz import concat, dissoc, keyfilter, keymap, merge, valfilter
 
 import pandas as pd
 
-from dask.threaded import get as dsk_get
 import datashape
 
 from datashape import discover, Record, Option
@@ -24,11 +24,15 @@ from datashape.predicates import isrecord
 from datashape.dispatch import dispatch
 
 from ..compatibility import unicode, PY2
-from ..utils import keywords, ext, sample, tmpfile
-from ..append import append
-from ..convert import convert, ooc_types
-from ..resource import resource
+from .. import memory
+from ..discovery import cached_discover, file_fingerprint, fingerprint
+from ..utils import (keywords, ext, sample, tmpfile, measure, imap_windowed,
+                     uses_processes)
+from ..append import append, appends_via
+from ..convert import convert, ooc_types, chunk_task
+from ..resource import resource, resolves_to
 from ..chunks import chunks
+from ..memory import chunk_rows, in_memory_cost
 from ..temp import Temp
 from ..numpy_dtype import dshape_to_pandas
 from .pandas import coerce_datetimes
@@ -104,10 +108,19 @@ def open_file(path, *args, **kwargs):
 
 
 def infer_header(path, nbytes=10000, encoding='utf-8', **kwargs):
-    if encoding is None:
-        encoding = 'utf-8'
     with open_file(path, 'rb') as f:
         raw = f.read(nbytes)
+    return infer_header_bytes(raw, encoding=encoding)
+
+
+def infer_header_bytes(raw, encoding='utf-8'):
+    """ Whether the start ``raw`` of a CSV file is a header
+
+    >>> infer_header_bytes(b'name,amount\\nAlice,100\\nBob,200\\n')
+    True
+    """
+    if encoding is None:
+        encoding = 'utf-8'
     if not raw:
         return True
     sniffer = PipeSniffer()
@@ -126,10 +139,20 @@ def newlines(encoding):
 def sniff_dialect(path, nbytes, encoding='utf-8'):
     if not os.path.exists(path):
         return {}
+    with open_file(path, 'rb') as f:
+        raw = f.read(nbytes)
+    return sniff_dialect_bytes(raw, encoding=encoding)
+
+
+def sniff_dialect_bytes(raw, encoding='utf-8'):
+    """ The dialect of the start ``raw`` of a CSV file as a dict
+
+    >>> sniff_dialect_bytes(b'a;b\\n1;2\\n')['delimiter']
+    ';'
+    """
     if encoding is None:
         encoding = 'utf-8'
-    with open_file(path, 'rb') as f:
-        raw = f.read(nbytes).decode(encoding or 'utf-8', 'replace')
+    raw = raw.decode(encoding, 'replace')
     sniffer = PipeSniffer()
     try:
         dialect = sniffer.sniff(raw, delimiters=sniffer.preferred)
@@ -191,6 +214,7 @@ class CSV(object):
         self._kwargs = kwargs
         self._sniff_nbytes = sniff_nbytes
         self._buffer = buffer
+        self._sniff_cache = {}
 
         if path is not None and buffer is not None:
             raise ValueError("may only pass one of 'path' or 'buffer'")
@@ -198,31 +222,69 @@ class CSV(object):
         if path is None and buffer is None:
             raise ValueError("must pass one of 'path' or 'buffer'")
 
-    def _sniff_dialect(self, path):
-        kwargs = self._kwargs
-        dialect = sniff_dialect(path, self._sniff_nbytes,
-                                encoding=self.encoding)
-        kwargs = merge(dialect, keymap(alias, kwargs))
+    @property
+    def dialect(self):
+        dialect = self._sniffed('dialect', sniff_dialect_bytes)
+        kwargs = merge(dialect, keymap(alias, self._kwargs))
         return valfilter(lambda x: x is not None,
                          dict((d, kwargs[d])
                               for d in dialect_terms if d in kwargs))
 
-    @property
-    def dialect(self):
-        with sample(self) as fn:
-            return self._sniff_dialect(fn)
-
     @property
     def has_header(self):
         if self._has_header is None:
-            with sample(self) as fn:
-                with open(fn, mode='rb') as f:
-                    raw = f.read()
-                self._has_header = not raw or infer_header(fn,
-                                                           self._sniff_nbytes,
-                                                           encoding=self.encoding)
+            return self._sniffed('has_header', infer_header_bytes)
         return self._has_header
 
+    def _sniffed(self, name, sniff):
+        """ ``sniff(raw, encoding=...)`` of the first ``sniff_nbytes`` bytes
+        of the file, remembered until its size or modification time changes
+        """
+        key = file_fingerprint(self.path) if self.path is not None else None
+        cache = self._sniff_cache
+        if cache.get('key') != key or key is None:
+            cache = {'key': key}
+            if key is not None:
+                self._sniff_cache = cache
+        try:
+            return cache[name]
+        except KeyError:
+            if 'raw' not in cache:
+                cache['raw'] = self._sample_bytes()
+            value = cache[name] = sniff(cache['raw'], encoding=self.encoding)
+            return value
+
+    def _appended(self, key, header):
+        """ Keep what was sniffed from the file after appending to it
+
+        ``key`` is the ``file_fingerprint`` of the file before the append and
+        ``header`` whether a header was written. Rows are appended in the
+        dialect of the file, so unless the file was empty the dialect and
+        header are still valid for the grown file. A file that was empty has
+        a header if one was written.
+        """
+        cache = self._sniff_cache
+        new = {'key': file_fingerprint(self.path)}
+        if key and key[1]:
+            if cache.get('key') == key:
+                new.update((k, cache[k]) for k in ('dialect', 'has_header')
+                           if k in cache)
+        else:
+            new['has_header'] = header
+        self._sniff_cache = new
+
+    def _sample_bytes(self):
+        if (self._buffer is None and self.path is not None and
+                sample.dispatch(type(self)) is sample_csv):
+            if not os.path.exists(self.path):
+                return b''
+            with self.open(mode='rb') as f:
+                return f.read(self._sniff_nbytes)
+        # remote files and buffers
+        with sample(self) as fn:
+            with open(fn, mode='rb') as f:
+                return f.read(self._sniff_nbytes)
+
     def open(self, mode='rb', **kwargs):
         buf = self._buffer
         if buf is not None:
@@ -246,7 +308,25 @@ def sample_csv(csv, length=8192, **kwargs):
             yield fn
 
 
+@measure.register(CSV)
+def measure_csv(c):
+    if c.path is None or not os.path.exists(c.path):
+        return None, None
+    return None, os.path.getsize(c.path)
+
+
+@fingerprint.register(CSV)
+def fingerprint_csv(c):
+    fp = file_fingerprint(c.path) if c.path is not None else None
+    if fp is None:
+        return None
+    return (('file', 'CSV') + fp +
+            (c._has_header, c.encoding, c._sniff_nbytes,
+             repr(sorted(c._kwargs.items()))))
+
+
 @append.register(CSV, object)
+@appends_via(chunks(pd.DataFrame))
 def append_object_to_csv(c, seq, **kwargs):
     append(c, convert(chunks(pd.DataFrame), seq, **kwargs), **kwargs)
     return c
@@ -255,41 +335,181 @@ def append_object_to_csv(c, seq, **kwargs):
 compressed_open = {'gz': gzip.open, 'bz2': bz2.BZ2File}
 
 
+# keyword arguments of ``DataFrame.to_csv`` that change how rows look
+to_csv_terms = frozenset('''na_rep float_format quoting quotechar
+line_terminator lineterminator date_format doublequote escapechar
+decimal'''.split())
+
+
+def to_csv_kwargs(kwargs):
+    """ The formatting keyword arguments of ``DataFrame.to_csv`` in
+    ``kwargs``, under the names the installed pandas uses
+    """
+    kwargs = keyfilter(to_csv_terms.__contains__, kwargs)
+    accepted = keywords(pd.DataFrame.to_csv)
+    for a, b in [('lineterminator', 'line_terminator'),
+                 ('line_terminator', 'lineterminator')]:
+        if a in kwargs and a not in accepted:
+            kwargs[b] = kwargs.pop(a)
+    return keyfilter(accepted.__contains__, kwargs)
+
+
+def format_csv(df, header=True, sep=',', encoding='utf-8', **kwargs):
+    """ The rows of the DataFrame ``df`` as encoded CSV text
+
+    ``kwargs`` are passed on to ``DataFrame.to_csv``.
+
+    >>> print(format_csv(pd.DataFrame({'a': [1, 2]})).decode('utf-8').strip())
+    a
+    1
+    2
+    """
+    text = df.to_csv(None, header=header, index=False, sep=sep,
+                     encoding=encoding, **kwargs)
+    if not isinstance(text, bytes):  # Python 2 returns encoded text
+        text = text.encode(encoding)
+    return text
+
+
+# The size in bytes of the buffer between a ``CSVWriter`` and its file
+write_buffer_size = 2 ** 20
+
+
+def _gzip_writer(f, mode):
+    return gzip.GzipFile(fileobj=f, mode=mode)
+
+
+# compressors writing to an open file
+compressed_writers = {'gz': _gzip_writer, 'bz2': bz2.BZ2File}
+
+
+class CSVWriter(object):
+    """ A session appending DataFrames to a CSV file
+
+    The file is opened once, in binary append mode, and every DataFrame
+    written is formatted with the dialect and encoding of the file and
+    written through the same handle. Compressed files get a single
+    compressor, so a gzipped file gains one gzip member per session rather
+    than one per DataFrame. The header is written before the first
+    DataFrame if the file was empty and ``header`` (by default
+    ``c.has_header``) is true.
+
+    Parameters
+    ----------
+    c : CSV
+        The file to append to
+    buffer_size : int, optional
+        The size in bytes of the write buffer of the file, by default
+        ``write_buffer_size``
+    **kwargs
+        Formatting options of ``DataFrame.to_csv`` such as ``na_rep``,
+        ``quotechar`` or ``date_format``; others are ignored
+
+    Examples
+    --------
+    >>> with tmpfile('.csv') as fn:
+    ...     with CSVWriter(CSV(fn, has_header=True)) as w:
+    ...         w.write(pd.DataFrame({'a': [1, 2]}))
+    ...         w.write(pd.DataFrame({'a': [3]}))
+    ...     with open(fn) as f:
+    ...         print(f.read().split())
+    ['a', '1', '2', '3']
+    """
+    def __init__(self, c, buffer_size=None, header=None, sep=None,
+                 delimiter=None, encoding=None, mode='a', **kwargs):
+        self.csv = c
+        self._key = file_fingerprint(c.path)
+        if not self._key or not self._key[1]:
+            self.header = bool(c.has_header if header is None else header)
+        else:
+            self.header = False
+        self._wrote_header = self.header
+        self.sep = sep or delimiter or c.dialect.get('delimiter', ',')
+        self.encoding = encoding or c.encoding or 'utf-8'
+        self.kwargs = to_csv_kwargs(kwargs)
+        if buffer_size is None:
+            buffer_size = write_buffer_size
+        mode = mode.replace('t', '').replace('b', '') + 'b'
+        compression = ext(c.path)
+        if PY2 and compression == 'bz2':
+            # Python 2's BZ2File only opens files by name
+            self._file = self._stream = bz2.BZ2File(c.path, mode[0],
+                                                    buffer_size)
+            return
+        self._file = f = open(c.path, mode, buffer_size)
+        try:
+            compress = compressed_writers.get(compression)
+            self._stream = compress(f, mode) if compress else f
+        except Exception:
+            f.close()
+            raise
+
+    def format(self, df):
+        """ A function returning the bytes of ``df`` as rows of the file
+
+        Functions are made in the order of the rows; only the first one
+        formats the header.
+        """
+        header, self.header = self.header, False
+        return partial(format_csv, df, header=header, sep=self.sep,
+                       encoding=self.encoding, **self.kwargs)
+
+    def write(self, df):
+        """ Append the rows of the DataFrame ``df`` """
+        self.write_bytes(self.format(df)())
+
+    def write_chunks(self, dfs, scheduler=None):
+        """ Append the rows of the DataFrames ``dfs`` in order
+
+        With a ``scheduler`` the DataFrames are formatted in a pool, see
+        ``odo.utils.imap_windowed``, while this writer writes the formatted
+        bytes to the file in the order of ``dfs``.
+        """
+        if scheduler is None:
+            for df in dfs:
+                self.write(df)
+            return
+        for data in imap_windowed((self.format(df) for df in dfs),
+                                  scheduler=scheduler):
+            self.write_bytes(data)
+
+    def write_bytes(self, data):
+        """ Append rows formatted by ``format`` """
+        self._stream.write(data)
+
+    def close(self):
+        if self._file.closed:
+            return
+        try:
+            if self._stream is not self._file:
+                self._stream.close()
+        finally:
+            self._file.close()
+        self.csv._appended(self._key, self._wrote_header)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
 @append.register(CSV, pd.DataFrame)
 def append_dataframe_to_csv(c, df, dshape=None, **kwargs):
-    if not os.path.exists(c.path) or not os.path.getsize(c.path):
-        has_header = kwargs.pop('header', c.has_header)
-    else:
-        has_header = False
-    sep = kwargs.get('sep',
-                     kwargs.get('delimiter', c.dialect.get('delimiter', ',')))
-    encoding = kwargs.get('encoding', c.encoding)
-
-    if ext(c.path) in compressed_open:
-        if sys.version_info[0] >= 3:
-            kwargs['mode'] = 'at'
-            kwargs['encoding'] = encoding
-        elif sys.version_info[0] == 2:
-            kwargs['mode'] = 'ab' if sys.platform == 'win32' else 'at'
-
-    with c.open(mode=kwargs.get('mode', 'a')) as f:
-        df.to_csv(f,
-                  header=has_header,
-                  index=False,
-                  sep=sep,
-                  encoding=encoding)
-
+    with CSVWriter(c, **kwargs) as w:
+        w.write(df)
     return c
 
 
 @append.register(CSV, chunks(pd.DataFrame))
 def append_iterator_to_csv(c, cs, **kwargs):
-    for chunk in cs:
-        append(c, chunk, **kwargs)
+    with CSVWriter(c, **kwargs) as w:
+        w.write_chunks(cs, scheduler=kwargs.get('scheduler'))
     return c
 
 
-@convert.register(pd.DataFrame, (Temp(CSV), CSV), cost=20.0)
+@convert.register(pd.DataFrame, (Temp(CSV), CSV),
+                  cost=in_memory_cost(20.0, small=10.0))
 def csv_to_dataframe(c, dshape=None, chunksize=None, nrows=None, **kwargs):
     try:
         return _csv_to_dataframe(c, dshape=dshape, chunksize=chunksize,
@@ -303,6 +523,14 @@ def csv_to_dataframe(c, dshape=None, chunksize=None, nrows=None, **kwargs):
 
 
 def _csv_to_dataframe(c, dshape=None, chunksize=None, **kwargs):
+    kwargs = _read_csv_kwargs(c, dshape=dshape, **kwargs)
+    with c.open() as f:
+        return pd.read_csv(f, chunksize=chunksize, **kwargs)
+
+
+def _read_csv_kwargs(c, dshape=None, **kwargs):
+    """ The keyword arguments of ``pd.read_csv`` that read the CSV file ``c``
+    """
     header = {False: None, True: 0}.get(
         kwargs.pop('has_header', c.has_header), 'infer')
 
@@ -324,7 +552,7 @@ def _csv_to_dataframe(c, dshape=None, chunksize=None, **kwargs):
         parse_dates = [col for col in parse_dates if col in usecols]
 
     # See read_csv docs for header for reasoning
-    if names:
+    if names and header == 'infer':
         try:
             with c.open() as f:
                 found_names = pd.read_csv(f,
@@ -334,7 +562,6 @@ def _csv_to_dataframe(c, dshape=None, chunksize=None, **kwargs):
         except StopIteration:
             with c.open() as f:
                 found_names = pd.read_csv(f, encoding=encoding, sep=sep)
-    if names and header == 'infer':
         if [n.strip() for n in found_names] == [n.strip() for n in names]:
             header = 0
         elif (all(re.match('^\s*\D\w*\s*$', n) for n in found_names) and
@@ -344,32 +571,207 @@ def _csv_to_dataframe(c, dshape=None, chunksize=None, **kwargs):
             header = None
 
     kwargs = keyfilter(keywords(pd.read_csv).__contains__, kwargs)
-    with c.open() as f:
-        return pd.read_csv(f,
-                           header=header,
-                           sep=sep,
-                           encoding=encoding,
-                           dtype=dtypes,
-                           parse_dates=parse_dates,
-                           names=names,
-                           chunksize=chunksize,
-                           usecols=usecols,
-                           **kwargs)
+    return merge(kwargs, dict(header=header,
+                              sep=sep,
+                              encoding=encoding,
+                              dtype=dtypes,
+                              parse_dates=parse_dates,
+                              names=names,
+                              usecols=usecols))
 
 
 @convert.register(chunks(pd.DataFrame), (Temp(CSV), CSV), cost=10.0)
-def CSV_to_chunks_of_dataframes(c, chunksize=2 ** 20, **kwargs):
-    # Load a small 1000 line DF to start
-    # This helps with rapid viewing of a large CSV file
-    first = csv_to_dataframe(c, nrows=1000, **kwargs)
-    if len(first) == 1000:
-        rest = csv_to_dataframe(
-            c, chunksize=chunksize, skiprows=1000, **kwargs)
+def CSV_to_chunks_of_dataframes(c, chunksize=None, memory_limit=None,
+                                blocksize=None, **kwargs):
+    """ Read the CSV file ``c`` in chunks of ``chunksize`` rows
+
+    With a ``scheduler``, see ``odo.utils.imap_windowed``, an uncompressed
+    file larger than ``blocksize`` bytes (by default ``memory_limit``) is
+    instead split into ranges of about ``blocksize`` bytes that are parsed
+    concurrently, one chunk per range, see ``csv_byte_ranges``.
+
+    Otherwise the first chunk, of at most 1000 rows, is parsed right away so
+    that errors are raised here, and the file is closed again rather than
+    held open until the chunks are read. Every iteration, including the
+    first, reads the file from the start and parses that chunk again.
+    """
+    blocksize = blocksize or memory_limit or memory.default_memory_limit
+    if (kwargs.get('scheduler') is not None and
+            _splittable(c, blocksize, **kwargs)):
+        return _CSV_ranges_to_chunks_of_dataframes(c, blocksize, **kwargs)
+
+    chunksize = chunk_rows(kwargs.get('dshape'), chunksize, memory_limit)
+    load = partial(_read_csv_chunks, c, chunksize,
+                   _read_csv_kwargs(c, **kwargs))
+    it = load()
+    try:
+        next(it)
+    finally:
+        it.close()
+    return chunks(pd.DataFrame)(load)
+
+
+def _read_csv_chunks(c, chunksize, kwargs, first=1000):
+    """ Read the CSV file ``c`` in one pass
+
+    The first chunk has at most ``first`` rows, which helps with rapid
+    viewing of a large CSV file, the others ``chunksize`` rows.
+    """
+    with c.open() as f:
+        try:
+            reader = pd.read_csv(f, chunksize=chunksize, **kwargs)
+            head = reader.get_chunk(min(first, chunksize))
+        except StopIteration:  # no rows
+            pass
+        else:
+            yield head
+            for chunk in reader:
+                yield chunk
+            return
+    if kwargs.get('nrows'):
+        # like csv_to_dataframe, try again without nrows
+        for chunk in _read_csv_chunks(c, chunksize, dissoc(kwargs, 'nrows'),
+                                      first=first):
+            yield chunk
     else:
-        rest = []
+        yield _empty_dataframe(c, kwargs)
+
 
-    data = [first] + rest
-    return chunks(pd.DataFrame)(data)
+def _empty_dataframe(c, kwargs):
+    """ An empty DataFrame with the columns of the CSV file ``c``
+
+    The columns are the ``names`` and ``dtype`` given to ``pd.read_csv``, or
+    else those of the discovered datashape.
+    """
+    names = kwargs.get('names')
+    dtypes = kwargs.get('dtype') or {}
+    parse_dates = kwargs.get('parse_dates') or []
+    if not names:
+        ds = cached_discover(c)
+        if isrecord(ds.measure):
+            names = ds.measure.names
+            dtypes, parse_dates = dshape_to_pandas(ds)
+    names = list(names or [])
+    usecols = kwargs.get('usecols')
+    if usecols:
+        names = [name for name in names if name in usecols]
+    return pd.DataFrame(dict((name, pd.Series([], dtype='M8[ns]'
+                                              if name in parse_dates else
+                                              dtypes.get(name, object)))
+                             for name in names),
+                        columns=names)
+
+
+def _splittable(c, blocksize, nrows=None, skiprows=None, **kwargs):
+    if c.path is None or ext(c.path) in compressed_open or nrows or skiprows:
+        return False
+    if u'\n'.encode(c.encoding) != b'\n':  # e.g. utf-16
+        return False
+    try:
+        return os.path.getsize(c.path) > blocksize
+    except OSError:
+        return False
+
+
+def csv_byte_ranges(path, blocksize, header=False, quotechar=None):
+    """ Split the file ``path`` into ranges of about ``blocksize`` bytes
+    that start at the beginning of a line
+
+    The first line is left out if ``header`` is true. Newlines that follow
+    an odd number of ``quotechar`` bytes, which are inside of a quoted
+    field, do not end a line; finding them reads the whole file but runs
+    as the ranges are consumed.
+
+    >>> from odo.utils import filetext
+    >>> with filetext('a,b\\n1,"x\\ny"\\n2,z\\n') as fn:
+    ...     list(csv_byte_ranges(fn, 1, header=True, quotechar='"'))
+    [(4, 12), (12, 16)]
+    """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        if quotechar is None:
+            ends = _line_ends(f, size, blocksize, header)
+        else:
+            ends = _quoted_line_ends(f, blocksize, header,
+                                     quotechar.encode('ascii'))
+        start = None
+        for end in ends:
+            if start is not None:
+                yield start, end
+            start = end
+            if end >= size:
+                return
+    if start is not None and start < size:
+        yield start, size
+
+
+def _line_ends(f, size, blocksize, header):
+    if header:
+        f.readline()
+    yield f.tell()
+    while f.tell() < size:
+        f.seek(f.tell() + blocksize - 1)
+        f.readline()
+        yield min(f.tell(), size)
+
+
+def _quoted_line_ends(f, blocksize, header, quote):
+    offset = 0  # of the current piece in the file
+    inquote = False  # at the start of the current piece
+    if header:
+        last = 0  # the next range ends with the line of this byte
+    else:
+        yield 0
+        last = blocksize - 1
+    for piece in iter(partial(f.read, 2 ** 20), b''):
+        counted = 0
+        n = piece.find(b'\n', max(last - offset, 0))
+        while n >= 0:
+            inquote ^= piece.count(quote, counted, n) % 2 == 1
+            counted = n + 1
+            if inquote:
+                n = piece.find(b'\n', n + 1)
+                continue
+            yield offset + n + 1
+            last = offset + n + blocksize
+            n = piece.find(b'\n', max(last - offset, n + 1))
+        inquote ^= piece.count(quote, counted) % 2 == 1
+        offset += len(piece)
+    yield offset
+
+
+def _read_csv_range(path, start, stop, kwargs):
+    """ Parse bytes ``start`` to ``stop`` of the file ``path`` """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(stop - start)
+    return pd.read_csv(BytesIO(data), **kwargs)
+
+
+def _CSV_ranges_to_chunks_of_dataframes(c, blocksize, dshape=None,
+                                        **kwargs):
+    if dshape is None:
+        dshape = cached_discover(c)
+    read_kwargs = _read_csv_kwargs(c, dshape=dshape, **kwargs)
+    header = read_kwargs['header'] is not None
+    if header and not read_kwargs['names']:
+        with c.open() as f:
+            read_kwargs['names'] = list(pd.read_csv(
+                f, nrows=0, sep=read_kwargs['sep'],
+                encoding=read_kwargs['encoding']).columns)
+    read_kwargs['header'] = None
+    dialect = c.dialect
+    quotechar = (dialect.get('quotechar', '"')
+                 if dialect.get('quoting') != csv.QUOTE_NONE else None)
+
+    def tasks():
+        for start, stop in csv_byte_ranges(c.path, blocksize, header=header,
+                                           quotechar=quotechar):
+            yield partial(_read_csv_range, c.path, start, stop, read_kwargs)
+
+    def load():
+        return imap_windowed(tasks(), scheduler=kwargs['scheduler'])
+    return chunks(pd.DataFrame)(load, dshape=dshape)
 
 
 @discover.register(CSV)
@@ -398,6 +800,7 @@ def discover_csv(c, nrows=1000, **kwargs):
 
 
 @resource.register('.+\.(csv|tsv|ssv|data|dat)(\.gz|\.bz2?)?')
+@resolves_to(CSV)
 def resource_csv(uri, **kwargs):
     return CSV(uri, **kwargs)
 
@@ -412,21 +815,20 @@ def resource_glob(uri, **kwargs):
 @convert.register(chunks(pd.DataFrame), (chunks(CSV), chunks(Temp(CSV))),
                   cost=10.0)
 def convert_glob_of_csvs_to_chunks_of_dataframes(csvs, **kwargs):
-    f = partial(convert, chunks(pd.DataFrame), **kwargs)
-
-    def df_gen():
-        # build up a dask graph to run all of the `convert` calls concurrently
+    scheduler = kwargs.get('scheduler')
+    if uses_processes(scheduler):
+        # chunks can not be sent back from other processes, read whole files
+        tasks = [chunk_task(pd.DataFrame, csv_, kwargs) for csv_ in csvs]
 
-        # use a list to hold the requested key names to ensure that we return
-        # the results in the correct order
-        p = []
-        dsk = {}
-        for n, csv_ in enumerate(csvs):
-            key = 'p%d' % n
-            dsk[key] = f, csv_
-            p.append(key)
+        def df_gen():
+            return imap_windowed(tasks, scheduler=scheduler)
+    else:
+        f = partial(convert, chunks(pd.DataFrame), **kwargs)
 
-        return concat(dsk_get(dsk, p))
+        def df_gen():
+            # run the `convert` calls concurrently, in order
+            return concat(imap_windowed([partial(f, csv_) for csv_ in csvs],
+                                        scheduler=scheduler))
 
     return chunks(pd.DataFrame)(df_gen)
 
@@ -11,11 +11,14 @@ import numpy as np
 from toolz import keyfilter
 
 from ..numpy_dtype import dshape_to_numpy
-from ..append import append
+from ..append import append, appends_via
 from ..convert import convert, ooc_types
 from ..create import create
-from ..resource import resource
+from ..resource import resource, resolves_to
 from ..chunks import chunks
+from ..memory import chunk_rows
+from ..recordbatch import RecordBatch
+from ..discovery import file_fingerprint, fingerprint
 
 
 h5py_attributes = ['chunks', 'compression', 'compression_opts', 'dtype',
@@ -59,6 +62,17 @@ def record_dshape_replace(dshape, old, new):
                 yield name, subshape
 
 
+@fingerprint.register(h5py.Dataset)
+def fingerprint_h5py_dataset(d):
+    # datasets of writable files may be resized without touching the file
+    if d.file.mode != 'r':
+        return None
+    fp = file_fingerprint(d.file.filename)
+    if fp is None:
+        return None
+    return ('file', 'h5py.Dataset') + fp + (d.name,)
+
+
 @discover.register(h5py.Dataset)
 def discover_h5py_dataset(d):
     dshape = datashape.from_numpy(d.shape, d.dtype)
@@ -201,7 +215,18 @@ def append_h5py(dset, c, **kwargs):
     return dset
 
 
+@append.register(h5py.Dataset, RecordBatch)
+def append_record_batch_to_h5py(dset, b, **kwargs):
+    if dset.dtype.names is None:
+        return append(dset, convert(np.ndarray, b, **kwargs))
+    x = np.empty(len(b), dtype=dset.dtype)
+    for name in dset.dtype.names:
+        x[name] = b[name]
+    return append(dset, x)
+
+
 @append.register(h5py.Dataset, object)
+@appends_via(chunks(np.ndarray))
 def append_h5py(dset, x, **kwargs):
     return append(dset, convert(chunks(np.ndarray), x, **kwargs), **kwargs)
 
@@ -217,14 +242,38 @@ def h5py_to_numpy(dset, force=False, **kwargs):
 
 
 @convert.register(chunks(np.ndarray), h5py.Dataset, cost=3.0)
-def h5py_to_numpy_chunks(dset, chunksize=2 ** 20, **kwargs):
+def h5py_to_numpy_chunks(dset, chunksize=None, memory_limit=None, **kwargs):
+    chunksize = chunk_rows(kwargs.get('dshape'), chunksize, memory_limit,
+                           data=dset)
+
     def load():
         for i in range(0, dset.shape[0], chunksize):
             yield dset[i: i + chunksize]
     return chunks(np.ndarray)(load)
 
 
+@convert.register(chunks(RecordBatch), h5py.Dataset, cost=3.5)
+def h5py_to_record_batches(dset, chunksize=None, memory_limit=None,
+                           **kwargs):
+    if dset.dtype.names is None:
+        raise NotImplementedError('Record batches are made of compound '
+                                  'datasets, got dtype %s' % dset.dtype)
+    chunksize = chunk_rows(kwargs.get('dshape'), chunksize, memory_limit,
+                           data=dset)
+
+    def load():
+        for i in range(0, dset.shape[0], chunksize):
+            x = dset[i: i + chunksize]
+            yield RecordBatch([(name, x[name]) for name in x.dtype.names])
+    return chunks(RecordBatch)(load)
+
+
+def _h5py_resource_type(uri, datapath=None, *args):
+    return h5py.Dataset if datapath else h5py.File
+
+
 @resource.register('h5py://.+', priority=11)
+@resolves_to(_h5py_resource_type)
 def resource_h5py(uri, datapath=None, dshape=None, expected_dshape=None,
                   **kwargs):
     if uri.startswith('h5py://'):
@@ -252,6 +301,7 @@ def resource_h5py(uri, datapath=None, dshape=None, expected_dshape=None,
 
 
 @resource.register(r'^(?!hdfstore).+\.(hdf5|h5)', priority=10)
+@resolves_to(_h5py_resource_type)
 def resource_hdf5(uri, *args, **kwargs):
     return resource_h5py(uri, *args, **kwargs)
 
@@ -5,9 +5,10 @@ import pandas as pd
 
 import datashape
 from datashape import discover
-from ..append import append
+from ..append import append, appends_via
 from ..convert import convert, ooc_types
 from ..chunks import chunks
+from ..memory import chunk_rows
 from ..resource import resource
 from ..utils import filter_kwargs
 
@@ -38,13 +39,15 @@ def discover_hdfstore_storer(storer):
 
 
 @convert.register(chunks(pd.DataFrame), pd.io.pytables.AppendableFrameTable)
-def hdfstore_to_chunks_dataframes(data, chunksize=100000, **kwargs):
+def hdfstore_to_chunks_dataframes(data, chunksize=None, memory_limit=None,
+                                  **kwargs):
     if (isinstance(chunksize, (float, np.floating)) and
             not chunksize.is_integer()):
         raise TypeError('chunksize argument must be an integer, got %s' %
                         chunksize)
 
-    chunksize = int(chunksize)
+    chunksize = chunk_rows(kwargs.get('dshape'), chunksize, memory_limit,
+                           default=100000, data=data)
 
     def f():
         k = min(chunksize, 100)
@@ -116,6 +119,7 @@ def append_chunks_dataframe_to_hdfstore(store, c, **kwargs):
 
 
 @append.register((pd.io.pytables.Fixed, EmptyHDFStoreDataset), object)
+@appends_via(chunks(pd.DataFrame))
 def append_object_to_hdfstore(store, o, **kwargs):
     return append(store, convert(chunks(pd.DataFrame), o, **kwargs), **kwargs)
 
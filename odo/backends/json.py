@@ -12,13 +12,14 @@ from datashape.dispatch import dispatch
 import gzip
 import datetime
 import uuid
-from ..append import append
+from ..append import append, appends_via
 from ..convert import convert, ooc_types
-from ..resource import resource
+from ..resource import resource, resolves_to
 from ..chunks import chunks
 from ..temp import Temp
 from ..drop import drop
 from ..utils import tuples_to_records
+from ..discovery import file_fingerprint, fingerprint
 
 
 class JSON(object):
@@ -73,6 +74,12 @@ def date_to_datetime_dshape(ds):
     return DataShape(*(shape + (measure,)))
 
 
+@fingerprint.register((JSON, JSONLines))
+def fingerprint_json(j):
+    fp = file_fingerprint(j.path)
+    return ('file', type(j).__name__) + fp if fp is not None else None
+
+
 @discover.register(JSON)
 def discover_json(j, **kwargs):
     data = json_load(j.path)
@@ -146,6 +153,7 @@ def json_load(path, encoding='utf-8', **kwargs):
 
 
 @append.register(JSONLines, object)
+@appends_via(Iterator)
 def object_to_jsonlines(j, o, **kwargs):
     return append(j, convert(Iterator, o, **kwargs), **kwargs)
 
@@ -206,11 +214,13 @@ def list_to_json(j, seq, dshape=None, encoding='utf-8', **kwargs):
 
 
 @append.register(JSON, object)
+@appends_via(list)
 def object_to_json(j, o, **kwargs):
     return append(j, convert(list, o, **kwargs), **kwargs)
 
 
 @resource.register('json://.*\.json(\.gz)?', priority=11)
+@resolves_to(JSON)
 def resource_json(path, **kwargs):
     if 'json://' in path:
         path = path[len('json://'):]
@@ -219,6 +229,7 @@ def resource_json(path, **kwargs):
 
 @resource.register('.*\.jsonlines(\.gz)?', priority=11)
 @resource.register('jsonlines://.*\.json(\.gz)?', priority=11)
+@resolves_to(JSONLines)
 def resource_jsonlines(path, **kwargs):
     if 'jsonlines://' in path:
         path = path[len('jsonlines://'):]
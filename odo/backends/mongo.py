@@ -11,8 +11,9 @@ import copy
 from bson.objectid import ObjectId
 import re
 from ..convert import convert, ooc_types
-from ..append import append
+from ..append import append, appends_via
 from ..resource import resource
+from ..memory import chunk_rows
 
 
 @discover.register(Collection)
@@ -56,7 +57,8 @@ def collection_to_iterator(coll, columns=None, dshape=None, **kwargs):
 
 
 @append.register(Collection, Iterator)
-def append_iterator_to_pymongo(coll, seq, columns=None, dshape=None, chunksize=1024, **kwargs):
+def append_iterator_to_pymongo(coll, seq, columns=None, dshape=None,
+                               chunksize=None, memory_limit=None, **kwargs):
     seq = iter(seq)
     item = next(seq)
     seq = concat([[item], seq])
@@ -69,13 +71,16 @@ def append_iterator_to_pymongo(coll, seq, columns=None, dshape=None, chunksize=1
                 "Or provide columns=[...] or dshape=DataShape(...) keyword")
         seq = (dict(zip(columns, item)) for item in seq)
 
-    for block in partition_all(1024, seq):
+    chunksize = chunk_rows(dshape, chunksize, memory_limit, default=1024,
+                           maxrows=1024)
+    for block in partition_all(chunksize, seq):
         coll.insert(copy.deepcopy(block))
 
     return coll
 
 
 @append.register(Collection, object)
+@appends_via(Iterator)
 def append_anything_to_collection(coll, o, **kwargs):
     return append(coll, convert(Iterator, o, **kwargs), **kwargs)
 
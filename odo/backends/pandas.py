@@ -11,6 +11,7 @@ import pandas as pd
 import numpy as np
 
 from ..convert import convert
+from ..utils import measure
 
 
 possibly_missing = frozenset({string, datetime_})
@@ -37,6 +38,16 @@ def dshape_from_pandas(col):
     return Option(dshape) if dshape in possibly_missing else dshape
 
 
+@measure.register(pd.DataFrame)
+def measure_dataframe(df):
+    return len(df), int(df.memory_usage(index=False).sum())
+
+
+@measure.register(pd.Series)
+def measure_series(s):
+    return len(s), int(s.memory_usage(index=False))
+
+
 @discover.register(pd.DataFrame)
 def discover_dataframe(df):
     return len(df) * datashape.Record([(k, dshape_from_pandas(df[k]))
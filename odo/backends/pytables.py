@@ -2,10 +2,11 @@ from __future__ import absolute_import, division, print_function
 
 from datashape import discover
 from datashape.dispatch import dispatch
-from ..append import append
+from ..append import append, appends_via
 from ..convert import convert, ooc_types
 from ..resource import resource
 from ..chunks import chunks
+from ..memory import chunk_rows
 from ..utils import tmpfile
 
 import os
@@ -44,6 +45,7 @@ def numpy_to_pytables(t, x, **kwargs):
 
 
 @append.register((tables.Array, tables.Table), object)
+@appends_via(chunks(np.ndarray))
 def append_h5py(dset, x, **kwargs):
     return append(dset, convert(chunks(np.ndarray), x, **kwargs), **kwargs)
 
@@ -54,7 +56,11 @@ def pytables_to_numpy(t, **kwargs):
 
 
 @convert.register(chunks(np.ndarray), tables.Table, cost=3.0)
-def pytables_to_numpy_chunks(t, chunksize=2**20, **kwargs):
+def pytables_to_numpy_chunks(t, chunksize=None, memory_limit=None,
+                             **kwargs):
+    chunksize = chunk_rows(kwargs.get('dshape'), chunksize, memory_limit,
+                           data=t)
+
     def load():
         for i in range(0, t.shape[0], chunksize):
             yield t[i: i + chunksize]
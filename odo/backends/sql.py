@@ -47,10 +47,12 @@ from ..utils import (
     filter_kwargs,
     literal_compile,
 )
-from ..convert import convert, ooc_types
-from ..append import append
-from ..resource import resource
-from ..chunks import Chunks
+from ..convert import convert, ooc_types, numpy_to_list
+from ..append import append, appends_via
+from ..resource import resource, resolves_to
+from ..chunks import Chunks, chunks
+from ..memory import chunk_rows, in_memory_cost
+from ..recordbatch import RecordBatch, rows_to_record_batch
 from .csv import CSV
 
 base = int, float, datetime, date, bool, str, decimal.Decimal, timedelta
@@ -186,7 +188,7 @@ def getbind(t, bind):
     return create_engine(bind)
 
 
-def batch(sel, chunksize=10000, bind=None):
+def batch(sel, chunksize=None, bind=None, dshape=None, memory_limit=None):
     """Execute `sel`, streaming row at a time and fetching from the database in
     batches of size `chunksize`.
 
@@ -194,9 +196,13 @@ def batch(sel, chunksize=10000, bind=None):
     ----------
     sel : sa.sql.Selectable
         Selectable to execute
-    chunksize : int, optional, default 10000
-        Number of rows to fetch from the database
+    chunksize : int, optional
+        Number of rows to fetch from the database. Defaults to as many rows
+        of datashape `dshape` as fit into `memory_limit` bytes, and at most
+        10000. See ``odo.memory.chunk_rows``.
     """
+    chunksize = chunk_rows(dshape, chunksize, memory_limit, default=10000,
+                           maxrows=10000)
 
     def rowiterator(sel, chunksize=chunksize):
         with getbind(sel, bind).connect() as conn:
@@ -517,26 +523,64 @@ def dshape_to_alchemy(dshape, primary_key=frozenset()):
 
 
 @convert.register(Iterator, sa.Table, cost=300.0)
-def sql_to_iterator(t, bind=None, **kwargs):
-    _, rows = batch(sa.select([t]), bind=bind)
+def sql_to_iterator(t, bind=None, dshape=None, chunksize=None,
+                    memory_limit=None, **kwargs):
+    _, rows = batch(sa.select([t]), chunksize=chunksize, bind=bind,
+                    dshape=dshape, memory_limit=memory_limit)
     return map(tuple, rows)
 
 
 @convert.register(Iterator, sa.sql.Select, cost=300.0)
-def select_to_iterator(sel, dshape=None, bind=None, **kwargs):
+def select_to_iterator(sel, dshape=None, bind=None, chunksize=None,
+                       memory_limit=None, **kwargs):
     func = pluck(0) if dshape and isscalar(dshape.measure) else map(tuple)
-    _, rows = batch(sel, bind=bind)
+    _, rows = batch(sel, chunksize=chunksize, bind=bind, dshape=dshape,
+                    memory_limit=memory_limit)
     return func(rows)
 
 
+@convert.register(chunks(RecordBatch), (sa.Table, sa.sql.Select), cost=300.0)
+def select_to_record_batches(sel, dshape=None, bind=None, chunksize=None,
+                             memory_limit=None, **kwargs):
+    if isinstance(sel, sa.Table):
+        sel = sa.select([sel])
+    chunksize = chunk_rows(dshape, chunksize, memory_limit, default=10000,
+                           maxrows=2 ** 16)
+    names = [col.name for col in sel.columns]
+
+    def load():
+        empty = True
+        with getbind(sel, bind).connect() as conn:
+            result = conn.execute(sel)
+            for rows in iter_except(curry(result.fetchmany, size=chunksize),
+                                    sa.exc.ResourceClosedError):
+                if not rows:
+                    break
+                empty = False
+                yield rows_to_record_batch(rows, names, dshape=dshape)
+        if empty:
+            yield rows_to_record_batch([], names, dshape=dshape)
+    return chunks(RecordBatch)(load)
+
+
 @convert.register(base, sa.sql.Select, cost=200.0)
 def select_to_base(sel, dshape=None, bind=None, **kwargs):
     with getbind(sel, bind).connect() as conn:
         return conn.execute(sel).scalar()
 
 
+def check_column_names(t, names):
+    if set(names) != set(discover(t).measure.names):
+        raise ValueError("Column names of incoming data don't match "
+                         "column names of existing SQL table\n"
+                         "Names in SQL table: %s\n"
+                         "Names from incoming data: %s\n" %
+                         (discover(t).measure.names, names))
+
+
 @append.register(sa.Table, Iterator)
-def append_iterator_to_table(t, rows, dshape=None, bind=None, **kwargs):
+def append_iterator_to_table(t, rows, dshape=None, bind=None, chunksize=None,
+                             memory_limit=None, **kwargs):
     assert not isinstance(t, type)
     bind = getbind(t, bind)
     if not t.exists(bind=bind):
@@ -554,23 +598,43 @@ def append_iterator_to_table(t, rows, dshape=None, bind=None, **kwargs):
         dshape = dshape and datashape.dshape(dshape)
         if dshape and isinstance(dshape.measure, datashape.Record):
             names = dshape.measure.names
-            if set(names) != set(discover(t).measure.names):
-                raise ValueError("Column names of incoming data don't match "
-                                 "column names of existing SQL table\n"
-                                 "Names in SQL table: %s\n"
-                                 "Names from incoming data: %s\n" %
-                                 (discover(t).measure.names, names))
+            check_column_names(t, names)
         else:
             names = discover(t).measure.names
         rows = (dict(zip(names, row)) for row in rows)
 
+    chunksize = chunk_rows(dshape, chunksize, memory_limit, default=1000,
+                           maxrows=1000)
     with bind.begin():
-        for chunk in partition_all(1000, rows):  # TODO: 1000 is hardcoded
+        for chunk in partition_all(chunksize, rows):
             bind.execute(t.insert(), chunk)
 
     return t
 
 
+@append.register(sa.Table, RecordBatch)
+def append_record_batch_to_table(t, b, bind=None, chunksize=None,
+                                 memory_limit=None, **kwargs):
+    assert not isinstance(t, type)
+    bind = getbind(t, bind)
+    if not t.exists(bind=bind):
+        t.create(bind=bind)
+    check_column_names(t, b.names)
+    if not len(b):
+        return t
+
+    # Build the rows column by column rather than element by element
+    columns = [numpy_to_list(col) for col in b.columns]
+    rows = (dict(zip(b.names, row)) for row in zip(*columns))
+
+    chunksize = chunk_rows(discover(b), chunksize, memory_limit,
+                           default=1000, maxrows=1000)
+    with bind.begin():
+        for chunk in partition_all(chunksize, rows):
+            bind.execute(t.insert(), chunk)
+    return t
+
+
 @append.register(sa.Table, Chunks)
 def append_anything_to_sql_Table(t, c, **kwargs):
     for item in c:
@@ -579,6 +643,7 @@ def append_anything_to_sql_Table(t, c, **kwargs):
 
 
 @append.register(sa.Table, object)
+@appends_via(Iterator)
 def append_anything_to_sql_Table(t, o, **kwargs):
     return append(t, convert(Iterator, o, **kwargs), **kwargs)
 
@@ -630,7 +695,13 @@ def attach_schema(obj, schema):
     return obj
 
 
+def _sql_resource_type(uri, *args):
+    # a table when given a table name, otherwise the engine
+    return sa.Table if args else sa.engine.Engine
+
+
 @resource.register(r'(.*sql.*|oracle|redshift)(\+\w+)?://.+')
+@resolves_to(_sql_resource_type)
 def resource_sql(uri, *args, **kwargs):
     engine = create_engine(
         uri,
@@ -735,7 +806,8 @@ def table_to_select(t, **kwargs):
     return t.select()
 
 
-@convert.register(pd.DataFrame, (sa.sql.Select, sa.sql.Selectable), cost=300.0)
+@convert.register(pd.DataFrame, (sa.sql.Select, sa.sql.Selectable),
+                  cost=in_memory_cost(300.0))
 def select_or_selectable_to_frame(el, bind=None, dshape=None, **kwargs):
     bind = getbind(el, bind)
     if bind.dialect.name == 'postgresql':
@@ -785,7 +857,9 @@ def select_or_selectable_to_frame(el, bind=None, dshape=None, **kwargs):
             df.loc[df[field].isnull(), field] = None
         return df
 
-    columns, rows = batch(el, bind=bind)
+    columns, rows = batch(el, chunksize=kwargs.get('chunksize'), bind=bind,
+                          dshape=dshape,
+                          memory_limit=kwargs.get('memory_limit'))
     dtypes = {}
     try:
         fields = dshape.measure.fields
@@ -0,0 +1,34 @@
+from __future__ import absolute_import, division, print_function
+
+import pytest
+pa = pytest.importorskip('pyarrow')
+
+import numpy as np
+import pandas as pd
+import pandas.util.testing as tm
+
+from datashape import dshape
+from odo import RecordBatch, chunks, convert, discover, odo
+
+
+df = pd.DataFrame({'a': [1, 2, 3], 'b': [1.5, 2.5, 3.5],
+                   'c': ['x', 'y', None]}, columns=['a', 'b', 'c'])
+
+
+def test_record_batch_round_trip():
+    b = convert(RecordBatch, df)
+    ab = convert(pa.RecordBatch, b)
+    assert isinstance(ab, pa.RecordBatch)
+    assert ab.schema.names == ['a', 'b', 'c']
+    tm.assert_frame_equal(convert(pd.DataFrame, convert(RecordBatch, ab)), df)
+
+
+def test_discover():
+    t = pa.Table.from_pandas(df, preserve_index=False)
+    assert discover(t) == dshape('3 * {a: int64, b: float64, c: ?string}')
+
+
+def test_table_chunks():
+    t = odo(odo(df, chunks(RecordBatch), chunksize=2), pa.Table)
+    assert t.num_rows == 3
+    tm.assert_frame_equal(odo(odo(t, chunks(RecordBatch)), pd.DataFrame), df)
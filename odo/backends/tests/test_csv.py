@@ -7,6 +7,7 @@ import os
 import numpy as np
 import pandas as pd
 import pandas.util.testing as tm
+import csv
 import gzip
 import datashape
 from datashape import Option, string
@@ -14,11 +15,12 @@ from collections import Iterator
 
 from odo.backends.csv import (CSV, append, convert, resource,
                               csv_to_dataframe, CSV_to_chunks_of_dataframes,
-                              infer_header)
+                              infer_header, csv_byte_ranges, CSVWriter)
 from odo.utils import tmpfile, filetext, filetexts, raises
 from odo import (into, append, convert, resource, discover, dshape, Temp,
                  chunks, odo)
 from odo.temp import _Temp
+from odo.discovery import cached_discover
 from odo.compatibility import unicode
 
 
@@ -493,3 +495,228 @@ def test_globbed_csv_to_dataframe():
         pd.DataFrame([[1, 2, 3], [4, 5, 6], [7, 8, 9], [10, 11, 12]],
                      columns=['a', 'b', 'c']),
     )
+
+
+def test_csv_byte_ranges():
+    text = 'a,b\n1,"x\ny"\n2,z\n3,"w"\n4,v'
+    with filetext(text) as fn:
+        ranges = list(csv_byte_ranges(fn, 1, header=True, quotechar='"'))
+        assert ranges[0][0] == len('a,b\n')
+        assert ranges[-1][1] == len(text)
+        assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+        with open(fn, 'rb') as f:
+            data = f.read()
+        assert [data[a:b] for a, b in ranges] == [b'1,"x\ny"\n', b'2,z\n',
+                                                  b'3,"w"\n', b'4,v']
+
+        assert list(csv_byte_ranges(fn, 1000)) == [(0, len(text))]
+        # without quotechar newlines in quotes split lines
+        assert len(list(csv_byte_ranges(fn, 1, header=True))) == 5
+
+
+@pytest.mark.parametrize('scheduler', ['threads', 'processes'])
+def test_csv_to_chunks_of_dataframes_in_byte_ranges(scheduler):
+    df = pd.DataFrame({'a': np.arange(500),
+                       'b': ['x,\n"y"' if i % 7 else 'z' for i in range(500)]},
+                      columns=['a', 'b'])
+    with tmpfile('.csv') as fn:
+        df.to_csv(fn, index=False)
+        c = convert(chunks(pd.DataFrame), CSV(fn), blocksize=1000,
+                    scheduler=scheduler)
+        dfs = list(c)
+        assert len(dfs) > 1
+        tm.assert_frame_equal(pd.concat(dfs, ignore_index=True), df)
+
+
+def test_csv_to_chunks_of_dataframes_reads_once(monkeypatch):
+    df = pd.DataFrame({'a': np.arange(2500), 'b': np.arange(2500) * 0.5},
+                      columns=['a', 'b'])
+    with tmpfile('.csv') as fn:
+        df.to_csv(fn, index=False)
+        reads = []
+        read_csv = pd.read_csv
+
+        def counting_read_csv(*args, **kwargs):
+            reads.append(kwargs.get('nrows'))
+            return read_csv(*args, **kwargs)
+
+        monkeypatch.setattr(pd, 'read_csv', counting_read_csv)
+        c = CSV_to_chunks_of_dataframes(CSV(fn), chunksize=1000,
+                                        dshape=discover(df))
+        # the first chunk is parsed up front to raise errors early
+        assert len(reads) == 1
+        assert [len(chunk) for chunk in c] == [1000, 1000, 500]
+        assert len(reads) == 2
+
+        # later iterations read the file again
+        tm.assert_frame_equal(pd.concat(list(c), ignore_index=True), df)
+        assert len(reads) == 3
+
+
+def test_csv_to_chunks_of_dataframes_closes_file():
+    with filetext('a,b\n1,2\n', extension='.csv') as fn:
+        ds = datashape.dshape('var * {a: int64, b: int64}')
+        c = CSV_to_chunks_of_dataframes(CSV(fn), dshape=ds)
+        assert c._head is None
+        assert [len(chunk) for chunk in c] == [1]
+
+
+def test_csv_to_chunks_of_dataframes_without_rows(monkeypatch):
+    read_csv = pd.read_csv
+
+    rows = []
+
+    def stopping_read_csv(*args, **kwargs):
+        # old versions of pandas stop early with nrows or without rows
+        if kwargs.get('nrows') or not rows:
+            raise StopIteration()
+        return read_csv(*args, **kwargs)
+
+    with filetext('a,b\n1,2\n', extension='.csv') as fn:
+        c = CSV(fn)
+        ds = cached_discover(c)
+        monkeypatch.setattr(pd, 'read_csv', stopping_read_csv)
+
+        # retried without nrows, like csv_to_dataframe
+        rows.append(1)
+        chunk, = CSV_to_chunks_of_dataframes(c, dshape=ds, nrows=5)
+        assert list(chunk.columns) == ['a', 'b']
+        assert len(chunk) == 1
+        rows.pop()
+
+        # the empty frame has the columns and types of the datashape
+        chunk, = CSV_to_chunks_of_dataframes(c, dshape=ds)
+        assert list(chunk.columns) == ['a', 'b']
+        assert chunk.dtypes['a'] == np.int64
+        assert len(chunk) == 0
+
+        chunk, = CSV_to_chunks_of_dataframes(c)
+        assert list(chunk.columns) == ['a', 'b']
+
+
+def test_csv_sniffs_once_until_file_changes(monkeypatch):
+    import odo.backends.csv as csv_backend
+    sniffs = []
+    sniff_dialect_bytes = csv_backend.sniff_dialect_bytes
+
+    def counting_sniff(raw, **kwargs):
+        sniffs.append(raw)
+        return sniff_dialect_bytes(raw, **kwargs)
+
+    monkeypatch.setattr(csv_backend, 'sniff_dialect_bytes', counting_sniff)
+    with tmpfile('.csv') as fn:
+        with open(fn, 'w') as f:
+            f.write('a;b\n1;2\n3;4\n')
+        c = CSV(fn)
+        assert c.dialect['delimiter'] == ';'
+        assert c.has_header
+        assert c.dialect['delimiter'] == ';'
+        assert sniffs == [b'a;b\n1;2\n3;4\n']
+
+        with open(fn, 'w') as f:
+            f.write('a|b\n1|2\n3|4\n5|6\n')
+        assert c.dialect['delimiter'] == '|'
+        assert len(sniffs) == 2
+
+
+def test_csv_append_chunks_sniffs_once(monkeypatch):
+    import odo.backends.csv as csv_backend
+    sniffs = []
+    sniff_dialect_bytes = csv_backend.sniff_dialect_bytes
+
+    def counting_sniff(raw, **kwargs):
+        sniffs.append(raw)
+        return sniff_dialect_bytes(raw, **kwargs)
+
+    monkeypatch.setattr(csv_backend, 'sniff_dialect_bytes', counting_sniff)
+    df = pd.DataFrame({'a': [1, 2], 'b': [1.0, 2.0]}, columns=['a', 'b'])
+    with tmpfile('.csv') as fn:
+        c = CSV(fn, has_header=True, delimiter=',')
+        append(c, chunks(pd.DataFrame)([df] * 5))
+        assert len(sniffs) == 1
+        tm.assert_frame_equal(csv_to_dataframe(c),
+                              pd.concat([df] * 5, ignore_index=True))
+
+
+def test_csv_append_chunks_to_gzip_writes_one_member():
+    import zlib
+    df = pd.DataFrame({'a': np.arange(100), 'b': np.arange(100) * 0.5},
+                      columns=['a', 'b'])
+    with tmpfile('.csv.gz') as fn:
+        c = CSV(fn, has_header=True)
+        append(c, chunks(pd.DataFrame)([df[:30], df[30:60], df[60:]]))
+        with open(fn, 'rb') as f:
+            raw = f.read()
+        d = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        d.decompress(raw)
+        assert d.unused_data == b''
+        tm.assert_frame_equal(csv_to_dataframe(c), df)
+
+
+def test_csv_writer_buffer_size():
+    df = pd.DataFrame({'a': [1, 2, 3], 'b': ['x', 'y', 'z']},
+                      columns=['a', 'b'])
+    with tmpfile('.csv') as fn:
+        c = CSV(fn, has_header=True)
+        with CSVWriter(c, buffer_size=4) as w:
+            w.write(df[:2])
+            w.write(df[2:])
+        append(c, df, buffer_size=16)
+        tm.assert_frame_equal(csv_to_dataframe(c),
+                              pd.concat([df, df], ignore_index=True))
+
+
+@pytest.mark.parametrize('scheduler', ['threads', 'processes'])
+@pytest.mark.parametrize('ext', ['.csv', '.csv.gz'])
+def test_csv_append_chunks_formatted_in_parallel(scheduler, ext):
+    df = pd.DataFrame({'a': np.arange(1000), 'b': np.arange(1000) * 0.5},
+                      columns=['a', 'b'])
+    dfs = [df[i:i + 100] for i in range(0, len(df), 100)]
+    with tmpfile(ext) as fn:
+        c = CSV(fn, has_header=True)
+        append(c, chunks(pd.DataFrame)(dfs), scheduler=scheduler)
+        tm.assert_frame_equal(csv_to_dataframe(c), df)
+
+
+def test_csv_append_passes_formatting_options_to_pandas():
+    df = pd.DataFrame({'a': [1.0, np.nan], 'b': ['x', 'y']},
+                      columns=['a', 'b'])
+    with tmpfile('.csv') as fn:
+        c = CSV(fn, has_header=True)
+        append(c, df, na_rep='NULL', quotechar="'", quoting=csv.QUOTE_ALL,
+               lineterminator='\r\n', float_format='%.1f', chunksize=1)
+        with open(fn, 'rb') as f:
+            assert f.read() == (b"'a','b'\r\n'1.0','x'\r\n'NULL','y'\r\n")
+
+
+def test_csv_append_does_not_change_has_header():
+    df = pd.DataFrame({'a': [1, 2]})
+    with tmpfile('.csv') as fn:
+        c = CSV(fn)
+        append(c, df)
+        append(c, df)
+        assert c._has_header is None
+        assert c.has_header
+        assert len(csv_to_dataframe(c)) == 4
+
+
+def test_csv_to_dataframe_route_depends_on_file_size(monkeypatch):
+    import odo.memory
+    with filetext('a,b\n1,2\n3,4\n', extension='.csv') as fn:
+        c = CSV(fn)
+        ds = discover(c)
+
+        convert.clear_path_cache()
+        path = convert.path(CSV, pd.DataFrame, dshape=ds, data=c)
+        assert [p.convert_to for p in path] == [pd.DataFrame]
+
+        monkeypatch.setattr(odo.memory, 'default_memory_limit', 1)
+        convert.clear_path_cache()
+        try:
+            path = convert.path(CSV, pd.DataFrame, dshape=ds, data=c)
+            assert [p.convert_to for p in path] == [chunks(pd.DataFrame),
+                                                   pd.DataFrame]
+            tm.assert_frame_equal(convert(pd.DataFrame, c),
+                                  pd.DataFrame({'a': [1, 3], 'b': [2, 4]}))
+        finally:
+            convert.clear_path_cache()
@@ -16,7 +16,7 @@ from odo.backends.h5py import unicode_dtype
 
 from odo.utils import tmpfile, ignoring
 from odo.chunks import chunks
-from odo import into, append, convert, discover, drop, odo
+from odo import into, append, convert, discover, drop, odo, RecordBatch
 import datashape
 import h5py
 import numpy as np
@@ -145,6 +145,26 @@ def test_chunks():
         assert eq(convert(np.ndarray, c), x)
 
 
+def test_chunks_memory_limit():
+    y = np.ones((10, 3), dtype='i4')
+    with file(y) as (fn, f, dset):
+        c = convert(chunks(np.ndarray), dset, memory_limit=24)
+        assert [len(chunk) for chunk in c] == [2] * 5
+        assert eq(convert(np.ndarray, c), y)
+
+
+def test_record_batches():
+    y = np.array([(i, i * 0.5) for i in range(10)],
+                 dtype=[('a', 'i4'), ('b', 'f8')])
+    with file(y) as (fn, f, dset):
+        c = convert(chunks(RecordBatch), dset, chunksize=4)
+        assert [len(b) for b in c] == [4, 4, 2]
+        assert eq(convert(np.ndarray, c), y)
+
+        append(dset, RecordBatch([('b', y['b']), ('a', y['a'])]))
+        assert eq(dset[10:], y)
+
+
 def test_append_chunks():
     with file(x) as (fn, f, dset):
         append(dset, chunks(np.ndarray)([x, x]))
@@ -16,7 +16,7 @@ from datashape import (
     coretypes as ct,
 )
 from datashape.util.testing import assert_dshape_equal
-from networkx import NetworkXNoPath
+from odo.graph import NoPath
 import numpy as np
 import pandas as pd
 import pytest
@@ -66,11 +66,11 @@ def test_nan_to_nat():
     assert odo(np.nan, pd.Timestamp) is pd.NaT
     assert odo(np.nan, pd.Timedelta) is pd.NaT
 
-    with pytest.raises(NetworkXNoPath):
+    with pytest.raises(NoPath):
         # Check that only nan can be converted.
         odo(0.5, pd.Timestamp)
 
-    with pytest.raises(NetworkXNoPath):
+    with pytest.raises(NoPath):
         # Check that only nan can be converted.
         odo(0.5, pd.Timedelta)
 
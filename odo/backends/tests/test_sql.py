@@ -4,6 +4,7 @@ import pytest
 pytest.importorskip('sqlalchemy')
 
 import os
+from collections import Iterator
 from decimal import Decimal
 from functools import partial
 from textwrap import dedent
@@ -28,12 +29,12 @@ import numpy as np
 import pandas as pd
 import sqlalchemy as sa
 
-from odo import convert, append, resource, into, odo, chunks
+from odo import convert, append, resource, into, odo, chunks, RecordBatch
 from odo.backends.sql import (
     dshape_to_table, create_from_datashape, dshape_to_alchemy,
     discover_sqlalchemy_selectable
 )
-from odo.utils import tmpfile, raises
+from odo.utils import tmpfile, raises, measure
 
 from six import string_types
 
@@ -169,6 +170,79 @@ def test_select_to_iterator():
         assert isinstance(res[0], string_types)
 
 
+def test_record_batches():
+    engine, t = single_table_engine()
+    append(t, [('Alice', 100), ('Bob', 200), ('Charlie', None)])
+
+    c = convert(chunks(RecordBatch), t, dshape=discover(t), chunksize=2)
+    batches = list(c)
+    assert [len(b) for b in batches] == [2, 1]
+    assert batches[0]['name'].tolist() == ['Alice', 'Bob']
+    assert np.isnan(batches[1]['amount'][0])
+
+    engine2, t2 = single_table_engine()
+    append(t2, c)
+    assert convert(list, t2) == [('Alice', 100), ('Bob', 200),
+                                 ('Charlie', None)]
+
+    sel = sa.select([t.c.amount]).where(t.c.amount > 1000)
+    c = convert(chunks(RecordBatch), sel, dshape=discover(sel))
+    assert [len(b) for b in c] == [0]
+
+
+def test_record_batch_routes():
+    # Only the routes from SQL to chunks go through record batches, whole
+    # results are still read with read_sql or as an iterator of tuples
+    def route(a, b):
+        return [p.convert_to for p in convert.path(a, b)]
+    for source in [sa.Table, sa.sql.Select]:
+        for target in [chunks(pd.DataFrame), chunks(np.ndarray)]:
+            assert route(source, target) == [chunks(RecordBatch), target]
+    assert route(sa.Table, Iterator) == [Iterator]
+    assert route(sa.sql.Select, pd.DataFrame) == [pd.DataFrame]
+
+
+def test_append_record_batch_to_table_does_not_convert(monkeypatch):
+    import odo.backends.sql
+    engine, t = single_table_engine()
+    b = RecordBatch([('name', np.array(['Alice', 'Bob'], dtype=object)),
+                     ('amount', np.array([100, 200]))])
+
+    def no_convert(*args, **kwargs):
+        raise AssertionError('record batch was converted before appending')
+    with monkeypatch.context() as m:
+        m.setattr(odo.backends.sql, 'convert', no_convert)
+        append(t, b)
+    assert convert(list, t) == [('Alice', 100), ('Bob', 200)]
+
+    with pytest.raises(ValueError):
+        append(t, RecordBatch([('x', np.array([1]))]))
+
+
+def test_large_table_to_dataframe_avoids_read_sql(monkeypatch):
+    import odo.memory
+    engine, t = single_table_engine()
+    append(t, [('Alice', 100), ('Bob', 200)])
+    # tables are not measured, the size comes from the datashape
+    assert measure(t) == (None, None)
+    ds = 2 * discover(t).subshape[0]
+
+    convert.clear_path_cache()
+    path = convert.path(sa.Table, pd.DataFrame, dshape=ds, data=t)
+    assert [p.convert_to for p in path] == [sa.sql.Select, pd.DataFrame]
+
+    monkeypatch.setattr(odo.memory, 'default_memory_limit', 1)
+    convert.clear_path_cache()
+    try:
+        path = [p.convert_to for p in
+                convert.path(sa.Table, pd.DataFrame, dshape=ds, data=t)]
+        assert path[-2:] == [chunks(pd.DataFrame), pd.DataFrame]
+        df = convert(pd.DataFrame, t, dshape=ds)
+        assert df.amount.tolist() == [100, 200]
+    finally:
+        convert.clear_path_cache()
+
+
 def test_discovery_engine():
     engine, t = single_table_engine()
 
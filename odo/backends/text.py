@@ -11,9 +11,9 @@ from ..compatibility import unicode
 from ..chunks import chunks
 from ..drop import drop
 from ..temp import Temp
-from ..append import append
+from ..append import append, appends_via
 from ..convert import convert
-from ..resource import resource
+from ..resource import resource, resolves_to
 
 
 class TextFile(object):
@@ -57,6 +57,7 @@ def append_iterator_to_textfile(target, source, **kwargs):
 
 
 @append.register(TextFile, object)
+@appends_via(Iterator)
 def append_anything_to_textfile(target, source, **kwargs):
     return append(target, convert(Iterator, source, **kwargs), **kwargs)
 
@@ -69,6 +70,7 @@ def iterator_to_temp_textfile(seq, **kwargs):
 
 
 @resource.register('.+\.(txt|log)(.gz)?')
+@resolves_to(TextFile)
 def resource_sas(uri, **kwargs):
     return TextFile(uri)
 
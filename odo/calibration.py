@@ -0,0 +1,126 @@
+from __future__ import absolute_import, division, print_function
+
+import json
+import os
+from contextlib import contextmanager
+from threading import Lock
+from timeit import default_timer
+
+from collections import Iterator
+
+from .chunks import Chunks
+from .core import edge_key, edge_observers, profile_filename
+from .utils import measure
+
+
+class Calibration(object):
+    """ Measured throughput of the edges run by a ``NetworkDispatcher``
+
+    A calibration records, for every edge, the number of calls, the total
+    wall time in seconds and the total number of rows and bytes processed.
+    The number of rows and bytes are taken from the input of the edge, or
+    from its output when they can not be measured on the input. Edges that
+    return iterators or chunks do their work after they return, so only
+    their calls and time are recorded and they keep their registered cost.
+
+    See Also
+    --------
+    calibrate
+    odo.utils.measure
+    """
+    def __init__(self, dispatcher):
+        self.dispatcher = dispatcher
+        self.edges = {}
+        self._lock = Lock()
+
+    def start(self, dispatcher, convert_from, convert_to, func, data):
+        if dispatcher is not self.dispatcher:
+            return None
+        return convert_from, convert_to, measure(data), default_timer()
+
+    def finish(self, token, result):
+        if token is None:
+            return
+        convert_from, convert_to, (rows, nbytes), start = token
+        seconds = default_timer() - start
+        if isinstance(result, (Iterator, Chunks)):
+            # lazy, the time spent so far says nothing about the rows
+            rows = nbytes = None
+        elif rows is None or nbytes is None:
+            out_rows, out_nbytes = measure(result)
+            rows = out_rows if rows is None else rows
+            nbytes = out_nbytes if nbytes is None else nbytes
+        self.record(edge_key(convert_from, convert_to), seconds, rows, nbytes)
+
+    def error(self, token, exception):
+        pass
+
+    def record(self, key, seconds, rows=None, nbytes=None, calls=1):
+        with self._lock:
+            stats = self.edges.setdefault(key, dict(calls=0,
+                                                    seconds=0.0,
+                                                    rows=0,
+                                                    nbytes=0))
+            stats['calls'] += calls
+            stats['seconds'] += seconds
+            stats['rows'] += rows or 0
+            stats['nbytes'] += nbytes or 0
+
+    def save(self, filename):
+        """ Merge these measurements into the profile at ``filename`` """
+        if os.path.exists(filename):
+            with open(filename) as f:
+                edges = json.load(f).get('edges', {})
+        else:
+            edges = {}
+            dirname = os.path.dirname(filename)
+            if dirname and not os.path.exists(dirname):
+                os.makedirs(dirname)
+
+        with self._lock:
+            for key, stats in self.edges.items():
+                old = edges.setdefault(key, dict(calls=0,
+                                                 seconds=0.0,
+                                                 rows=0,
+                                                 nbytes=0))
+                for k, v in stats.items():
+                    old[k] = old.get(k, 0) + v
+
+        with open(filename, 'w') as f:
+            json.dump({'edges': edges}, f, indent=2, sort_keys=True)
+
+
+@contextmanager
+def calibrate(filename=None, dispatcher=None):
+    """ Measure the throughput of every conversion run in this block
+
+    On exit the measurements are merged into the profile at ``filename`` and
+    loaded into ``dispatcher`` so that later conversions route on the measured
+    cost per row of each edge. By default the profile is the one
+    ``convert.load_profile()`` loads, ``~/.odo/convert.json``, which is also
+    loaded when odo is imported if ``ODO_LOAD_PROFILE`` is set.
+
+    >>> with calibrate() as c:  # doctest: +SKIP
+    ...     odo('myfile.csv', 'postgresql://hostname::tablename')
+    >>> c.edges  # doctest: +SKIP
+    {'odo.backends.csv.CSV -> odo.chunks(pandas.DataFrame)':
+        {'calls': 1, 'seconds': 12.4, 'rows': 1000000, 'nbytes': 81234567},
+     ...}
+
+    See Also
+    --------
+    odo.core.NetworkDispatcher.load_profile
+    """
+    if dispatcher is None:
+        from .convert import convert as dispatcher
+    if filename is None:
+        filename = profile_filename(dispatcher.name)
+
+    calibration = Calibration(dispatcher)
+    edge_observers.append(calibration)
+    try:
+        yield calibration
+    finally:
+        edge_observers.remove(calibration)
+        calibration.save(filename)
+        dispatcher.load_profile(filename)
@@ -1,18 +1,24 @@
 from __future__ import absolute_import, division, print_function
 
 from collections import Iterator
+from itertools import chain, islice
 
 from toolz import memoize, first, peek
+import datashape
 from datashape import discover, var
-from .utils import cls_name, copydoc
-from dask.threaded import get as dsk_get
+from .utils import cls_name, copydoc, imap_windowed
 
 
 class Chunks(object):
     """ An Iterable of chunked data
 
-    Iterates over chunks of in-memory data.  Contains an iterable or a function
-    that returns an iterator.
+    Iterates over chunks of in-memory data.  Contains an iterable, a function
+    that returns an iterator or a list of functions that each return a chunk.
+    The functions are called a few at a time in a pool, by default of threads,
+    see ``odo.utils.imap_windowed`` and ``scheduler``. Their results are not
+    kept, so every iteration calls the functions again. Iterate over
+    ``Chunks(list(c))`` instead when the chunks are read more than once and
+    fit in memory.
 
     >>> c = Chunks([[1, 2, 3], [4, 5, 6]])
     >>> next(iter(c))
@@ -27,26 +33,55 @@ class Chunks(object):
 
     >>> c.container.__name__
     'list'
+
+    The datashape of the whole collection may be given as ``dshape`` so that
+    ``discover`` does not have to look at the data. Otherwise ``discover``
+    computes only the first chunk. The next iteration reuses the first chunk
+    of a list of functions, while the iterator a function returns is closed
+    after its first chunk and the next iteration calls the function again.
+
+    >>> c = chunks(list)([[1, 2, 3], [4, 5, 6]], dshape='var * int64')
+    >>> discover(c)
+    dshape("var * int64")
     """
+    dshape = None
+
+    # how a list of functions is run, see ``odo.utils.imap_windowed``
+    scheduler = None
+
+    # the list of functions and an iterator over its chunks whose first
+    # chunk was computed by ``discover``, consumed by the next iteration
+    _head = None
 
-    def __init__(self, data):
+    def __init__(self, data, dshape=None, scheduler=None):
         self.data = data
+        if dshape is not None:
+            self.dshape = datashape.dshape(dshape)
+        if scheduler is not None:
+            self.scheduler = scheduler
 
     def __iter__(self):
-        if callable(self.data):
-            return self.data()
-        elif (isinstance(self.data, list) and
-              len(self.data) and
-              callable(self.data[0])):
-            # If this is a set of callables, evaluate
-            # them using dask before returning an iterator for them
-            p = []
-            dsk = {}
-            for i, f in enumerate(self.data):
-                dsk['p%d'%i] = (f,)
-                p.append('p%d'%i)
-            self.data = dsk_get(dsk, p)
-        return iter(self.data)
+        data = self.data
+        head, self._head = self._head, None
+        if head is not None:
+            if head[0] is data:
+                return head[1]
+            _close(head[1])
+        if callable(data):
+            return data()
+        elif _is_callable_list(data):
+            return imap_windowed(data, scheduler=self.scheduler)
+        return iter(data)
+
+
+def _is_callable_list(data):
+    return isinstance(data, list) and len(data) and callable(data[0])
+
+
+def _close(it):
+    close = getattr(it, 'close', None)
+    if close is not None:
+        close()
 
 
 @memoize
@@ -58,9 +93,26 @@ def chunks(cls):
 
 @discover.register(Chunks)
 def discover_chunks(c, **kwargs):
+    if c.dshape is not None:
+        return c.dshape
     data = c.data
     if isinstance(data, Iterator):
         fst, c.data = peek(data)
+    elif c._head is not None and c._head[0] is data:
+        fst, it = peek(c._head[1])
+        c._head = data, it
+    elif callable(data):
+        # don't hold on to the iterator, it may keep files open
+        it = data()
+        try:
+            fst = next(iter(it))
+        finally:
+            _close(it)
+    elif _is_callable_list(data):
+        # compute the first chunk only, the rest when iterating
+        fst = data[0]()
+        c._head = data, chain([fst], imap_windowed(islice(data, 1, None),
+                                                   scheduler=c.scheduler))
     else:
         fst = first(c)
     return var * discover(fst).subshape[0]
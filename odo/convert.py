@@ -9,14 +9,44 @@ import datashape
 from datashape import discover
 from .core import NetworkDispatcher, ooc_types
 from .chunks import chunks, Chunks
+from .memory import chunk_rows
 from .numpy_dtype import dshape_to_numpy
-from .utils import records_to_tuples
+from .utils import records_to_tuples, imap_windowed
 from functools import partial
 
 
 convert = NetworkDispatcher('convert')
 
 
+def convert_chunk(target, chunk, **kwargs):
+    """ ``convert(target, chunk, **kwargs)`` as a picklable task """
+    return convert(target, chunk, **kwargs)
+
+
+def chunk_task(target, chunk, kwargs):
+    """ A task converting ``chunk`` to ``target``, see ``convert_chunk``
+
+    The ``scheduler`` keyword argument is left out so that tasks run in
+    worker processes do not start pools of their own.
+    """
+    kwargs = dict((k, v) for k, v in kwargs.items() if k != 'scheduler')
+    return partial(convert_chunk, target, chunk, **kwargs)
+
+
+def map_chunks(target, c, **kwargs):
+    """ Convert the chunks of ``c`` to ``target`` lazily
+
+    With a ``scheduler`` keyword argument the chunks are converted in a pool,
+    see ``odo.utils.imap_windowed``.
+    """
+    scheduler = kwargs.get('scheduler')
+    if scheduler is None or target is Iterator:
+        # iterators can not be sent back from other processes and are cheap
+        return (convert(target, chunk, **kwargs) for chunk in c)
+    return imap_windowed((chunk_task(target, chunk, kwargs) for chunk in c),
+                         scheduler=scheduler)
+
+
 @convert.register(np.ndarray, pd.DataFrame, cost=0.2)
 def dataframe_to_numpy(df, dshape=None, **kwargs):
     dtype = dshape_to_numpy(dshape or discover(df))
@@ -130,10 +160,19 @@ def numpy_chunks_to_numpy(c, **kwargs):
     return np.concatenate(list(c))
 
 
+def _slices(x, chunksize):
+    return (x[i:i+chunksize] for i in range(0, x.shape[0], chunksize))
+
+
+def _row_slices(x, chunksize):
+    return (x.iloc[i:i+chunksize] for i in range(0, x.shape[0], chunksize))
+
+
 @convert.register(chunks(np.ndarray), np.ndarray, cost=0.5)
-def numpy_to_chunks_numpy(x, chunksize=2**20, **kwargs):
-    return chunks(np.ndarray)(
-            lambda: (x[i:i+chunksize] for i in range(0, x.shape[0], chunksize)))
+def numpy_to_chunks_numpy(x, chunksize=None, memory_limit=None, **kwargs):
+    chunksize = chunk_rows(kwargs.get('dshape'), chunksize, memory_limit,
+                           data=x)
+    return chunks(np.ndarray)(partial(_slices, x, chunksize))
 
 
 @convert.register(pd.DataFrame, chunks(pd.DataFrame), cost=1.0)
@@ -146,9 +185,11 @@ def chunks_dataframe_to_dataframe(c, **kwargs):
 
 
 @convert.register(chunks(pd.DataFrame), pd.DataFrame, cost=0.5)
-def dataframe_to_chunks_dataframe(x, chunksize=2**20, **kwargs):
-    return chunks(pd.DataFrame)(
-            lambda: (x.iloc[i:i+chunksize] for i in range(0, x.shape[0], chunksize)))
+def dataframe_to_chunks_dataframe(x, chunksize=None, memory_limit=None,
+                                  **kwargs):
+    chunksize = chunk_rows(kwargs.get('dshape'), chunksize, memory_limit,
+                           data=x)
+    return chunks(pd.DataFrame)(partial(_row_slices, x, chunksize))
 
 def ishashable(x):
     try:
@@ -214,7 +255,10 @@ def numpy_chunks_to_iterator(c, **kwargs):
 
 
 @convert.register(chunks(np.ndarray), Iterator, cost=10.0)
-def iterator_to_numpy_chunks(seq, chunksize=1024, **kwargs):
+def iterator_to_numpy_chunks(seq, chunksize=None, memory_limit=None,
+                             **kwargs):
+    chunksize = chunk_rows(kwargs.get('dshape'), chunksize, memory_limit,
+                           maxrows=1024)
     seq2 = partition_all(chunksize, seq)
     try:
         first, rest = next(seq2), seq2
@@ -232,17 +276,26 @@ def iterator_to_numpy_chunks(seq, chunksize=1024, **kwargs):
 
 
 @convert.register(chunks(pd.DataFrame), Iterator, cost=10.0)
-def iterator_to_DataFrame_chunks(seq, chunksize=1024, **kwargs):
+def iterator_to_DataFrame_chunks(seq, chunksize=None, memory_limit=None,
+                                 **kwargs):
+    chunksize = chunk_rows(kwargs.get('dshape'), chunksize, memory_limit,
+                           maxrows=1024)
     seq2 = partition_all(chunksize, seq)
 
     add_index = kwargs.get('add_index', False)
     if not add_index:
-        # Simple, we can dispatch to dask...
-        f = lambda d: convert(pd.DataFrame, d, **kwargs)
-        data = [partial(f, d) for d in seq2]
-        if not data:
-            data = [convert(pd.DataFrame, [], **kwargs)]
-        return chunks(pd.DataFrame)(data)
+        # Simple, we can convert the chunks in a pool. The tasks are made as
+        # the pool asks for them, so that only the partitions of the window
+        # are held in memory, and the chunks can be read once
+        try:
+            first = next(seq2)
+        except StopIteration:
+            return chunks(pd.DataFrame)([convert(pd.DataFrame, [], **kwargs)])
+        tasks = (chunk_task(pd.DataFrame, d, kwargs)
+                 for d in concat([[first], seq2]))
+        scheduler = kwargs.get('scheduler')
+        return chunks(pd.DataFrame)(imap_windowed(tasks, scheduler=scheduler),
+                                    scheduler=scheduler)
 
     # TODO: Decide whether we should support the `add_index` flag at all.
     # If so, we need to post-process the converted DataFrame objects sequencially,
@@ -281,20 +334,20 @@ def numpy_record_to_tuple(rec, **kwargs):
 
 @convert.register(chunks(np.ndarray), chunks(pd.DataFrame), cost=0.5)
 def chunked_pandas_to_chunked_numpy(c, **kwargs):
-    return chunks(np.ndarray)(lambda: (convert(np.ndarray, chunk, **kwargs) for chunk in c))
+    return chunks(np.ndarray)(partial(map_chunks, np.ndarray, c, **kwargs))
 
 @convert.register(chunks(pd.DataFrame), chunks(np.ndarray), cost=0.5)
 def chunked_numpy_to_chunked_pandas(c, **kwargs):
-    return chunks(pd.DataFrame)(lambda: (convert(pd.DataFrame, chunk, **kwargs) for chunk in c))
+    return chunks(pd.DataFrame)(partial(map_chunks, pd.DataFrame, c, **kwargs))
 
 
 @convert.register(chunks(np.ndarray), chunks(list), cost=10.0)
 def chunked_list_to_chunked_numpy(c, **kwargs):
-    return chunks(np.ndarray)(lambda: (convert(np.ndarray, chunk, **kwargs) for chunk in c))
+    return chunks(np.ndarray)(partial(map_chunks, np.ndarray, c, **kwargs))
 
 @convert.register(chunks(list), chunks(np.ndarray), cost=10.0)
 def chunked_numpy_to_chunked_list(c, **kwargs):
-    return chunks(list)(lambda: (convert(list, chunk, **kwargs) for chunk in c))
+    return chunks(list)(partial(map_chunks, list, c, **kwargs))
 
 @convert.register(chunks(Iterator), chunks(list), cost=0.1)
 def chunked_list_to_chunked_iterator(c, **kwargs):
@@ -302,7 +355,7 @@ def chunked_list_to_chunked_iterator(c, **kwargs):
 
 @convert.register(chunks(list), chunks(Iterator), cost=0.1)
 def chunked_Iterator_to_chunked_list(c, **kwargs):
-    return chunks(Iterator)(lambda: (convert(Iterator, chunk, **kwargs) for chunk in c))
+    return chunks(Iterator)(partial(map_chunks, Iterator, c, **kwargs))
 
 @convert.register(Iterator, chunks(Iterator), cost=0.1)
 def chunked_iterator_to_iterator(c, **kwargs):
@@ -1,19 +1,79 @@
 from __future__ import absolute_import, division, print_function
 
 from collections import namedtuple, Iterator
-from contextlib import contextmanager
+import json
+import numbers
+import os
+from threading import RLock
+from timeit import default_timer
 from warnings import warn
 
-from datashape import discover
-import networkx as nx
+import datashape
+from datashape.predicates import isdimension
 import numpy as np
 from toolz import concatv
 
-from .compatibility import map, adjacency
-from .utils import expand_tuples, ignoring
+from .backends import load_triggered
+from .compatibility import map, unicode
+from .discovery import cached_discover
+from .graph import Graph, NoPath
+from .numpy_dtype import dshape_to_numpy
+from .pipeline import pipelined, pipeline_kwargs
+from .utils import expand_tuples, measure
 
 
-ooc_types = set()  # Out-of-Core types
+class OOCTypes(set):
+    """ A set of out-of-core types
+
+    Behaves exactly like a ``set``. ``frozen`` returns a hashable snapshot of
+    the set's contents which is reused until the set is modified so that
+    dispatchers can cheaply notice when new out-of-core types are added.
+
+    >>> types = OOCTypes([list])
+    >>> types.frozen() is types.frozen()
+    True
+    >>> types.add(tuple)
+    >>> sorted(t.__name__ for t in types.frozen())
+    ['list', 'tuple']
+    """
+    def __init__(self, *args):
+        super(OOCTypes, self).__init__(*args)
+        self._frozen = None
+
+    def frozen(self):
+        frozen = self._frozen
+        if frozen is None:
+            frozen = self._frozen = frozenset(self)
+        return frozen
+
+
+def _invalidates_frozen(name):
+    method = getattr(set, name)
+
+    def wrapped(self, *args):
+        self._frozen = None
+        return method(self, *args)
+    wrapped.__name__ = name
+    wrapped.__doc__ = method.__doc__
+    return wrapped
+
+
+for _name in ('add', 'clear', 'discard', 'pop', 'remove', 'update',
+              'difference_update', 'intersection_update',
+              'symmetric_difference_update', '__ior__', '__iand__', '__isub__',
+              '__ixor__'):
+    setattr(OOCTypes, _name, _invalidates_frozen(_name))
+del _name
+
+
+ooc_types = OOCTypes()  # Out-of-Core types
+
+
+# Objects notified about every edge run by ``_transform``. Observers implement
+# ``start(dispatcher, convert_from, convert_to, func, data)`` which returns a
+# token that is later passed to ``finish(token, result)`` or
+# ``error(token, exception)``.
+edge_observers = []
 
 
 class FailedConversionWarning(UserWarning):
@@ -62,70 +122,602 @@ class IterProxy(object):
         self._it = iter(value)
 
 
+class DataSize(namedtuple('DataSize', 'nrows itemsize')):
+    """ The approximate size of some data
+
+    ``nrows`` is the length of the leading dimension and ``itemsize`` is the
+    width of a single row in bytes. Either is ``None`` when it can not be
+    determined from the datashape, for example when the length is ``var``.
+    """
+    __slots__ = ()
+
+    @property
+    def nbytes(self):
+        if self.nrows is None or self.itemsize is None:
+            return None
+        return self.nrows * self.itemsize
+
+
+unknown_size = DataSize(None, None)
+
+
+_data_sizes = {}
+
+
+def data_size(ds):
+    """ The size of data described by the datashape ``ds``
+
+    The number of rows is rounded up to the next power of two so that sizes
+    can be used to bucket cached paths.
+
+    >>> data_size('1000 * {a: int32, b: float64}')
+    DataSize(nrows=1024, itemsize=12)
+    >>> data_size('var * 3 * float32')
+    DataSize(nrows=None, itemsize=12)
+    >>> data_size(None)
+    DataSize(nrows=None, itemsize=None)
+    """
+    if ds is None:
+        return unknown_size
+    try:
+        return _data_sizes[ds]
+    except KeyError:
+        pass
+
+    if len(_data_sizes) > 1024:
+        _data_sizes.clear()
+    size = _data_sizes[ds] = _data_size(ds)
+    return size
+
+
+def _data_size(ds):
+    if not isinstance(ds, datashape.DataShape):
+        ds = datashape.dshape(ds)
+    if not ds.shape or not isdimension(ds[0]):
+        return DataSize(1, _itemsize(ds))
+
+    nrows = getattr(ds[0], 'val', None)
+    if nrows is not None:
+        nrows = _bucket(nrows)
+    return DataSize(nrows, _itemsize(ds.subshape[0]))
+
+
+def _bucket(nrows):
+    return 1 << max(nrows - 1, 0).bit_length() if nrows else 0
+
+
+def measured_size(data, ds):
+    """ The size of ``data`` whose datashape is ``ds``
+
+    When the datashape does not give the number of rows, for example when it
+    is ``var``, they are taken from ``odo.utils.measure`` or estimated from
+    the number of bytes it reports, like the size of a CSV file.
+
+    >>> measured_size([1, 2, 3], 'var * int64')
+    DataSize(nrows=4, itemsize=8)
+    """
+    size = data_size(ds)
+    if size.nrows is not None or data is None:
+        return size
+    rows, nbytes = measure(data)
+    if rows is None and nbytes is not None and size.itemsize:
+        rows = -(-nbytes // size.itemsize)
+    if rows is None:
+        return size
+    return DataSize(_bucket(rows), size.itemsize)
+
+
+def _itemsize(ds):
+    inner = 1
+    for dim in ds.shape:
+        n = getattr(dim, 'val', None)
+        if n is None:
+            return None
+        inner *= n
+    try:
+        return inner * dshape_to_numpy(ds.measure).itemsize
+    except (AttributeError, KeyError, NotImplementedError, TypeError,
+            ValueError):
+        return None
+
+
+def type_name(cls):
+    """ The fully qualified name of a class
+
+    >>> type_name(int)
+    'builtins.int'
+    """
+    module = cls.__module__
+    if module == '__builtin__':  # py2
+        module = 'builtins'
+    return '%s.%s' % (module, cls.__name__)
+
+
+def edge_key(a, b):
+    """ A string identifying the edge from ``a`` to ``b`` in profiles
+
+    >>> edge_key(list, tuple)
+    'builtins.list -> builtins.tuple'
+    """
+    return '%s -> %s' % (type_name(a), type_name(b))
+
+
+_option_types = bool, numbers.Number, bytes, unicode, type(None)
+
+
+def failure_context(dshape, kwargs):
+    """ The inputs a failed edge is remembered for
+
+    The kind of data (the number of dimensions and the measure of its
+    datashape) and the conversion options with simple values. Other options,
+    like connections, and the number of rows do not tell inputs apart.
+
+    >>> failure_context('10 * {a: int64}', {'sep': ';', 'bind': object()})
+    ((1, '{a: int64}'), (('sep', ';'),))
+    """
+    if dshape is not None:
+        ds = datashape.dshape(dshape)
+        dshape = len(ds.shape), str(ds.measure)
+    options = tuple(sorted((k, v) for k, v in kwargs.items()
+                           if isinstance(v, _option_types)))
+    return dshape, options
+
+
+def profile_filename(name):
+    """ The default location of the profile for the dispatcher ``name``
+
+    This is ``~/.odo/<name>.json`` unless the ``ODO_PROFILE_DIR`` environment
+    variable points somewhere else.
+    """
+    dirname = os.environ.get('ODO_PROFILE_DIR',
+                             os.path.join(os.path.expanduser('~'), '.odo'))
+    return os.path.join(dirname, '%s.json' % name)
+
+
+_no_edges = frozenset()
+
+
+PathCacheInfo = namedtuple('PathCacheInfo', 'hits misses currsize')
+
+
 class NetworkDispatcher(object):
+    # Data known to be smaller than this may be routed through in-memory types
+    # even when both the source and the target are out-of-core types
+    in_memory_nbytes = 2 ** 26
+
+    # Seconds for which an edge that raised NotImplementedError is avoided
+    failed_edge_ttl = 600
+
     def __init__(self, name):
         self.name = name
-        self.graph = nx.DiGraph()
+        self.graph = Graph()
+        self._ooc_graph = Graph()
+        self._ooc_graph_types = frozenset()
+        self._path_cache = {}
+        self._path_cache_lock = RLock()
+        self._path_cache_hits = 0
+        self._path_cache_misses = 0
+        self._sized = False
+        self._measured = {}
+        self._failed_edges = {}
+
+        if os.environ.get('ODO_LOAD_PROFILE'):
+            filename = profile_filename(name)
+            if os.path.exists(filename):
+                self.load_profile(filename)
 
     def register(self, a, b, cost=1.0):
+        """ Register a conversion from ``b`` to ``a``
+
+        ``cost`` is either a number or a function from a ``DataSize`` to a
+        number. Size dependent costs are evaluated against the size of the
+        data being converted.
+        """
         sigs = expand_tuples([a, b])
+        if callable(cost):
+            attrs = dict(cost=cost(unknown_size), sized_cost=cost)
+        else:
+            attrs = dict(cost=cost)
 
         def _(func):
-            for a, b in sigs:
-                self.graph.add_edge(b, a, cost=cost, func=func)
+            with self._path_cache_lock:
+                for a, b in sigs:
+                    self.graph.set_edge_data(b, a, dict(attrs, func=func))
+                    if edge_key(b, a) in self._measured:
+                        # the scale of all measured costs changes
+                        self._apply_measured_costs()
+                        self._ooc_graph = Graph()
+                        self._ooc_graph_types = frozenset()
+                    self._add_ooc_edge(b, a)
+                self._sized = self._sized or 'sized_cost' in attrs
+                self.clear_path_cache()
             return func
         return _
 
-    def path(self, *args, **kwargs):
-        return path(self.graph, *args, **kwargs)
+    def load_profile(self, filename=None):
+        """ Route on the throughput measured by ``odo.calibrate``
+
+        The cost of every edge in the profile at ``filename``, by default
+        ``profile_filename(self.name)``, which processed a known number of
+        rows is replaced by its measured cost per row. Measured costs are
+        scaled so that the measured edges together cost as much as their
+        registered costs, which keeps them comparable to the edges which were
+        never measured; those keep their registered costs.
+
+        Profiles are only loaded when this is called, by ``odo.calibrate``, or
+        on creation of the dispatcher when the ``ODO_LOAD_PROFILE``
+        environment variable is set. A profile that can not be read is
+        ignored with a warning.
+
+        See Also
+        --------
+        odo.calibration.calibrate
+        """
+        if filename is None:
+            filename = profile_filename(self.name)
+        try:
+            with open(filename) as f:
+                edges = json.load(f)['edges']
+            measured = {}
+            for key, stats in edges.items():
+                if stats.get('rows'):
+                    measured[key] = (float(stats['seconds']) /
+                                     float(stats['rows']))
+        except (AttributeError, IOError, OSError, KeyError, TypeError,
+                ValueError) as e:
+            warn('Ignoring the profile %r which can not be read: %s' %
+                 (filename, e))
+            return
+
+        with self._path_cache_lock:
+            self._measured.update(measured)
+            self._apply_measured_costs()
+            self._ooc_graph = Graph()
+            self._ooc_graph_types = frozenset()
+            self.clear_path_cache()
+
+    def _apply_measured_costs(self):
+        if not self._measured:
+            return
+        measured = {}
+        for a, b in self.graph.edges():
+            cost = self._measured.get(edge_key(a, b))
+            if cost is not None:
+                measured[a, b] = cost
+        static = dict((edge, self.graph[edge[0]][edge[1]].get(
+                       'static_cost', self.graph[edge[0]][edge[1]]['cost']))
+                      for edge in measured)
+        total = sum(measured.values())
+        scale = sum(static.values()) / total if total else 1.0
+        for (a, b), cost in measured.items():
+            edge = self.graph[a][b].copy()
+            edge.pop('sized_cost', None)
+            edge.setdefault('static_cost', edge['cost'])
+            edge['cost'] = cost * scale
+            self.graph.set_edge_data(a, b, edge)
+
+    def _add_ooc_edge(self, a, b):
+        oocs = tuple(self._ooc_graph_types)
+        if not oocs:
+            return
+        a_is_ooc = issubclass(a, oocs)
+        b_is_ooc = issubclass(b, oocs)
+        if a_is_ooc and b_is_ooc:
+            self._ooc_graph.add_edge(a, b, **self.graph[a][b])
+        elif a_is_ooc:
+            self._ooc_graph.add_node(a)
+        elif b_is_ooc:
+            self._ooc_graph.add_node(b)
+
+    def _add_ooc_types(self, types):
+        oocs = tuple(types)
+        graph = self.graph
+        ooc_graph = self._ooc_graph
+        added = [n for n in graph.nodes()
+                 if n not in ooc_graph and issubclass(n, oocs)]
+        ooc_graph.add_nodes_from(added)
+        for n in added:
+            for succ in graph.successors(n):
+                if succ in ooc_graph:
+                    ooc_graph.add_edge(n, succ, **graph[n][succ])
+            for pred in graph.predecessors(n):
+                if pred in ooc_graph:
+                    ooc_graph.add_edge(pred, n, **graph[pred][n])
+
+    def ooc_graph(self, ooc_types=ooc_types):
+        """ The subgraph of ``graph`` restricted to out-of-core types
+
+        The subgraph is maintained incrementally as edges are registered and
+        as types are added to ``ooc_types``, rather than rebuilt on every
+        call.
+        """
+        types = ooc_types.frozen()
+        with self._path_cache_lock:
+            if types != self._ooc_graph_types:
+                if not self._ooc_graph_types <= types:
+                    # types were removed, start over
+                    self._ooc_graph = Graph()
+                    self._ooc_graph_types = frozenset()
+                self._add_ooc_types(types - self._ooc_graph_types)
+            self._ooc_graph_types = types
+            return self._ooc_graph
+
+    def path(self, source, target, excluded_edges=None, ooc_types=ooc_types,
+             dshape=None, data=None):
+        """ Path of functions between two types
+
+        When ``dshape`` is given edges with size dependent costs are weighed
+        against the size of the data it describes, or, when it does not give
+        the number of rows, against the size of ``data`` as far as it can be
+        measured, see ``measured_size``. Transfers between two
+        out-of-core types are normally restricted to out-of-core types; when
+        the data is known to be smaller than ``in_memory_nbytes`` in-memory
+        routes are considered as well.
+
+        Paths are memoized on the source type, the target type, the excluded
+        edges, the set of out-of-core types and the size of the data. The
+        cache is cleared whenever a new edge is registered.
+
+        See Also
+        --------
+        NetworkDispatcher.path_cache_info
+        NetworkDispatcher.clear_path_cache
+        """
+        if not isinstance(source, type):
+            source = type(source)
+        if not isinstance(target, type):
+            target = type(target)
+
+        if isinstance(ooc_types, OOCTypes):
+            oocs = ooc_types.frozen()
+        else:
+            oocs = frozenset(ooc_types or ())
+
+        sized = self._sized or _is_ooc_transfer(source, target, ooc_types)
+        if dshape is not None and sized:
+            size = measured_size(data, dshape)
+        else:
+            size = unknown_size
+
+        excluded = frozenset(excluded_edges) if excluded_edges else _no_edges
+        key = source, target, excluded, oocs, size
+        if key not in self._path_cache:
+            # lazily loaded backends may add edges, see odo.backends
+            load_triggered()
+        with self._path_cache_lock:
+            try:
+                pth = self._path_cache[key]
+            except KeyError:
+                self._path_cache_misses += 1
+                pth = tuple(self._find_path(source, target,
+                                            excluded_edges=excluded_edges,
+                                            ooc_types=ooc_types,
+                                            size=size))
+                self._path_cache[key] = pth
+            else:
+                self._path_cache_hits += 1
+        return iter(pth)
+
+    def _find_path(self, source, target, excluded_edges, ooc_types, size):
+        source, graph = self._routing_graph(source, target, ooc_types, size)
+        return _shortest_path(graph, source, target, excluded_edges, size)
+
+    def _routing_graph(self, source, target, ooc_types, size):
+        source = _resolve_source(self.graph, source)
+        if (not _is_ooc_transfer(source, target, ooc_types) or
+                self._fits_in_memory(size)):
+            graph = self.graph
+        elif isinstance(ooc_types, OOCTypes):
+            graph = self.ooc_graph(ooc_types)
+        else:
+            graph = _ooc_subgraph(self.graph, ooc_types)
+        return source, graph
+
+    def paths(self, source, target, k=5, excluded_edges=None,
+              ooc_types=ooc_types, dshape=None, data=None):
+        """ Up to ``k`` paths from ``source`` to ``target``, cheapest first
+
+        The first path is the one ``path`` would return. Paths are found on
+        the same graph as ``path`` so they obey the same out-of-core and
+        size-dependent routing rules.
+
+        >>> d = NetworkDispatcher('paths_example')
+        >>> _ = d.register(tuple, list, cost=1.0)(tuple)
+        >>> _ = d.register(set, list, cost=1.0)(set)
+        >>> _ = d.register(tuple, set, cost=1.0)(tuple)
+        >>> [path_cost(p) for p in d.paths(list, tuple)]
+        [1.0, 2.0]
+        """
+        if not isinstance(source, type):
+            source = type(source)
+        if not isinstance(target, type):
+            target = type(target)
+        size = measured_size(data, dshape) if dshape is not None else \
+            unknown_size
+        source, graph = self._routing_graph(source, target, ooc_types, size)
+        return _shortest_paths(graph, source, target, excluded_edges, size, k)
+
+    def _fits_in_memory(self, size):
+        nbytes = size.nbytes
+        return nbytes is not None and nbytes <= self.in_memory_nbytes
+
+    def precompute(self, ooc_types=ooc_types):
+        """ Compute the cheapest routes between all pairs of types
+
+        Later calls to ``path`` that do not exclude edges or depend on the
+        size of the data only look routes up. Registering a new edge discards
+        the routes.
+        """
+        with self._path_cache_lock:
+            self.graph.precompute()
+            if isinstance(ooc_types, OOCTypes):
+                self.ooc_graph(ooc_types).precompute()
+
+    def mark_failed(self, a, b, reason, dshape=None, **kwargs):
+        """ Avoid the edge from ``a`` to ``b`` for ``failed_edge_ttl`` seconds
+
+        ``_transform`` marks every edge that raises ``NotImplementedError`` so
+        that later conversions do not pay for the same failure again. The
+        failure is remembered for data of the same ``dshape`` converted with
+        the same options, so the edge is still tried on other inputs. Such
+        edges are only avoided when there is another path to the target.
+
+        See Also
+        --------
+        NetworkDispatcher.avoided_edges
+        NetworkDispatcher.failed_edges
+        NetworkDispatcher.clear_failed_edges
+        """
+        key = (a, b), failure_context(dshape, kwargs)
+        with self._path_cache_lock:
+            self._failed_edges[key] = (reason,
+                                       default_timer() + self.failed_edge_ttl)
+
+    def _live_failures(self):
+        now = default_timer()
+        with self._path_cache_lock:
+            for key, (_, expires) in list(self._failed_edges.items()):
+                if expires <= now:
+                    del self._failed_edges[key]
+            return list(self._failed_edges.items())
+
+    def avoided_edges(self, dshape=None, **kwargs):
+        """ The edges that failed for data of ``dshape`` converted with
+        ``kwargs``
+
+        >>> d = NetworkDispatcher('avoided_edges_example')
+        >>> d.mark_failed(list, tuple, 'NotImplementedError: nope',
+        ...               dshape='3 * int64')
+        >>> d.avoided_edges(dshape='3 * int64') == {(list, tuple)}
+        True
+        >>> d.avoided_edges(dshape='3 * float64')
+        set()
+        """
+        if not self._failed_edges:
+            return set()
+        context = failure_context(dshape, kwargs)
+        return set(edge for (edge, ctx), _ in self._live_failures()
+                   if ctx == context)
+
+    def failed_edges(self):
+        """ A dict mapping the edges that failed for any input to why they
+        failed
+
+        >>> d = NetworkDispatcher('failed_edges_example')
+        >>> d.mark_failed(list, tuple, 'NotImplementedError: nope')
+        >>> list(d.failed_edges().values())
+        ['NotImplementedError: nope']
+        >>> d.clear_failed_edges()
+        >>> d.failed_edges()
+        {}
+        """
+        if not self._failed_edges:
+            return {}
+        return dict((edge, reason)
+                    for (edge, _), (reason, _) in self._live_failures())
+
+    def clear_failed_edges(self):
+        """ Stop avoiding the edges that failed in earlier conversions """
+        with self._path_cache_lock:
+            self._failed_edges.clear()
+
+    def path_cache_info(self):
+        """ Statistics about the path cache
+
+        >>> d = NetworkDispatcher('d')
+        >>> d.path_cache_info()
+        PathCacheInfo(hits=0, misses=0, currsize=0)
+        """
+        return PathCacheInfo(self._path_cache_hits,
+                             self._path_cache_misses,
+                             len(self._path_cache))
+
+    def clear_path_cache(self):
+        """ Forget all memoized paths and reset the cache statistics """
+        with self._path_cache_lock:
+            self._path_cache.clear()
+            self._path_cache_hits = self._path_cache_misses = 0
 
     def __call__(self, *args, **kwargs):
-        return _transform(self.graph, *args, **kwargs)
+        return _transform(self, *args, **kwargs)
 
 
-def _transform(graph, target, source, excluded_edges=None, ooc_types=ooc_types,
-               **kwargs):
+def _transform(dispatcher, target, source, excluded_edges=None,
+               ooc_types=ooc_types, **kwargs):
     """ Transform source to target type using graph of transformations """
     # take a copy so we can mutate without affecting the input
     excluded_edges = (excluded_edges.copy()
                       if excluded_edges is not None else
                       set())
 
-    with ignoring(NotImplementedError):
-        if 'dshape' not in kwargs or kwargs['dshape'] is None:
-            kwargs['dshape'] = discover(source)
+    if kwargs.get('dshape') is None:
+        try:
+            kwargs['dshape'] = cached_discover(source)
+        except NotImplementedError:
+            pass
 
-    pth = path(graph, type(source), target,
-               excluded_edges=excluded_edges,
-               ooc_types=ooc_types)
+    # avoid edges which failed in earlier conversions if we can
+    failed = dispatcher.avoided_edges(**kwargs) - excluded_edges
+    try:
+        pth = dispatcher.path(type(source), target,
+                              excluded_edges=excluded_edges | failed,
+                              ooc_types=ooc_types,
+                              dshape=kwargs.get('dshape'),
+                              data=source)
+    except NoPath:
+        if not failed:
+            raise
+        pth = dispatcher.path(type(source), target,
+                              excluded_edges=excluded_edges,
+                              ooc_types=ooc_types,
+                              dshape=kwargs.get('dshape'),
+                              data=source)
+    else:
+        excluded_edges |= failed
+
+    # with pipeline=True every chunked stage is produced in its own thread
+    pipe = pipeline_kwargs(kwargs)
 
     x = source
     path_proxy = IterProxy(pth)
     for convert_from, convert_to, f, cost in path_proxy:
         try:
-            x = f(x, excluded_edges=excluded_edges, **kwargs)
+            x = run_edge(dispatcher, convert_from, convert_to, f, x,
+                         excluded_edges=excluded_edges, **kwargs)
+            if pipe is not None:
+                x = pipelined(x, **pipe)
         except NotImplementedError as e:
             if kwargs.get('raise_on_errors'):
                 raise
             warn(FailedConversionWarning(convert_from, convert_to, e))
+            dispatcher.mark_failed(convert_from, convert_to,
+                                   '%s: %s' % (type(e).__name__, e),
+                                   **kwargs)
 
             # exclude the broken edge
             excluded_edges |= {(convert_from, convert_to)}
 
             # compute the path from `source` to `target` excluding
             # the edge that broke
-            fresh_path = list(path(graph, type(source), target,
-                                   excluded_edges=excluded_edges,
-                                   ooc_types=ooc_types))
+            fresh_path = list(dispatcher.path(type(source), target,
+                                              excluded_edges=excluded_edges,
+                                              ooc_types=ooc_types,
+                                              dshape=kwargs.get('dshape'),
+                                              data=source))
             fresh_path_cost = path_cost(fresh_path)
 
             # compute the path from the current `convert_from` type
             # to the `target`
             try:
-                greedy_path = list(path(graph, convert_from, target,
-                                        excluded_edges=excluded_edges,
-                                        ooc_types=ooc_types))
-            except nx.exception.NetworkXNoPath:
+                greedy_path = list(dispatcher.path(
+                    convert_from,
+                    target,
+                    excluded_edges=excluded_edges,
+                    ooc_types=ooc_types,
+                    dshape=kwargs.get('dshape'),
+                    data=x,
+                ))
+            except NoPath:
                 greedy_path_cost = np.inf
             else:
                 greedy_path_cost = path_cost(greedy_path)
@@ -144,38 +736,89 @@ def _transform(graph, target, source, excluded_edges=None, ooc_types=ooc_types,
     return x
 
 
+def run_edge(dispatcher, convert_from, convert_to, func, data, **kwargs):
+    """ Call the function of one edge of a path, notifying ``edge_observers``
+    """
+    if not edge_observers:
+        return func(data, **kwargs)
+    observers = list(edge_observers)
+    tokens = [observer.start(dispatcher, convert_from, convert_to, func, data)
+              for observer in observers]
+    try:
+        result = func(data, **kwargs)
+    except Exception as e:
+        for observer, token in zip(observers, tokens):
+            observer.error(token, e)
+        raise
+    for observer, token in zip(observers, tokens):
+        observer.finish(token, result)
+    return result
+
+
 PathPart = namedtuple('PathPart', 'convert_from convert_to func cost')
 _virtual_superclasses = (Iterator,)
 
 
-def path(graph, source, target, excluded_edges=None, ooc_types=ooc_types):
+def path(graph, source, target, excluded_edges=None, ooc_types=ooc_types,
+         dshape=None):
     """ Path of functions between two types """
     if not isinstance(source, type):
         source = type(source)
     if not isinstance(target, type):
         target = type(target)
 
-    for cls in concatv(source.mro(), _virtual_superclasses):
-        if cls in graph:
-            source = cls
-            break
+    source = _resolve_source(graph, source)
 
     # If both source and target are Out-Of-Core types then restrict ourselves
     # to the graph of out-of-core types
-    if ooc_types:
-        oocs = tuple(ooc_types)
-        if issubclass(source, oocs) and issubclass(target, oocs):
-            graph = graph.subgraph([n for n in graph.nodes()
-                                    if issubclass(n, oocs)])
-    with without_edges(graph, excluded_edges) as g:
-        pth = nx.shortest_path(g, source=source, target=target, weight='cost')
-        edge = adjacency(graph)
+    if _is_ooc_transfer(source, target, ooc_types):
+        graph = _ooc_subgraph(graph, ooc_types)
+    return _shortest_path(graph, source, target, excluded_edges,
+                          data_size(dshape))
+
 
-        def path_part(src, tgt):
-            node = edge[src][tgt]
-            return PathPart(src, tgt, node['func'], node['cost'])
+def _ooc_subgraph(graph, ooc_types):
+    oocs = tuple(ooc_types)
+    return graph.subgraph([n for n in graph.nodes() if issubclass(n, oocs)])
 
-        return map(path_part, pth, pth[1:])
+
+def _resolve_source(graph, source):
+    """ The first class in the mro of ``source`` which is in ``graph`` """
+    for cls in concatv(source.mro(), _virtual_superclasses):
+        if cls in graph:
+            return cls
+    return source
+
+
+def _is_ooc_transfer(source, target, ooc_types):
+    if not ooc_types:
+        return False
+    oocs = tuple(ooc_types)
+    return issubclass(source, oocs) and issubclass(target, oocs)
+
+
+def _shortest_path(graph, source, target, excluded_edges, size=unknown_size):
+    weight = sized_weight(size)
+    pth = graph.shortest_path(source, target, excluded_edges=excluded_edges,
+                              weight=weight)
+    return _path_parts(graph, pth, weight)
+
+
+def _shortest_paths(graph, source, target, excluded_edges, size, k):
+    weight = sized_weight(size)
+    return [tuple(_path_parts(graph, pth, weight))
+            for pth in graph.shortest_paths(source, target, k,
+                                            excluded_edges=excluded_edges,
+                                            weight=weight)]
+
+
+def _path_parts(graph, pth, weight=None):
+    def path_part(src, tgt):
+        edge = graph[src][tgt]
+        cost = edge['cost'] if weight is None else weight(src, tgt, edge)
+        return PathPart(src, tgt, edge['func'], cost)
+
+    return map(path_part, pth, pth[1:])
 
 
 def path_cost(path):
@@ -184,17 +827,14 @@ def path_cost(path):
     return sum(p.cost for p in path)
 
 
-@contextmanager
-def without_edges(g, edges):
-    edges = edges or []
-    held = dict()
-    _g_edge = adjacency(g)
-    for a, b in edges:
-        held[(a, b)] = _g_edge[a][b]
-        g.remove_edge(a, b)
+def sized_weight(size):
+    """ The edge weight function that evaluates size dependent costs at
+    ``size``, or ``None`` when the size is unknown
+    """
+    if size == unknown_size:
+        return None
 
-    try:
-        yield g
-    finally:
-        for (a, b), kwargs in held.items():
-            g.add_edge(a, b, **kwargs)
+    def weight(a, b, data):
+        sized_cost = data.get('sized_cost')
+        return data['cost'] if sized_cost is None else sized_cost(size)
+    return weight
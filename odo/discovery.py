@@ -0,0 +1,203 @@
+from __future__ import absolute_import, division, print_function
+
+import hashlib
+import json
+import os
+import uuid
+from threading import Lock
+
+import datashape
+from multipledispatch import Dispatcher
+
+from .backends import load_triggered
+
+__all__ = ('DiscoverCache', 'discover_cache', 'cached_discover',
+           'fingerprint', 'file_fingerprint', 'LazyDiscover')
+
+
+class LazyDiscover(object):
+    """ ``datashape.discover`` that first loads the backends whose trigger
+    modules have been imported, see ``odo.backends``
+
+    ``odo.discover`` is an instance, so that loading backends lazily leaves
+    ``datashape.discover`` alone for other libraries. Everything but calling
+    it, such as ``register``, is passed through to ``datashape.discover``.
+
+    >>> LazyDiscover()([1, 2, 3])
+    dshape("3 * int64")
+    """
+    def __call__(self, *args, **kwargs):
+        load_triggered()
+        return datashape.discover(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(datashape.discover, name)
+
+    def __repr__(self):
+        return '<lazy %r>' % datashape.discover
+
+
+discover = LazyDiscover()
+
+
+fingerprint = Dispatcher('fingerprint')
+
+
+@fingerprint.register(object)
+def fingerprint_object(data):
+    """ A hashable key that changes whenever the datashape of ``data`` may
+
+    Returns ``None`` for data whose datashape can not be cached, which is the
+    default. Fingerprints of file backed data start with ``'file'`` followed
+    by the ``file_fingerprint`` of the file and the options that change how
+    it is read; only these are persisted by ``DiscoverCache``.
+    """
+    return None
+
+
+def file_fingerprint(path):
+    """ The absolute path, size and modification time of the file ``path``
+
+    ``None`` if ``path`` does not exist.
+
+    >>> file_fingerprint('/no/such/file') is None
+    True
+    """
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError):
+        return None
+    return (os.path.abspath(path), st.st_size,
+            getattr(st, 'st_mtime_ns', st.st_mtime))
+
+
+class DiscoverCache(object):
+    """ The datashapes of data keyed by their fingerprint
+
+    Datashapes are kept in memory and, when ``directory`` is set, written to
+    one small JSON file per entry there so that other processes can reuse
+    them. Only fingerprints of files are persisted; other fingerprints may
+    describe something that changed in the meantime. ``directory`` defaults
+    to the ``ODO_DISCOVER_CACHE_DIR`` environment variable.
+
+    See Also
+    --------
+    cached_discover
+    fingerprint
+    """
+    maxsize = 1024
+
+    def __init__(self, directory=None):
+        if directory is None:
+            directory = os.environ.get('ODO_DISCOVER_CACHE_DIR') or None
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._data = {}
+        self._lock = Lock()
+
+    def get(self, key):
+        try:
+            ds = self._data[key]
+        except KeyError:
+            ds = self._load(key)
+            if ds is None:
+                self.misses += 1
+                return None
+            self._store(key, ds)
+        self.hits += 1
+        return ds
+
+    def set(self, key, ds):
+        self._store(key, ds)
+        if self.directory is not None and _persistent(key):
+            self._save(key, ds)
+
+    def forget(self, key):
+        """ Remove ``key`` from memory and from ``directory`` """
+        with self._lock:
+            self._data.pop(key, None)
+        filename = self._filename(key)
+        if filename is not None and os.path.exists(filename):
+            os.remove(filename)
+
+    def clear(self):
+        """ Empty the in-memory cache """
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def _store(self, key, ds):
+        with self._lock:
+            if len(self._data) >= self.maxsize:
+                self._data.clear()
+            self._data[key] = ds
+
+    def _filename(self, key):
+        if self.directory is None or not _persistent(key):
+            return None
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, 'discover-%s.json' % digest)
+
+    def _load(self, key):
+        filename = self._filename(key)
+        if filename is None:
+            return None
+        try:
+            with open(filename) as f:
+                entry = json.load(f)
+            if entry['key'] != repr(key):
+                return None
+            return datashape.dshape(entry['dshape'])
+        except Exception:
+            # missing, partially written or unparseable entries are misses
+            return None
+
+    def _save(self, key, ds):
+        filename = self._filename(key)
+        if not os.path.exists(self.directory):
+            try:
+                os.makedirs(self.directory)
+            except OSError:  # created concurrently
+                pass
+        # write and rename so readers never see a partial entry
+        tmp = '%s.%s.tmp' % (filename, uuid.uuid4().hex)
+        with open(tmp, 'w') as f:
+            json.dump({'key': repr(key), 'dshape': str(ds)}, f)
+        _replace(tmp, filename)
+
+    def __repr__(self):
+        return '<%s: %d entries, %d hits, %d misses>' % (
+            type(self).__name__, len(self._data), self.hits, self.misses)
+
+
+def _persistent(key):
+    return isinstance(key, tuple) and len(key) > 1 and key[0] == 'file'
+
+
+try:
+    _replace = os.replace
+except AttributeError:  # py2, rename replaces existing files on POSIX
+    _replace = os.rename
+
+
+discover_cache = DiscoverCache()
+
+
+def cached_discover(data):
+    """ ``discover(data)``, reusing earlier results for unchanged data
+
+    Data that has no fingerprint is always discovered.
+
+    >>> cached_discover([1, 2, 3])
+    dshape("3 * int64")
+    """
+    load_triggered()  # so that the data's backend can fingerprint it
+    key = fingerprint(data)
+    if key is None:
+        return discover(data)
+    ds = discover_cache.get(key)
+    if ds is None:
+        ds = discover(data)
+        discover_cache.set(key, ds)
+    return ds
@@ -15,7 +15,7 @@ def dot_graph(filename='conversions'):
     # Edges from Convert
     dg = nx.DiGraph()
     for a, b in convert.graph.edges():
-        cost = convert.graph.edge[a][b]['cost']
+        cost = convert.graph[a][b]['cost']
         dg.add_edge(cls_name(a), cls_name(b),
                     cost=cost,
                     penwidth=max(log(1./(cost + 0.06)), 1))
@@ -0,0 +1,201 @@
+from __future__ import absolute_import, division, print_function
+
+import datashape
+
+from .append import append
+from .compatibility import unicode
+from .convert import convert
+from .core import path_cost
+from .discovery import cached_discover
+from .resource import resource, resource_type
+from .utils import ignoring
+
+__all__ = 'explain', 'Explanation'
+
+
+def _name(obj):
+    return getattr(obj, '__name__', repr(obj))
+
+
+class Explanation(object):
+    """ How ``odo`` would move data from a source to a target
+
+    Attributes
+    ----------
+    source : object
+        The source, after resolving string URIs with ``resource``.
+    target : object
+        The target type, the target object, or the target URI.
+    dshape : DataShape or None
+        The datashape of the source.
+    paths : list of tuples of PathPart
+        The candidate conversion paths, cheapest first. ``odo`` takes the
+        first one. When the target is a type these lead to the target,
+        otherwise to the type ``append`` converts the source to.
+    append : callable or None
+        The ``append`` implementation ``odo`` dispatches to when the target is
+        an object or a URI.
+    via : type or None
+        The type ``append`` converts the source to before appending it, see
+        ``odo.append.appends_via``.
+    append_via : callable or None
+        The ``append`` implementation that then appends the converted data.
+    resource : callable or None
+        The ``resource`` implementation that handles a target URI.
+    target_type : type or None
+        The type a target URI resolves to, ``None`` if the ``resource``
+        implementation does not declare it, see ``odo.resource.resolves_to``.
+    """
+    def __init__(self, source, target, dshape=None, paths=(), append=None,
+                 resource=None, via=None, append_via=None, target_type=None):
+        self.source = source
+        self.target = target
+        self.dshape = dshape
+        self.paths = list(paths)
+        self.append = append
+        self.via = via
+        self.append_via = append_via
+        self.resource = resource
+        self.target_type = target_type
+
+    @property
+    def path(self):
+        """ The path ``odo`` would take, or ``None`` """
+        return self.paths[0] if self.paths else None
+
+    @property
+    def cost(self):
+        """ The total cost of the path ``odo`` would take, or ``None`` """
+        return path_cost(self.path) if self.paths else None
+
+    def render(self):
+        target = self.target
+        if isinstance(target, (str, unicode)):
+            target = '%s (%s)' % (target, _name(self.target_type)
+                                  if self.target_type is not None
+                                  else 'unknown type')
+        elif isinstance(target, type):
+            target = _name(target)
+        else:
+            target = _name(type(target))
+        lines = ['source: %s' % _name(type(self.source)),
+                 'target: %s' % target,
+                 'dshape: %s' % self.dshape]
+        if self.resource is not None:
+            lines.append('target resolved by %s' % _qualname(self.resource))
+        if self.append is not None:
+            lines.append('append: %s' % _qualname(self.append))
+        if self.via is not None:
+            lines.append('converts to %s, then append: %s' %
+                         (_name(self.via), _qualname(self.append_via)))
+        if self.paths:
+            lines.append('paths:')
+            for i, pth in enumerate(self.paths):
+                types = [pth[0].convert_from] + [p.convert_to for p in pth]
+                lines.append('  %s%8.2f  %s' % ('*' if i == 0 else ' ',
+                                                path_cost(pth),
+                                                ' -> '.join(map(_name,
+                                                                types))))
+        elif isinstance(self.target, type) or self.via is not None:
+            lines.append('no path found')
+        return '\n'.join(lines)
+
+    __repr__ = __str__ = render
+
+
+def _qualname(func):
+    return '%s.%s' % (func.__module__, _name(func))
+
+
+def _paths(source, target, k, dshape, kwargs):
+    """ The candidate paths of ``convert`` from the data ``source``, found
+    like ``odo.core._transform`` finds its path
+    """
+    kwargs = kwargs.copy()
+    excluded = set(kwargs.pop('excluded_edges', None) or ())
+    options = dict(k=k, dshape=dshape, data=source)
+    if 'ooc_types' in kwargs:
+        options['ooc_types'] = kwargs.pop('ooc_types')
+    failed = convert.avoided_edges(dshape=dshape, **kwargs) - excluded
+    if failed:
+        paths = convert.paths(type(source), target,
+                              excluded_edges=excluded | failed, **options)
+        if paths:
+            return paths
+    return convert.paths(type(source), target, excluded_edges=excluded,
+                         **options)
+
+
+def explain(source, target, k=5, **kwargs):
+    """ Explain how ``odo(source, target, **kwargs)`` would run
+
+    Nothing is converted, appended or created. String sources are resolved
+    with ``resource`` and discovered like ``odo`` does. String targets are
+    not resolved; their type is the one the ``resource`` implementation
+    handling them declares with ``odo.resource.resolves_to``.
+
+    When the target is an object or a URI the ``append`` implementation
+    ``odo`` dispatches to is reported, together with the conversion paths to
+    the type it converts the source to when it declares one with
+    ``odo.append.appends_via``. Edges which failed in earlier conversions are
+    avoided like ``odo`` avoids them.
+
+    Parameters
+    ----------
+    source: object or string
+        The source of your data
+    target: object or string or type
+        The target for where you want your data to go
+    k: int (optional, defaults to 5)
+        The number of candidate paths to find
+    **kwargs:
+        The keyword arguments you would pass to ``odo``
+
+    Examples
+    --------
+
+    >>> import numpy as np
+    >>> e = explain(np.arange(5), list)
+    >>> [(p.convert_from.__name__, p.convert_to.__name__) for p in e.path]
+    [('ndarray', 'list')]
+    >>> e.cost
+    10.0
+
+    See Also
+    --------
+    odo.odo
+    odo.core.NetworkDispatcher.paths
+    """
+    dshape = kwargs.pop('dshape', None)
+    if isinstance(dshape, (str, unicode)):
+        dshape = datashape.dshape(dshape)
+    if isinstance(source, (str, unicode)):
+        source = resource(source, dshape=dshape, **kwargs)
+    if dshape is None:
+        with ignoring(NotImplementedError):
+            dshape = cached_discover(source)
+
+    if isinstance(target, type):
+        paths = _paths(source, target, k, dshape, kwargs)
+        return Explanation(source, target, dshape=dshape, paths=paths)
+
+    resolver = target_type = None
+    if isinstance(target, (str, unicode)):
+        resolver = resource.dispatch(target)
+        target_type = resource_type(target)
+        if target_type is None:
+            return Explanation(source, target, dshape=dshape,
+                               resource=resolver)
+    else:
+        target_type = type(target)
+
+    impl = append.dispatch(target_type, type(source))
+    via = getattr(impl, 'appends_via', None)
+    if via is None:
+        return Explanation(source, target, dshape=dshape, append=impl,
+                           resource=resolver, target_type=target_type)
+    paths = _paths(source, via, k, dshape, kwargs)
+    return Explanation(source, target, dshape=dshape, paths=paths,
+                       append=impl, via=via,
+                       append_via=append.dispatch(target_type, via),
+                       resource=resolver, target_type=target_type)
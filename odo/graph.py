@@ -0,0 +1,275 @@
+from __future__ import absolute_import, division, print_function
+
+from heapq import heappush, heappop
+from itertools import count
+
+__all__ = 'Graph', 'NoPath'
+
+
+class NoPath(Exception):
+    """ There is no path between two nodes of a ``Graph`` """
+
+
+class Graph(object):
+    """ A small directed graph for routing conversions
+
+    Nodes are mapped to consecutive integers and the edges leaving each node
+    are compiled to a tuple of ``(target index, cost)`` pairs the first time a
+    path is requested. Shortest path trees are cached per source until the
+    graph changes.
+
+    The API is a subset of ``networkx.DiGraph``. Edge data should only be
+    changed through ``add_edge`` or ``set_edge_data`` so that the compiled
+    costs are kept up to date.
+
+    >>> g = Graph()
+    >>> g.add_edge('a', 'b', cost=1.0)
+    >>> g.add_edge('b', 'c', cost=1.0)
+    >>> g.add_edge('a', 'c', cost=3.0)
+    >>> g.shortest_path('a', 'c')
+    ['a', 'b', 'c']
+    >>> g.shortest_path('a', 'c', excluded_edges=[('b', 'c')])
+    ['a', 'c']
+    >>> g['a']['c']
+    {'cost': 3.0}
+    """
+    def __init__(self):
+        self._index = {}
+        self._nodes = []
+        self._succ = []
+        self._adj = None
+        self._trees = {}
+
+    # Structure
+
+    def add_node(self, n):
+        try:
+            return self._index[n]
+        except KeyError:
+            i = self._index[n] = len(self._nodes)
+            self._nodes.append(n)
+            self._succ.append({})
+            self._changed()
+            return i
+
+    def add_nodes_from(self, nodes):
+        for n in nodes:
+            self.add_node(n)
+
+    def add_edge(self, a, b, **attrs):
+        """ Add an edge or update the data of an existing one """
+        i, j = self.add_node(a), self.add_node(b)
+        self._succ[i].setdefault(j, {}).update(attrs)
+        self._changed()
+
+    def set_edge_data(self, a, b, data):
+        """ Replace the data of an edge, keeping its position among the edges
+        leaving ``a``
+        """
+        i, j = self.add_node(a), self.add_node(b)
+        self._succ[i][j] = dict(data)
+        self._changed()
+
+    def remove_edge(self, a, b):
+        del self._succ[self._index[a]][self._index[b]]
+        self._changed()
+
+    def remove_edges_from(self, edges):
+        for a, b in edges:
+            self.remove_edge(a, b)
+
+    def has_edge(self, a, b):
+        return (a in self._index and b in self._index and
+                self._index[b] in self._succ[self._index[a]])
+
+    def nodes(self):
+        return list(self._nodes)
+
+    def edges(self, data=False):
+        nodes = self._nodes
+        if data:
+            return [(nodes[i], nodes[j], d)
+                    for i, succ in enumerate(self._succ)
+                    for j, d in succ.items()]
+        return [(nodes[i], nodes[j])
+                for i, succ in enumerate(self._succ)
+                for j in succ]
+
+    def successors(self, n):
+        return [self._nodes[j] for j in self._succ[self._index[n]]]
+
+    def predecessors(self, n):
+        i = self._index[n]
+        return [self._nodes[k] for k, succ in enumerate(self._succ)
+                if i in succ]
+
+    def copy(self):
+        return self.subgraph(self._nodes)
+
+    def subgraph(self, nodes):
+        """ A new graph of ``nodes`` and the edges between them """
+        g = type(self)()
+        keep = set(self._index[n] for n in nodes if n in self._index)
+        for i in sorted(keep):
+            g.add_node(self._nodes[i])
+        for i in sorted(keep):
+            for j, d in self._succ[i].items():
+                if j in keep:
+                    g.add_edge(self._nodes[i], self._nodes[j], **d)
+        return g
+
+    def __contains__(self, n):
+        return n in self._index
+
+    def __iter__(self):
+        return iter(self._nodes)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __getitem__(self, n):
+        nodes = self._nodes
+        return dict((nodes[j], d)
+                    for j, d in self._succ[self._index[n]].items())
+
+    def _changed(self):
+        self._adj = None
+        self._trees.clear()
+
+    # Routing
+
+    def _compile(self, weight=None):
+        if weight is None:
+            if self._adj is None:
+                self._adj = [tuple((j, d['cost']) for j, d in succ.items())
+                             for succ in self._succ]
+            return self._adj
+        nodes = self._nodes
+        return [tuple((j, weight(nodes[i], nodes[j], d))
+                      for j, d in succ.items())
+                for i, succ in enumerate(self._succ)]
+
+    def _endpoints(self, source, target):
+        try:
+            return self._index[source], self._index[target]
+        except KeyError:
+            raise NoPath('No path from %s to %s' % (source, target))
+
+    def shortest_path(self, source, target, excluded_edges=None,
+                      weight=None):
+        """ The cheapest path from ``source`` to ``target`` as a list of nodes
+
+        Parameters
+        ----------
+        excluded_edges : iterable of pairs of nodes, optional
+            Edges that may not be used
+        weight : callable, optional
+            ``weight(a, b, data)`` returns the cost of an edge, by default the
+            cost is ``data['cost']``
+
+        Raises
+        ------
+        NoPath
+            If ``target`` can not be reached from ``source``
+        """
+        i, j = self._endpoints(source, target)
+        skip = self._skipped(excluded_edges)
+        if not skip and weight is None:
+            try:
+                paths = self._trees[i]
+            except KeyError:
+                paths = self._trees[i] = _dijkstra(self._compile(), i)[1]
+        else:
+            paths = _dijkstra(self._compile(weight), i, j, skip)[1]
+        try:
+            pth = paths[j]
+        except KeyError:
+            raise NoPath('No path from %s to %s' % (source, target))
+        return [self._nodes[k] for k in pth]
+
+    def shortest_paths(self, source, target, k, excluded_edges=None,
+                       weight=None):
+        """ Up to ``k`` simple paths from ``source`` to ``target``, cheapest
+        first
+
+        Paths are found with Yen's algorithm; the first one is the path
+        ``shortest_path`` returns.
+        """
+        try:
+            i, j = self._endpoints(source, target)
+        except NoPath:
+            return []
+        adj = self._compile(weight)
+        skip = self._skipped(excluded_edges) or set()
+        costs = [dict(succ) for succ in adj]
+
+        def cost(pth):
+            return sum(costs[a][b] for a, b in zip(pth, pth[1:]))
+
+        paths = _dijkstra(adj, i, j, skip)[1]
+        if j not in paths:
+            return []
+        found = [paths[j]]
+        candidates = []
+        seen = set([tuple(paths[j])])
+        c = count()
+        while len(found) < k:
+            last = found[-1]
+            for n in range(len(last) - 1):
+                root = last[:n + 1]
+                removed = set(skip)
+                removed.update((p[n], p[n + 1]) for p in found
+                               if len(p) > n + 1 and p[:n + 1] == root)
+                spur = _dijkstra(adj, root[-1], j, removed,
+                                 blocked=set(root[:-1]))[1]
+                if j in spur:
+                    pth = root[:-1] + spur[j]
+                    if tuple(pth) not in seen:
+                        seen.add(tuple(pth))
+                        heappush(candidates, (cost(pth), next(c), pth))
+            if not candidates:
+                break
+            found.append(heappop(candidates)[2])
+        return [[self._nodes[n] for n in pth] for pth in found]
+
+    def precompute(self):
+        """ Compute the shortest path tree of every node """
+        adj = self._compile()
+        for i in range(len(self._nodes)):
+            if i not in self._trees:
+                self._trees[i] = _dijkstra(adj, i)[1]
+
+    def _skipped(self, edges):
+        if not edges:
+            return None
+        index = self._index
+        return set((index[a], index[b]) for a, b in edges
+                   if a in index and b in index)
+
+
+def _dijkstra(adj, source, target=None, skip=None, blocked=None):
+    """ Single source Dijkstra over compiled adjacency lists
+
+    Ties are broken in favour of the path found first, like networkx.
+    """
+    dist = {}
+    paths = {source: [source]}
+    seen = {source: 0}
+    c = count()
+    fringe = [(0, next(c), source)]
+    while fringe:
+        d, _, v = heappop(fringe)
+        if v in dist:
+            continue
+        dist[v] = d
+        if v == target:
+            break
+        for u, cost in adj[v]:
+            if skip and (v, u) in skip or blocked and u in blocked:
+                continue
+            vu = d + cost
+            if u not in dist and (u not in seen or vu < seen[u]):
+                seen[u] = vu
+                heappush(fringe, (vu, next(c), u))
+                paths[u] = paths[v] + [u]
+    return dist, paths
@@ -8,11 +8,13 @@ from multipledispatch import Dispatcher
 
 from .convert import convert
 from .append import append
+from .backends import load_triggered
+from .discovery import cached_discover
+from .pipeline import pipelined, pipeline_kwargs
 from .resource import resource
 from .utils import ignoring
 
 import datashape
-from datashape import discover
 from datashape.dispatch import namespace
 from datashape.predicates import isdimension
 
@@ -31,12 +33,28 @@ if 'into' not in namespace:
 into = namespace['into']
 
 
+_dshapes = {}
+
+
+def parse_dshape(s):
+    """ ``datashape.dshape`` memoized on the string ``s`` """
+    try:
+        return _dshapes[s]
+    except KeyError:
+        pass
+    if len(_dshapes) > 1024:
+        _dshapes.clear()
+    ds = _dshapes[s] = datashape.dshape(s)
+    return ds
+
+
 def validate(f):
     @functools.wraps(f)
     def wrapped(*args, **kwargs):
+        load_triggered()
         dshape = kwargs.pop('dshape', None)
         if isinstance(dshape, (str, unicode)):
-            dshape = datashape.dshape(dshape)
+            dshape = parse_dshape(dshape)
         if dshape is not None and not isinstance(dshape, datashape.DataShape):
             raise TypeError('dshape argument is not an instance of DataShape')
         kwargs['dshape'] = dshape
@@ -47,9 +65,11 @@ def validate(f):
 @into.register(type, object)
 @validate
 def into_type(a, b, dshape=None, **kwargs):
-    with ignoring(NotImplementedError):
-        if dshape is None:
-            dshape = discover(b)
+    if dshape is None:
+        try:
+            dshape = cached_discover(b)
+        except NotImplementedError:
+            pass
     return convert(a, b, dshape=dshape, **kwargs)
 
 
@@ -69,6 +89,21 @@ def into_object(target, source, dshape=None, **kwargs):
         or a string (e.g. 'postgresql://hostname::tablename'
     raise_on_errors: bool (optional, defaults to False)
         Raise exceptions rather than reroute around them
+    pipeline: bool (optional, defaults to False)
+        Produce each chunked stage of the conversion in a background thread
+        so that reading, converting and writing chunks overlap
+    pipeline_depth: int (optional, defaults to 2)
+        The number of chunks each stage may produce ahead of the next one
+    pipeline_nbytes: int (optional)
+        The number of bytes each stage may produce ahead of the next one
+    scheduler: str, pool or executor (optional)
+        Convert several chunks at a time with ``'threads'``,
+        ``'processes'``, a ``multiprocessing`` pool or a
+        ``concurrent.futures`` executor
+    memory_limit: int (optional)
+        The number of bytes a chunk may take, from which chunked conversions
+        choose the number of rows per chunk. Defaults to
+        ``odo.memory.default_memory_limit``.
     **kwargs:
         keyword arguments to pass through to conversion functions.
 
@@ -127,7 +162,10 @@ def into_object(target, source, dshape=None, **kwargs):
         raise TypeError('target of %s type does not support in-place append' % type(target))
     with ignoring(NotImplementedError):
         if dshape is None:
-            dshape = discover(source)
+            dshape = cached_discover(source)
+    pipe = pipeline_kwargs(kwargs)
+    if pipe is not None:
+        source = pipelined(source, **pipe)
     return append(target, source, dshape=dshape, **kwargs)
 
 
@@ -135,7 +173,7 @@ def into_object(target, source, dshape=None, **kwargs):
 @validate
 def into_string(uri, b, dshape=None, **kwargs):
     if dshape is None:
-        dshape = discover(b)
+        dshape = cached_discover(b)
 
     resource_ds = 0 * dshape.subshape[0] if isdimension(dshape[0]) else dshape
 
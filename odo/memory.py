@@ -0,0 +1,115 @@
+from __future__ import absolute_import, division, print_function
+
+import os
+
+import datashape
+from datashape import discover
+
+from .compatibility import unicode
+from .core import data_size
+from .numpy_dtype import dshape_to_numpy
+
+__all__ = ('default_memory_limit', 'row_nbytes', 'chunk_rows',
+           'in_memory_cost')
+
+
+# The number of bytes a chunk of a chunked conversion may take unless
+# ``memory_limit=`` is passed to ``odo``
+default_memory_limit = int(os.environ.get('ODO_MEMORY_LIMIT') or 2 ** 26)
+
+# The assumed size of a Python object, such as a variable length string
+object_nbytes = 64
+
+
+def row_nbytes(ds):
+    """ The approximate number of bytes in memory of one row of data with
+    datashape ``ds``
+
+    Fields held as Python objects, like variable length strings, count as
+    ``object_nbytes`` bytes on top of their pointer. ``None`` if the width of
+    a row can not be found from the datashape.
+
+    >>> row_nbytes('var * {a: int64, b: float64}')
+    16
+    >>> row_nbytes('var * {a: int64, b: string}')
+    80
+    >>> row_nbytes('var * var * int64') is None
+    True
+    """
+    if isinstance(ds, (str, unicode)):
+        ds = datashape.dshape(ds)
+    itemsize = data_size(ds).itemsize
+    if not itemsize:
+        return None
+    dt = dshape_to_numpy(ds.measure)
+    if dt.names:
+        objects = sum(dt[name].kind == 'O' for name in dt.names)
+    else:
+        objects = int(dt.kind == 'O')
+    return itemsize + objects * (itemsize // dt.itemsize) * object_nbytes
+
+
+def chunk_rows(dshape=None, chunksize=None, memory_limit=None,
+               default=2 ** 20, maxrows=None, data=None):
+    """ The number of rows per chunk of data with datashape ``dshape``
+
+    ``chunksize`` is returned as is if it is given. Otherwise a chunk holds
+    as many rows as fit into ``memory_limit`` bytes, by default
+    ``default_memory_limit`` (64 MiB, or the ``ODO_MEMORY_LIMIT`` environment
+    variable), and at most ``maxrows`` rows. The datashape is
+    discovered from ``data`` if it is not given, and chunks hold ``default``
+    rows if the width of a row is not known.
+
+    >>> chunk_rows('var * {a: int64, b: float64}', memory_limit=2 ** 20)
+    65536
+    >>> chunk_rows('var * {a: int64, b: float64}', memory_limit=2 ** 20,
+    ...            maxrows=1024)
+    1024
+    >>> chunk_rows('var * var * int64')
+    1048576
+    >>> chunk_rows('var * int64', chunksize=10)
+    10
+    """
+    if chunksize is not None:
+        return int(chunksize)
+    if dshape is None and data is not None:
+        try:
+            dshape = discover(data)
+        except NotImplementedError:
+            pass
+    nbytes = row_nbytes(dshape) if dshape is not None else None
+    if not nbytes:
+        rows = default
+    else:
+        if memory_limit is None:
+            memory_limit = default_memory_limit
+        rows = max(int(memory_limit) // nbytes, 1)
+    return min(rows, maxrows) if maxrows is not None else rows
+
+
+def in_memory_cost(cost, small=None, large=None):
+    """ The size dependent cost of an edge that loads all of the data into
+    memory at once
+
+    The edge costs ``cost`` when the size of the data is not known, ``small``
+    (by default ``cost``) when it fits into ``default_memory_limit`` bytes and
+    ``large`` (by default ten times ``cost``) when it does not, so that
+    chunked routes win for large data. See
+    ``odo.core.NetworkDispatcher.register``.
+
+    >>> from odo.core import DataSize
+    >>> cost = in_memory_cost(20.0, small=10.0)
+    >>> cost(DataSize(None, 16)), cost(DataSize(1000, 16))
+    (20.0, 10.0)
+    >>> cost(DataSize(2 ** 30, 16))
+    200.0
+    """
+    small = cost if small is None else small
+    large = 10 * cost if large is None else large
+
+    def sized_cost(size):
+        nbytes = size.nbytes
+        if nbytes is None:
+            return cost
+        return small if nbytes <= default_memory_limit else large
+    return sized_cost
@@ -16,6 +16,25 @@ def odo(source, target, **kwargs):
         or a string (e.g. 'postgresql://hostname::tablename')
     raise_on_errors: bool (optional, defaults to False)
         Raise exceptions rather than reroute around them
+    pipeline: bool (optional, defaults to False)
+        Produce each chunked stage of the conversion in a background thread
+        so that reading, converting and writing chunks overlap
+    pipeline_depth: int (optional, defaults to 2)
+        The number of chunks each stage may produce ahead of the next one
+    pipeline_nbytes: int (optional)
+        The number of bytes each stage may produce ahead of the next one
+    scheduler: str, pool or executor (optional)
+        Convert several chunks at a time with ``'threads'``,
+        ``'processes'``, a ``multiprocessing`` pool or a
+        ``concurrent.futures`` executor
+    memory_limit: int (optional)
+        The number of bytes a chunk may take, from which chunked conversions
+        choose the number of rows per chunk. Defaults to
+        ``odo.memory.default_memory_limit``.
+    trace: bool or Trace (optional, defaults to False)
+        Record the time and size of the data of every conversion edge. If
+        ``True`` return a tuple of the result and an ``odo.trace.Trace``,
+        if a ``Trace`` add the spans of this call to it.
     **kwargs:
         keyword arguments to pass through to conversion functions.
 
@@ -52,6 +71,11 @@ def odo(source, target, **kwargs):
 
     >>> odo([('Alice', 1), ('Bob', 2)], 'myfile.csv')  # doctest: +SKIP
 
+    Find out where the time goes
+
+    >>> _, t = odo('myfile.csv', 'sqlite:///db.db::t', trace=True)  # doctest: +SKIP
+    >>> print(t.render())  # doctest: +SKIP
+
     Explanation
     -----------
 
@@ -88,4 +112,11 @@ def odo(source, target, **kwargs):
     odo.convert.convert    - Convert things into new things
     odo.append.append      - Add things onto existing things
     """
-    return into(target, source, **kwargs)
+    t = kwargs.pop('trace', False)
+    if t is False or t is None:
+        return into(target, source, **kwargs)
+
+    from .trace import trace
+    with trace(None if t is True else t) as tr:
+        result = into(target, source, **kwargs)
+    return (result, tr) if t is True else result
@@ -0,0 +1,117 @@
+from __future__ import absolute_import, division, print_function
+
+from collections import deque
+from threading import Condition, Thread
+
+from .chunks import Chunks
+from .utils import active_traces, measure, traced_by
+
+__all__ = 'prefetch', 'pipelined', 'pipeline_kwargs'
+
+
+_done = object()
+
+
+def prefetch(iterable, depth=2, nbytes=None):
+    """ Iterate over ``iterable`` in a background thread
+
+    Items are produced ahead of the consumer into a buffer of at most
+    ``depth`` items and, if ``nbytes`` is given, about that many bytes as
+    reported by ``odo.utils.measure``; one item is always let through.
+    Exceptions raised while producing are raised in the consumer. Closing
+    the returned generator stops the producer at the next item, which then
+    closes ``iterable`` if it is a generator. Edges run by
+    the producer are recorded by the traces of the consumer, see
+    ``odo.trace``.
+
+    >>> list(prefetch(iter(range(5)), depth=1))
+    [0, 1, 2, 3, 4]
+    """
+    depth = max(depth or 1, 1)
+    buf = deque()  # (item, error, bytes), error is _done at the end
+    state = {'bytes': 0, 'stop': False}
+    cond = Condition()
+
+    def put(item, error=None, n=0):
+        with cond:
+            while buf and not state['stop'] and (
+                    len(buf) >= depth or
+                    nbytes is not None and state['bytes'] >= nbytes):
+                cond.wait()
+            buf.append((item, error, n))
+            state['bytes'] += n
+            cond.notify_all()
+            return not state['stop']
+
+    traces = active_traces()
+
+    def produce():
+        it = None
+        try:
+            with traced_by(traces):
+                it = iter(iterable)
+                for item in it:
+                    n = (measure(item)[1] or 0) if nbytes is not None else 0
+                    if not put(item, n=n):
+                        return
+        except Exception as e:
+            put(None, e)
+        else:
+            put(None, _done)
+        finally:
+            # release files and connections held by the source as soon as
+            # the consumer is gone rather than when it is garbage collected
+            close = getattr(it, 'close', None)
+            if close is not None:
+                close()
+
+    thread = Thread(target=produce, name='odo-prefetch')
+    thread.daemon = True
+    thread.start()
+    try:
+        while True:
+            with cond:
+                while not buf:
+                    cond.wait()
+                item, error, n = buf.popleft()
+                state['bytes'] -= n
+                cond.notify_all()
+            if error is _done:
+                return
+            if error is not None:
+                raise error
+            yield item
+    finally:
+        with cond:
+            state['stop'] = True
+            cond.notify_all()
+
+
+def pipelined(data, depth=2, nbytes=None):
+    """ Chunks that produce the chunks of ``data`` in a background thread
+
+    Returns ``data`` unchanged if it is not a plain ``Chunks`` object. Each
+    iteration of the result starts a thread, see ``prefetch``. The result
+    keeps the ``dshape`` and ``scheduler`` of ``data``, and its first
+    iteration continues from the chunks ``discover`` computed on ``data``.
+    """
+    if not isinstance(data, Chunks) or type(data).__init__ != Chunks.__init__:
+        return data
+
+    def produce():
+        return prefetch(iter(data), depth=depth, nbytes=nbytes)
+    result = type(data)(produce, dshape=data.dshape, scheduler=data.scheduler)
+    head, data._head = data._head, None
+    if head is not None and head[0] is data.data:
+        result._head = produce, prefetch(head[1], depth=depth, nbytes=nbytes)
+    return result
+
+
+def pipeline_kwargs(kwargs):
+    """ The arguments of ``pipelined`` given the keyword arguments of
+    ``odo``, or ``None`` if pipelining is off
+    """
+    if not kwargs.get('pipeline'):
+        return None
+    return dict(depth=kwargs.get('pipeline_depth', 2),
+                nbytes=kwargs.get('pipeline_nbytes'))
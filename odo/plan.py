@@ -0,0 +1,228 @@
+from __future__ import absolute_import, division, print_function
+
+from warnings import warn
+
+from datashape.predicates import isdimension
+
+from .append import append
+from .chunks import Chunks, chunks
+from .compatibility import unicode
+from .convert import convert
+from .core import FailedConversionWarning, PathPart, path_cost, run_edge
+from .discovery import cached_discover
+from .into import parse_dshape
+from .resource import resource
+from .temp import Temp
+from .utils import accepts_kwargs, keywords
+
+__all__ = 'plan', 'Plan'
+
+
+def _type_spec(cls):
+    """ A picklable description of a possibly parametrized type
+
+    >>> _type_spec(chunks(list)) == ('chunks', list)
+    True
+    >>> _from_type_spec(('chunks', list)) is chunks(list)
+    True
+    """
+    if issubclass(cls, Chunks) and cls is not Chunks:
+        container = cls.__dict__.get('container')
+        if container is not None and chunks(container) is cls:
+            return 'chunks', _type_spec(container)
+    persistent = cls.__dict__.get('persistent_type')
+    if persistent is not None and Temp(persistent) is cls:
+        return 'Temp', _type_spec(persistent)
+    return cls
+
+
+def _from_type_spec(spec):
+    if isinstance(spec, tuple):
+        kind, inner = spec
+        return {'chunks': chunks, 'Temp': Temp}[kind](_from_type_spec(inner))
+    return spec
+
+
+def _edge_kwargs(func, kwargs):
+    """ The keyword arguments of ``kwargs`` that ``func`` accepts """
+    if accepts_kwargs(func):
+        return dict(kwargs)
+    accepted = keywords(func)
+    return dict((k, v) for k, v in kwargs.items() if k in accepted)
+
+
+class Plan(object):
+    """ A compiled conversion that can be run many times
+
+    A plan holds the conversion path, the keyword arguments each edge of the
+    path is called with and the datashape of the data, so running it does not
+    resolve, discover or route again. Plans can be pickled and sent to other
+    processes as long as the functions on their path can be.
+
+    See Also
+    --------
+    plan
+    """
+    def __init__(self, source_type, target, dshape=None, path=(),
+                 edge_kwargs=(), excluded_edges=(), kwargs=None):
+        self.source_type = source_type
+        self.target = target
+        self.dshape = dshape
+        self.path = tuple(path)
+        self.edge_kwargs = tuple(edge_kwargs)
+        self.excluded_edges = frozenset(excluded_edges)
+        self.kwargs = kwargs or {}
+        self._target = None
+
+    @property
+    def cost(self):
+        return path_cost(self.path)
+
+    def resolve(self, source):
+        """ Resolve a string ``source`` like ``odo`` would """
+        if isinstance(source, (str, unicode)):
+            source = resource(source, dshape=self.dshape, **self.kwargs)
+        if not isinstance(source, self.source_type):
+            raise TypeError('Plan compiled for sources of type %s, got %s' %
+                            (self.source_type.__name__,
+                             type(source).__name__))
+        return source
+
+    def run(self, source):
+        """ Push ``source`` through this plan and return the result """
+        source = self.resolve(source)
+        if not isinstance(self.target, type):
+            return self._append(source)
+
+        x = source
+        for (convert_from, convert_to, func, _), kwargs in zip(
+                self.path, self.edge_kwargs):
+            try:
+                x = run_edge(convert, convert_from, convert_to, func, x,
+                             excluded_edges=set(self.excluded_edges),
+                             dshape=self.dshape, **kwargs)
+            except NotImplementedError as e:
+                if self.kwargs.get('raise_on_errors'):
+                    raise
+                warn(FailedConversionWarning(convert_from, convert_to, e))
+                convert.mark_failed(convert_from, convert_to,
+                                    '%s: %s' % (type(e).__name__, e),
+                                    dshape=self.dshape, **self.kwargs)
+                excluded = set(self.excluded_edges)
+                excluded.add((convert_from, convert_to))
+                return convert(self.target, source, excluded_edges=excluded,
+                               dshape=self.dshape, **self.kwargs)
+        return x
+
+    def _append(self, source):
+        target = self._target
+        if target is None:
+            target = self.target
+            if isinstance(target, (str, unicode)):
+                ds = self.dshape
+                if ds is not None and isdimension(ds[0]):
+                    ds = 0 * ds.subshape[0]
+                target = resource(target, dshape=ds,
+                                  expected_dshape=self.dshape, **self.kwargs)
+            self._target = target
+        return append(target, source, dshape=self.dshape, **self.kwargs)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_target'] = None
+        state['source_type'] = _type_spec(self.source_type)
+        if isinstance(self.target, type):
+            state['target'] = _type_spec(self.target)
+        state['path'] = tuple((_type_spec(a), _type_spec(b), func, cost)
+                              for a, b, func, cost in self.path)
+        state['excluded_edges'] = [(_type_spec(a), _type_spec(b))
+                                   for a, b in self.excluded_edges]
+        return state
+
+    def __setstate__(self, state):
+        state['source_type'] = _from_type_spec(state['source_type'])
+        if isinstance(state['target'], tuple):
+            state['target'] = _from_type_spec(state['target'])
+        state['path'] = tuple(PathPart(_from_type_spec(a), _from_type_spec(b),
+                                       func, cost)
+                              for a, b, func, cost in state['path'])
+        state['excluded_edges'] = frozenset(
+            (_from_type_spec(a), _from_type_spec(b))
+            for a, b in state['excluded_edges'])
+        self.__dict__.update(state)
+
+    def __repr__(self):
+        if self.path:
+            types = [self.path[0].convert_from] + [p.convert_to
+                                                   for p in self.path]
+            route = ' -> '.join(t.__name__ for t in types)
+        else:
+            target = self.target
+            route = '%s -> append(%s)' % (
+                self.source_type.__name__,
+                target if isinstance(target, (str, unicode))
+                else type(target).__name__)
+        return '<%s: %s>' % (type(self).__name__, route)
+
+
+def plan(source, target, dshape=None, **kwargs):
+    """ Compile the conversion of ``source`` into ``target`` into a ``Plan``
+
+    Parameters
+    ----------
+    source: type, object or string
+        The type of the sources the plan will run on, or an example source
+        whose type and datashape are used.
+    target: type, object or string
+        The target, as for ``odo``. Targets that are not types are appended
+        to; string targets are resolved the first time the plan runs.
+    dshape: DataShape or string, optional
+        The datashape of every source the plan will run on. Discovered from
+        an example source if not given.
+    **kwargs:
+        Keyword arguments passed to the conversion functions, as for ``odo``
+
+    Examples
+    --------
+
+    >>> import numpy as np
+    >>> p = plan(np.ndarray, list, dshape='3 * int64')
+    >>> p
+    <Plan: ndarray -> list>
+    >>> p.run(np.arange(3))
+    [0, 1, 2]
+
+    A plan can be sent to other processes
+
+    >>> import pickle
+    >>> pickle.loads(pickle.dumps(p)).run(np.arange(3))
+    [0, 1, 2]
+
+    See Also
+    --------
+    odo.odo
+    odo.explain
+    """
+    if isinstance(dshape, (str, unicode)):
+        dshape = parse_dshape(dshape)
+    if isinstance(source, (str, unicode)):
+        source = resource(source, dshape=dshape, **kwargs)
+    if isinstance(source, type):
+        source_type = source
+    else:
+        source_type = type(source)
+        if dshape is None:
+            try:
+                dshape = cached_discover(source)
+            except NotImplementedError:
+                pass
+
+    if not isinstance(target, type):
+        return Plan(source_type, target, dshape=dshape, kwargs=kwargs)
+
+    excluded_edges = kwargs.pop('excluded_edges', None) or ()
+    pth = tuple(convert.path(source_type, target, dshape=dshape,
+                             excluded_edges=excluded_edges))
+    return Plan(source_type, target, dshape=dshape, path=pth,
+                edge_kwargs=[_edge_kwargs(p.func, kwargs) for p in pth],
+                excluded_edges=excluded_edges, kwargs=kwargs)
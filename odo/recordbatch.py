@@ -0,0 +1,199 @@
+from __future__ import absolute_import, division, print_function
+
+from collections import Iterator, OrderedDict
+from functools import partial
+
+import datashape
+import numpy as np
+import pandas as pd
+from datashape import (CType, DateTime, Option, Record, discover, object_,
+                       string)
+from datashape.predicates import isrecord
+from toolz import concat
+
+from .chunks import chunks
+from .convert import convert, map_chunks, numpy_to_list
+from .numpy_dtype import dshape_to_numpy
+from .utils import measure
+
+__all__ = 'RecordBatch', 'rows_to_record_batch'
+
+
+class RecordBatch(object):
+    """ A table held as one one-dimensional NumPy array per column
+
+    Record batches are the columnar counterpart of DataFrames and structured
+    arrays. Columns are kept as they are given, so moving data between
+    DataFrames, structured arrays and record batches copies as little as
+    NumPy allows, and ``chunks(RecordBatch)`` lets out-of-core transfers
+    skip building a Python object per row. With ``pyarrow`` installed they
+    convert to and from Arrow record batches and tables.
+
+    >>> b = RecordBatch([('a', np.array([1, 2])), ('b', np.array([.5, 1.]))])
+    >>> len(b)
+    2
+    >>> b.names
+    ['a', 'b']
+    >>> b['b']
+    array([0.5, 1. ])
+    >>> discover(b)
+    dshape("2 * {a: int64, b: float64}")
+    """
+    def __init__(self, columns, names=None):
+        if isinstance(columns, dict):
+            if names is None:
+                names = list(columns)
+            columns = [columns[name] for name in names]
+        elif names is None:
+            names, columns = zip(*columns) if columns else ((), ())
+        self.names = list(names)
+        self.columns = [np.asarray(col) for col in columns]
+        if len(self.names) != len(self.columns):
+            raise ValueError('Got %d names for %d columns' %
+                             (len(self.names), len(self.columns)))
+        lengths = set(len(col) for col in self.columns)
+        if len(lengths) > 1:
+            raise ValueError('Columns have different lengths: %s' %
+                             sorted(lengths))
+
+    def __len__(self):
+        return len(self.columns[0]) if self.columns else 0
+
+    def __getitem__(self, name):
+        try:
+            return self.columns[self.names.index(name)]
+        except ValueError:
+            raise KeyError(name)
+
+    def items(self):
+        return list(zip(self.names, self.columns))
+
+    @property
+    def nbytes(self):
+        return sum(col.nbytes for col in self.columns)
+
+    def __repr__(self):
+        return '%s(%d rows, columns=%s)' % (type(self).__name__, len(self),
+                                            self.names)
+
+
+def _column_dshape(col):
+    if col.dtype.kind == 'M':
+        return Option(DateTime())
+    ds = CType.from_numpy_dtype(col.dtype)
+    return Option(string) if ds == object_ else ds
+
+
+def _column_dtypes(dshape, n):
+    """ The NumPy dtypes of the ``n`` columns of data of datashape
+    ``dshape``, ``object`` where there is none
+    """
+    if dshape is None:
+        return [None] * n
+    measure = datashape.dshape(dshape).measure
+    try:
+        dtype = dshape_to_numpy(measure)
+    except (NotImplementedError, TypeError, ValueError):
+        return [np.dtype(object)] * n
+    if isrecord(measure):
+        return [dtype[name] for name in dtype.names]
+    return [dtype]
+
+
+def _column(values, dtype):
+    try:
+        return np.array(values, dtype=dtype)
+    except (TypeError, ValueError):
+        return np.array(values, dtype=object)
+
+
+def rows_to_record_batch(rows, names, dshape=None):
+    """ A ``RecordBatch`` of a sequence of tuples
+
+    The columns take their dtypes from ``dshape`` where possible.
+
+    >>> rows_to_record_batch([(1, 'a'), (2, 'b')], ['x', 'y'],
+    ...                      dshape='var * {x: int32, y: string}')['x']
+    array([1, 2], dtype=int32)
+    """
+    dtypes = _column_dtypes(dshape, len(names))
+    columns = list(zip(*rows)) if rows else [()] * len(names)
+    return RecordBatch([_column(col, dtype)
+                        for col, dtype in zip(columns, dtypes)], names=names)
+
+
+@discover.register(RecordBatch)
+def discover_record_batch(b, **kwargs):
+    return len(b) * Record([(name, _column_dshape(col))
+                            for name, col in b.items()])
+
+
+@measure.register(RecordBatch)
+def measure_record_batch(b):
+    return len(b), b.nbytes
+
+
+@convert.register(pd.DataFrame, RecordBatch, cost=1.0)
+def record_batch_to_dataframe(b, **kwargs):
+    return pd.DataFrame(OrderedDict(b.items()), columns=b.names)
+
+
+@convert.register(RecordBatch, pd.DataFrame, cost=0.5)
+def dataframe_to_record_batch(df, **kwargs):
+    return RecordBatch([(name, np.asarray(df[name].values))
+                        for name in df.columns])
+
+
+@convert.register(np.ndarray, RecordBatch, cost=0.5)
+def record_batch_to_numpy(b, dshape=None, **kwargs):
+    measure = datashape.dshape(dshape).measure if dshape else None
+    if measure is not None and not isrecord(measure) and len(b.names) == 1:
+        return b.columns[0].astype(dshape_to_numpy(measure), copy=False)
+    if isrecord(measure) and len(measure.names) == len(b.names):
+        dtype = dshape_to_numpy(measure)
+        dtype = [(str(name), dtype[i]) for i, name in enumerate(b.names)]
+    else:
+        dtype = [(str(name), col.dtype) for name, col in b.items()]
+    x = np.empty(len(b), dtype=dtype)
+    for name, col in zip(x.dtype.names, b.columns):
+        x[name] = col
+    return x
+
+
+@convert.register(RecordBatch, np.ndarray, cost=0.5)
+def numpy_to_record_batch(x, **kwargs):
+    if x.dtype.names is None:
+        raise NotImplementedError('Record batches are made of structured '
+                                  'arrays, got dtype %s' % x.dtype)
+    return RecordBatch([(name, x[name]) for name in x.dtype.names])
+
+
+@convert.register(Iterator, RecordBatch, cost=10.0)
+def record_batch_to_iterator(b, **kwargs):
+    return zip(*[numpy_to_list(col) for col in b.columns])
+
+
+@convert.register(chunks(RecordBatch), chunks(pd.DataFrame), cost=0.5)
+def chunked_pandas_to_chunked_record_batch(c, **kwargs):
+    return chunks(RecordBatch)(partial(map_chunks, RecordBatch, c, **kwargs))
+
+
+@convert.register(chunks(pd.DataFrame), chunks(RecordBatch), cost=0.5)
+def chunked_record_batch_to_chunked_pandas(c, **kwargs):
+    return chunks(pd.DataFrame)(partial(map_chunks, pd.DataFrame, c,
+                                        **kwargs))
+
+
+@convert.register(chunks(RecordBatch), chunks(np.ndarray), cost=0.5)
+def chunked_numpy_to_chunked_record_batch(c, **kwargs):
+    return chunks(RecordBatch)(partial(map_chunks, RecordBatch, c, **kwargs))
+
+
+@convert.register(chunks(np.ndarray), chunks(RecordBatch), cost=0.5)
+def chunked_record_batch_to_chunked_numpy(c, **kwargs):
+    return chunks(np.ndarray)(partial(map_chunks, np.ndarray, c, **kwargs))
+
+
+@convert.register(Iterator, chunks(RecordBatch), cost=10.0)
+def chunked_record_batch_to_iterator(c, **kwargs):
+    return concat(record_batch_to_iterator(b) for b in c)
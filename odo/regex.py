@@ -1,9 +1,11 @@
 from __future__ import absolute_import, division, print_function
 
 import re
+from collections import OrderedDict
 
 
 _pattern_type = type(re.compile(''))
+_backreference = re.compile(r'\\\d|\(\?P=')
 
 
 def normalize(r):
@@ -51,15 +53,34 @@ class RegexDispatcher(object):
 
     >>> type(f('123.456'))
     float
+
+    Patterns are tried from the highest priority to the lowest, in the order
+    they were added among equal priorities, and the first match wins. When
+    ``combine`` is true they are compiled into a single alternation so that a
+    lookup is one regex match; patterns using backreferences are matched one
+    by one instead. The last ``cache_size`` strings dispatched on are
+    remembered. ``add`` resets both, so handlers should not be added to
+    ``funcs`` directly.
     """
-    def __init__(self, name):
+    def __init__(self, name, combine=True, cache_size=256):
         self.name = name
         self.funcs = {}
         self.priorities = {}
+        self.lazy = []
+        self.combine = combine
+        self.cache_size = cache_size
+        self._reset()
 
     def add(self, regex, func, priority=10):
         self.funcs[normalize(regex)] = func
         self.priorities[func] = priority
+        self._reset()
+
+    def _reset(self):
+        # replaced rather than cleared so that a concurrent dispatch can not
+        # store a stale handler in the new cache
+        self._cache = OrderedDict()
+        self._compiled = None
 
     def register(self, regex, priority=10):
         """Register a new handler in this regex dispatcher.
@@ -83,9 +104,76 @@ class RegexDispatcher(object):
             return func
         return _
 
+    def add_lazy(self, regex, loader):
+        """Call ``loader`` before the first dispatch on a string matching
+        ``regex``.
+
+        This lets modules register their handlers only once a string they
+        handle is seen, see ``odo.backends``.
+        """
+        self.lazy.append((normalize(regex), loader))
+        self._reset()
+
+    def _load(self, s):
+        matched = [(r, loader) for r, loader in self.lazy if r.match(s)]
+        if matched:
+            self.lazy = [x for x in self.lazy if x not in matched]
+            for _, loader in matched:
+                loader()
+
+    def ordered(self):
+        """The ``(pattern, func)`` pairs in the order they are tried"""
+        priorities = self.priorities
+        return sorted(self.funcs.items(), key=lambda x: -priorities[x[1]])
+
+    def _compile(self):
+        ordered = self.ordered()
+        matcher, funcs = None, {}
+        if self.combine and not any(_backreference.search(r.pattern)
+                                    for r, _ in ordered):
+            # the outer group of the alternative that matched is the last
+            # one to close, so ``lastindex`` identifies the handler
+            group, parts = 1, []
+            for r, func in ordered:
+                parts.append('(%s)' % r.pattern)
+                funcs[group] = func
+                group += r.groups + 1
+            try:
+                matcher = re.compile('|'.join(parts))
+            except (re.error, OverflowError, AssertionError):
+                matcher = None
+        self._compiled = ordered, matcher, funcs
+        return self._compiled
+
+    def _find(self, s):
+        ordered, matcher, funcs = self._compiled or self._compile()
+        if matcher is not None:
+            m = matcher.match(s)
+            if m is not None:
+                return funcs[m.lastindex]
+        else:
+            for r, func in ordered:
+                if r.match(s):
+                    return func
+        raise ValueError('No match found for %r in %s' % (s, self.name))
+
     def dispatch(self, s):
-        funcs = (func for r, func in self.funcs.items() if r.match(s))
-        return max(funcs, key=self.priorities.get)
+        cache = self._cache
+        try:
+            func = cache.pop(s)
+        except KeyError:
+            if self.lazy:
+                self._load(s)
+                cache = self._cache
+            func = self._find(s)
+            while len(cache) >= self.cache_size > 0:
+                try:
+                    cache.popitem(last=False)
+                except KeyError:
+                    break
+        if self.cache_size > 0:
+            cache[s] = func
+        return func
 
     def __call__(self, s, *args, **kwargs):
         return self.dispatch(s)(s, *args, **kwargs)
@@ -3,12 +3,40 @@ from __future__ import absolute_import, division, print_function
 from .regex import RegexDispatcher
 
 
-__all__ = 'resource'
+__all__ = 'resource', 'resource_type', 'resolves_to'
 
 
 resource = RegexDispatcher('resource')
 
 
+def resolves_to(cls):
+    """ Declare the type of the objects a ``resource`` implementation returns
+
+    ``cls`` is a type, or a function of the arguments of the implementation
+    that returns one without opening or creating anything. See
+    ``resource_type``.
+    """
+    def _(func):
+        func.resolves_to = cls
+        return func
+    return _
+
+
+def resource_type(uri, *args):
+    """ The type of ``resource(uri, *args)`` without calling it
+
+    ``None`` when the implementation handling ``uri`` does not declare the
+    type it returns with ``resolves_to``.
+
+    >>> resource_type('myfile.csv').__name__
+    'CSV'
+    """
+    cls = getattr(resource.dispatch(uri), 'resolves_to', None)
+    if cls is None or isinstance(cls, type):
+        return cls
+    return cls(uri, *args)
+
+
 @resource.register('.*', priority=1)
 def resource_all(uri, *args, **kwargs):
     """ Refer to data by strings
@@ -100,7 +128,13 @@ def resource_all(uri, *args, **kwargs):
     raise NotImplementedError("Unable to parse uri to data resource: " + uri)
 
 
+def _split_resource_type(uri, *args):
+    uri, other = uri.rsplit('::', 1)
+    return resource_type(uri, other, *args)
+
+
 @resource.register('.+::.+', priority=15)
+@resolves_to(_split_resource_type)
 def resource_split(uri, *args, **kwargs):
     uri, other = uri.rsplit('::', 1)
     return resource(uri, other, *args, **kwargs)
@@ -0,0 +1,84 @@
+from __future__ import absolute_import, division, print_function
+
+import subprocess
+import sys
+
+import pytest
+
+from odo import backends, resource
+from odo.regex import normalize
+
+
+heavy = ['sqlalchemy', 'h5py', 'tables', 'dask.array', 'dask.dataframe',
+         'bokeh', 'pymongo', 'paramiko', 'boto', 'bcolz', 'pyspark']
+
+
+def run(code):
+    return subprocess.check_output([sys.executable, '-c', code]).strip()
+
+
+def test_import_does_not_import_heavy_backends():
+    # h5py is imported before PyTables when both are installed
+    expected = (['h5py'] if backends.installed('h5py') and
+                backends.installed('tables') else [])
+    code = ('import sys, odo; '
+            'print(sorted(m for m in %r if m in sys.modules))' % heavy)
+    assert run(code) == str(expected).encode()
+
+
+def test_import_h5py_first(monkeypatch):
+    imported = []
+    monkeypatch.setattr(backends, 'installed', lambda name: True)
+    monkeypatch.setattr(backends.importlib, 'import_module', imported.append)
+    monkeypatch.delitem(sys.modules, 'h5py', raising=False)
+    monkeypatch.delitem(sys.modules, 'tables', raising=False)
+    backends.import_h5py_first()
+    assert imported == ['h5py']
+
+    # too late once PyTables was imported
+    del imported[:]
+    monkeypatch.setitem(sys.modules, 'tables', None)
+    backends.import_h5py_first()
+    assert imported == []
+
+
+def test_datashape_discover_is_left_alone():
+    code = ('import datashape; '
+            'f = datashape.discover.dispatch(object); '
+            'import odo; '
+            'print(datashape.discover.dispatch(object) is f)')
+    assert run(code) == b'True'
+
+
+def test_resource_loads_backend():
+    pytest.importorskip('sqlalchemy')
+    code = ('import sys, odo; '
+            'odo.resource("sqlite:///:memory:"); '
+            'print("odo.backends.sql" in sys.modules)')
+    assert run(code) == b'True'
+
+
+def test_imported_trigger_loads_backend():
+    pytest.importorskip('sqlalchemy')
+    code = ('import odo, sqlalchemy as sa; '
+            'print(odo.discover(sa.create_engine("sqlite://")))')
+    assert run(code) == b'{}'
+
+
+def test_exports():
+    pytest.importorskip('sqlalchemy')
+    import odo
+    assert odo.sql is sys.modules['odo.backends.sql']
+    assert 'sql' in dir(odo)
+    assert not hasattr(odo, 'not_a_backend')
+
+
+def test_registry_declares_resources():
+    backends.load_all()
+    declared = dict((module, b) for b in backends.backends
+                    for module in b.modules)
+    for regex, func in resource.funcs.items():
+        b = declared.get(func.__module__)
+        if b is not None:
+            patterns = [normalize(r).pattern for r in b.resources]
+            assert regex.pattern in patterns, regex.pattern
@@ -0,0 +1,154 @@
+from __future__ import absolute_import, division, print_function
+
+import json
+import os
+import time
+
+from odo.calibration import Calibration, calibrate
+from odo.core import NetworkDispatcher, edge_key
+from odo.utils import tmpfile
+
+
+class A(list):
+    pass
+
+
+class B(list):
+    pass
+
+
+class C(list):
+    pass
+
+
+def dispatcher(name):
+    d = NetworkDispatcher(name)
+
+    @d.register(B, A, cost=1.0)
+    def a_to_b(x, **kwargs):
+        time.sleep(0.05)
+        return B(x)
+
+    @d.register(C, B, cost=1.0)
+    def b_to_c(x, **kwargs):
+        return C(x)
+
+    @d.register(C, A, cost=2.5)
+    def a_to_c(x, **kwargs):
+        return C(x)
+
+    return d
+
+
+def test_calibrate_routes_on_measured_cost():
+    d = dispatcher('test_calibrate')
+    assert [p.convert_to for p in d.path(A, C)] == [B, C]
+
+    with tmpfile('.json') as fn:
+        with calibrate(fn, dispatcher=d) as c:
+            assert isinstance(d(B, A([1, 2])), B)
+            assert isinstance(d(C, A([1, 2])), C)  # via B
+            assert isinstance(d(C, A([1, 2]), excluded_edges={(A, B)}), C)
+
+        stats = c.edges[edge_key(A, B)]
+        assert stats['calls'] == 2
+        assert stats['rows'] == 4
+        assert stats['seconds'] >= 0.1
+
+        with open(fn) as f:
+            assert json.load(f)['edges'][edge_key(A, B)]['calls'] == 2
+
+        # A -> B is now slow, so the direct edge wins
+        assert [p.convert_to for p in d.path(A, C)] == [C]
+
+        # a fresh dispatcher only changes after loading the profile
+        e = dispatcher('test_calibrate')
+        assert [p.convert_to for p in e.path(A, C)] == [B, C]
+        e.load_profile(fn)
+        assert [p.convert_to for p in e.path(A, C)] == [C]
+
+
+def test_calibration_merges_profiles():
+    with tmpfile('.json') as fn:
+        for _ in range(2):
+            c = Calibration(None)
+            c.record('a -> b', 1.0, rows=10, nbytes=80)
+            c.save(fn)
+        with open(fn) as f:
+            stats = json.load(f)['edges']['a -> b']
+        assert stats == dict(calls=2, seconds=2.0, rows=20, nbytes=160)
+
+
+def write_profile(filename, **seconds):
+    with open(filename, 'w') as f:
+        json.dump({'edges': dict((edge_key(*edge), dict(calls=1,
+                                                        seconds=seconds[name],
+                                                        rows=1, nbytes=8))
+                                 for name, edge in [('ab', (A, B)),
+                                                    ('bc', (B, C)),
+                                                    ('ac', (A, C))]
+                                 if name in seconds)}, f)
+
+
+def test_profile_is_loaded_on_creation_only_when_asked(tmpdir, monkeypatch):
+    monkeypatch.setenv('ODO_PROFILE_DIR', str(tmpdir))
+    write_profile(os.path.join(str(tmpdir), 'test_autoload.json'),
+                  ab=1.0, bc=0.001, ac=0.001)
+    monkeypatch.delenv('ODO_LOAD_PROFILE', raising=False)
+    d = dispatcher('test_autoload')
+    assert [p.convert_to for p in d.path(A, C)] == [B, C]
+
+    monkeypatch.setenv('ODO_LOAD_PROFILE', '1')
+    d = dispatcher('test_autoload')
+    assert [p.convert_to for p in d.path(A, C)] == [C]
+
+
+def test_measured_costs_are_scaled_to_registered_costs():
+    d = dispatcher('test_scaled')
+    with tmpfile('.json') as fn:
+        write_profile(fn, ab=1.0, bc=1.0, ac=2.0)
+        d.load_profile(fn)
+    # the measured edges together cost as much as before
+    assert abs(d.graph[A][B]['cost'] - 1.125) < 1e-9
+    assert abs(d.graph[B][C]['cost'] - 1.125) < 1e-9
+    assert abs(d.graph[A][C]['cost'] - 2.25) < 1e-9
+
+
+def test_partial_profile_does_not_dwarf_unmeasured_edges():
+    d = dispatcher('test_partial')
+    with tmpfile('.json') as fn:
+        # a slow edge measured alone keeps its registered cost
+        write_profile(fn, ab=100.0)
+        d.load_profile(fn)
+    assert d.graph[A][B]['cost'] == 1.0
+    assert [p.convert_to for p in d.path(A, C)] == [B, C]
+
+
+def test_unreadable_profile_warns(recwarn):
+    d = dispatcher('test_unreadable')
+    with tmpfile('.json') as fn:
+        with open(fn, 'w') as f:
+            f.write('{not json')
+        d.load_profile(fn)
+        with open(fn, 'w') as f:
+            json.dump({'edges': {'a -> b': dict(seconds='x', rows=1)}}, f)
+        d.load_profile(fn)
+    assert len(recwarn) == 2
+    assert [p.convert_to for p in d.path(A, C)] == [B, C]
+
+
+def test_lazy_edges_are_not_measured():
+    c = Calibration(None)
+    token = c.start(None, A, B, None, A([1, 2]))
+    c.finish(token, iter([1, 2]))
+    assert c.edges[edge_key(A, B)]['rows'] == 0
+
+
+def test_unmeasured_edges_keep_their_cost():
+    d = dispatcher('test_unmeasured')
+    with tmpfile('.json') as fn:
+        with open(fn, 'w') as f:
+            json.dump({'edges': {edge_key(A, B): dict(calls=1, seconds=0.0,
+                                                      rows=0, nbytes=0)}}, f)
+        d.load_profile(fn)
+    assert d.graph[A][B]['cost'] == 1.0
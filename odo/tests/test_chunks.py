@@ -41,3 +41,87 @@ def test_discover_no_consume():
     assert discover(cl) == discover(cl) == dshape('var * int64')
     assert tuple(cl) == ([0, 1, 2], [3, 4, 5])
     assert tuple(cl) == ()
+
+
+def test_callables_are_not_retained():
+    import gc
+    import weakref
+
+    class Chunk(list):
+        pass
+
+    refs = []
+
+    def make(i):
+        c = Chunk([i])
+        refs.append(weakref.ref(c))
+        return c
+
+    funcs = [lambda i=i: make(i) for i in range(10)]
+    cl = CL(funcs)
+    assert [c[0] for c in cl] == list(range(10))
+    gc.collect()
+    assert all(r() is None for r in refs)
+    assert cl.data is funcs
+    assert [c[0] for c in cl] == list(range(10))
+
+
+def test_callables_are_called_on_every_iteration():
+    calls = []
+
+    def make(i):
+        calls.append(i)
+        return [i]
+
+    cl = CL([lambda i=i: make(i) for i in range(3)])
+    assert list(cl) == list(cl) == [[0], [1], [2]]
+    assert calls == [0, 1, 2, 0, 1, 2]
+
+
+def test_discover_computes_first_callable_only():
+    calls = []
+
+    def make(i):
+        calls.append(i)
+        return [i, i]
+
+    cl = CL([lambda i=i: make(i) for i in range(5)])
+    assert discover(cl) == dshape('var * int64')
+    assert calls == [0]
+    assert discover(cl) == dshape('var * int64')
+    assert calls == [0]
+
+    assert list(cl) == [[i, i] for i in range(5)]
+    assert sorted(calls) == list(range(5))
+
+    # later iterations compute every chunk again
+    assert list(cl) == [[i, i] for i in range(5)]
+    assert len(calls) == 10
+
+
+def test_discover_closes_iterator_of_callable():
+    calls = []
+    closed = []
+
+    def gen():
+        calls.append(1)
+        try:
+            yield [1, 2]
+            yield [3]
+        finally:
+            closed.append(1)
+
+    cl = CL(gen)
+    assert discover(cl) == dshape('var * int64')
+    assert closed == [1]
+    assert cl._head is None
+    assert list(cl) == [[1, 2], [3]]
+    assert len(calls) == 2
+
+
+def test_declared_dshape():
+    def fail():
+        raise AssertionError('should not be called')
+
+    cl = CL([fail], dshape='var * {a: int32}')
+    assert discover(cl) == dshape('var * {a: int32}')
@@ -242,6 +242,40 @@ def test_iterator_to_DataFrame_chunks():
     tm.assert_almost_equal(df1, df2)
 
 
+def test_iterator_to_DataFrame_chunks_reads_input_lazily():
+    consumed = []
+
+    def rows():
+        for i in range(1000):
+            consumed.append(i)
+            yield (i, float(i))
+
+    ds = dshape('var * {a: int64, b: float64}')
+    c = iterator_to_DataFrame_chunks(rows(), chunksize=10, dshape=ds)
+    assert len(consumed) <= 20  # partition_all reads one partition ahead
+    it = iter(c)
+    assert len(next(it)) == 10
+    assert len(consumed) < 1000
+    assert sum(map(len, it)) == 990
+
+
+@pytest.mark.parametrize('scheduler', ['threads', 'processes'])
+def test_chunk_conversions_with_scheduler(scheduler):
+    data = [(i, float(i)) for i in range(100)]
+    ds = dshape('var * {a: int64, b: float64}')
+    c = convert(chunks(pd.DataFrame), iter(data), dshape=ds, chunksize=30,
+                scheduler=scheduler)
+    dfs = list(c)
+    assert [len(df) for df in dfs] == [30, 30, 30, 10]
+    tm.assert_frame_equal(pd.concat(dfs, ignore_index=True),
+                          pd.DataFrame(data, columns=['a', 'b']))
+
+    x = np.arange(100)
+    c = convert(chunks(np.ndarray), chunks(list)([list(x[:50]), list(x[50:])]),
+                scheduler=scheduler)
+    assert eq(convert(np.ndarray, c), x)
+
+
 def test_recarray():
     data = np.array([(1, 1.), (2, 2.)], dtype=[('a', 'i4'), ('b', 'f4')])
     result = convert(np.recarray, data)
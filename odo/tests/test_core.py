@@ -1,7 +1,12 @@
 from __future__ import absolute_import, division, print_function
 import warnings
+from multiprocessing.pool import ThreadPool
 
-from odo.core import NetworkDispatcher, path, FailedConversionWarning
+import pytest
+
+from odo.core import (NetworkDispatcher, NoPath, OOCTypes, data_size, path,
+                      FailedConversionWarning)
+import datashape
 from datashape import discover
 
 d = NetworkDispatcher('foo')
@@ -121,3 +126,246 @@ def test_ooc_behavior():
     assert ([(a, b, cost)
              for a, b, _, cost, in path(foo.graph, A, C, ooc_types=ooc)] ==
             [(A, C, 10.0)])
+
+
+def test_path_cache():
+    foo = NetworkDispatcher('foo')
+
+    class A(object): pass
+    class B(object): pass
+    class C(object): pass
+
+    foo.register(B, A, cost=1.0)(lambda x, **kwargs: 1)
+    foo.register(C, B, cost=1.0)(lambda x, **kwargs: 2)
+    assert foo.path_cache_info() == (0, 0, 0)
+
+    first = list(foo.path(A, C))
+    assert foo.path_cache_info() == (0, 1, 1)
+    assert list(foo.path(A(), C)) == first
+    assert foo.path_cache_info() == (1, 1, 1)
+
+    # excluded edges are part of the key
+    with pytest.raises(NoPath):
+        list(foo.path(A, C, excluded_edges={(B, C)}))
+    assert list(foo.path(A, C)) == first
+
+    # registering a new edge invalidates the cache
+    foo.register(C, A, cost=0.5)(lambda x, **kwargs: 3)
+    assert foo.path_cache_info() == (0, 0, 0)
+    assert [(a, b) for a, b, _, _ in foo.path(A, C)] == [(A, C)]
+
+
+def test_concurrent_conversions_with_excluded_edges():
+    foo = NetworkDispatcher('foo')
+
+    class A(object): pass
+    class B(object): pass
+    class C(object): pass
+
+    discover.register((A, B, C))(lambda x: 'int')
+    foo.register(B, A, cost=1.0)(lambda x, **kwargs: 'via B')
+    foo.register(C, B, cost=1.0)(lambda x, **kwargs: x)
+    foo.register(C, A, cost=10.0)(lambda x, **kwargs: 'direct')
+    edges = sorted(map(repr, foo.graph.edges()))
+
+    def work(i):
+        foo.clear_path_cache()
+        if i % 2:
+            return (foo(C, A(), excluded_edges={(B, C)}) == 'direct' and
+                    [p[:2] for p in path(foo.graph, A, C,
+                                         excluded_edges={(A, B)})] ==
+                    [(A, C)])
+        return (foo(C, A()) == 'via B' and
+                [p[:2] for p in path(foo.graph, A, C)] == [(A, B), (B, C)])
+
+    pool = ThreadPool(8)
+    try:
+        results = pool.map(work, range(2000))
+    finally:
+        pool.terminate()
+
+    assert all(results)
+    assert sorted(map(repr, foo.graph.edges())) == edges
+
+
+def test_ooc_graph_is_maintained_incrementally():
+    foo = NetworkDispatcher('foo')
+    oocs = OOCTypes()
+
+    class A(object): pass
+    class B(object): pass
+    class C(object): pass
+    class D(C): pass
+
+    foo.register(B, A, cost=1.0)(lambda x, **kwargs: 1)
+    foo.register(C, B, cost=1.0)(lambda x, **kwargs: 2)
+    foo.register(C, A, cost=10.0)(lambda x, **kwargs: 3)
+
+    assert set(foo.ooc_graph(oocs).nodes()) == set()
+
+    oocs |= set([A, C])
+    g = foo.ooc_graph(oocs)
+    assert set(g.nodes()) == set([A, C])
+    assert set(g.edges()) == set([(A, C)])
+    assert [p[:2] for p in foo.path(A, C, ooc_types=oocs)] == [(A, C)]
+
+    # new edges between out-of-core types show up without a rebuild
+    foo.register(D, A, cost=1.0)(lambda x, **kwargs: 4)
+    assert foo.ooc_graph(oocs) is g
+    assert set(g.edges()) == set([(A, C), (A, D)])
+
+    oocs.add(B)
+    assert set(foo.ooc_graph(oocs).edges()) == set([(A, B), (B, C), (A, C),
+                                                    (A, D)])
+    assert [p[:2] for p in foo.path(A, C, ooc_types=oocs)] == [(A, B), (B, C)]
+
+    oocs.discard(B)
+    assert set(foo.ooc_graph(oocs).nodes()) == set([A, C, D])
+
+
+def test_ooc_graph_matches_subgraph():
+    from odo.convert import convert, ooc_types
+    oocs = tuple(ooc_types)
+    expected = convert.graph.subgraph([n for n in convert.graph.nodes()
+                                       if issubclass(n, oocs)])
+    g = convert.ooc_graph()
+    assert set(g.nodes()) == set(expected.nodes())
+    assert set(g.edges()) == set(expected.edges())
+
+
+def test_size_aware_routing():
+    foo = NetworkDispatcher('foo')
+    oocs = OOCTypes()
+
+    class OnDisk(object): pass
+    class Chunked(object): pass
+    class InMemory(object): pass
+    class Target(object): pass
+
+    oocs |= set([OnDisk, Chunked, Target])
+    discover.register((OnDisk, Chunked, InMemory, Target))(lambda x: 'int')
+    foo.register(InMemory, OnDisk, cost=1.0)(lambda x, **kwargs: 'memory')
+    foo.register(Target, InMemory, cost=1.0)(lambda x, **kwargs: x)
+    foo.register(Chunked, OnDisk, cost=2.0)(lambda x, **kwargs: 'chunked')
+    foo.register(Target, Chunked, cost=2.0)(lambda x, **kwargs: x)
+
+    small = '10 * {a: int64, b: float64}'
+    large = '%d * {a: int64, b: float64}' % foo.in_memory_nbytes
+
+    def route(ds):
+        return [b for _, b, _, _ in foo.path(OnDisk, Target, dshape=ds,
+                                             ooc_types=oocs)]
+
+    assert route(small) == [InMemory, Target]
+    assert route(None) == route(large) == [Chunked, Target]
+    assert route('var * int64') == [Chunked, Target]
+    assert foo(Target, OnDisk(), dshape=small, ooc_types=oocs) == 'memory'
+    assert foo(Target, OnDisk(), dshape=large, ooc_types=oocs) == 'chunked'
+
+
+def test_size_dependent_costs():
+    foo = NetworkDispatcher('foo')
+
+    class A(object): pass
+    class B(object): pass
+    class C(object): pass
+
+    def cost(size):
+        return 1.0 if size.nrows is None else size.nrows * 0.1
+
+    foo.register(C, A, cost=cost)(lambda x, **kwargs: x)
+    foo.register(B, A, cost=5.0)(lambda x, **kwargs: x)
+    foo.register(C, B, cost=5.0)(lambda x, **kwargs: x)
+
+    assert [b for _, b, _, _ in foo.path(A, C)] == [C]
+    assert [b for _, b, _, _ in foo.path(A, C, dshape='4 * int32')] == [C]
+    assert ([b for _, b, _, _ in foo.path(A, C, dshape='1000 * int32')] ==
+            [B, C])
+    assert [cost for _, _, _, cost in foo.path(A, C, dshape='4 * int32')] == [
+        0.4,
+    ]
+
+
+def test_data_size():
+    assert data_size('var * {a: int64}') == (None, 8)
+    assert data_size('5 * 2 * int32') == (8, 8)
+    assert data_size('0 * int32').nbytes == 0
+    assert data_size('var * 3 * var * int32') == (None, None)
+    assert data_size('int32') == (1, 4)
+
+
+def test_failed_edges_are_remembered():
+    foo = NetworkDispatcher('foo')
+    calls = []
+
+    def badfunc(*args, **kwargs):
+        calls.append(1)
+        raise NotImplementedError('no way')
+
+    class A(object): pass
+    class B(object): pass
+    class C(object): pass
+    discover.register((A, B, C))(lambda x: 'int')
+    foo.register(B, A, cost=1.0)(lambda x, **kwargs: B())
+    foo.register(C, B, cost=1.0)(badfunc)
+    foo.register(C, A, cost=10.0)(lambda x, **kwargs: 2)
+
+    with warnings.catch_warnings(record=True) as ws:
+        warnings.simplefilter('always')
+        assert foo(C, A()) == 2
+        assert foo(C, A()) == 2
+
+    assert len(ws) == 1
+    assert len(calls) == 1
+    assert foo.failed_edges() == {(B, C): 'NotImplementedError: no way'}
+
+    # the failed edge is still used when there is no other way
+    with warnings.catch_warnings(record=True) as ws:
+        warnings.simplefilter('always')
+        with pytest.raises(NoPath):
+            foo(C, B())
+    assert len(calls) == 2
+
+    foo.clear_failed_edges()
+    assert foo.failed_edges() == {}
+    with warnings.catch_warnings(record=True) as ws:
+        warnings.simplefilter('always')
+        assert foo(C, A()) == 2
+    assert len(calls) == 3
+
+
+def test_failed_edges_are_remembered_per_input():
+    foo = NetworkDispatcher('foo')
+    calls = []
+
+    def picky(x, dshape=None, **kwargs):
+        calls.append(str(dshape.measure))
+        if dshape.measure == datashape.float64:
+            raise NotImplementedError('no floats')
+        return list(x)
+
+    foo.register(list, tuple, cost=1.0)(picky)
+    foo.register(list, set, cost=1.0)(lambda x, **kwargs: sorted(x))
+    foo.register(set, tuple, cost=10.0)(lambda x, **kwargs: set(x))
+
+    with warnings.catch_warnings(record=True) as ws:
+        warnings.simplefilter('always')
+        assert foo(list, (2.0, 1.0)) == [1.0, 2.0]
+        assert foo(list, (2.0, 1.0)) == [1.0, 2.0]
+    assert len(ws) == 1
+    assert calls == ['float64']
+
+    # the edge is still tried for data of another type
+    assert foo(list, (2, 1)) == [2, 1]
+    assert calls == ['float64', 'int64']
+    assert foo.avoided_edges(dshape='2 * float64') == {(tuple, list)}
+    assert foo.avoided_edges(dshape='2 * int64') == set()
+    assert foo.failed_edges() == {(tuple, list): 'NotImplementedError: '
+                                                 'no floats'}
+
+
+def test_failed_edges_expire():
+    foo = NetworkDispatcher('foo')
+    foo.failed_edge_ttl = 0
+    foo.mark_failed(int, float, 'NotImplementedError')
+    assert foo.failed_edges() == {}
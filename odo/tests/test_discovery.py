@@ -0,0 +1,60 @@
+from __future__ import absolute_import, division, print_function
+
+import os
+
+import pytest
+from datashape import dshape
+
+from odo.backends.csv import CSV
+from odo.discovery import (DiscoverCache, cached_discover, discover_cache,
+                           fingerprint)
+from odo.utils import filetext, tmpfile
+
+
+def test_cached_discover_csv():
+    discover_cache.clear()
+    with filetext('a,b\n1,2\n3,4\n', extension='csv') as fn:
+        ds = cached_discover(CSV(fn))
+        assert ds == dshape('var * {a: int64, b: int64}')
+        assert cached_discover(CSV(fn)) is ds
+        assert discover_cache.hits == 1
+
+        # different options are different keys
+        assert fingerprint(CSV(fn)) != fingerprint(CSV(fn, has_header=False))
+
+        with open(fn, 'a') as f:
+            f.write('5,6.5\n')
+        assert cached_discover(CSV(fn)) == dshape('var * {a: int64, '
+                                                  'b: float64}')
+
+
+def test_no_fingerprint():
+    assert fingerprint([1, 2, 3]) is None
+    assert fingerprint(CSV('/no/such/file.csv')) is None
+    assert cached_discover([1, 2, 3]) == dshape('3 * int64')
+
+
+def test_persist():
+    with tmpfile() as dirname:
+        key = ('file', 'CSV', '/a.csv', 1, 2)
+        DiscoverCache(dirname).set(key, dshape('var * int32'))
+        DiscoverCache(dirname).set(('sql', 'url', 't'), dshape('int32'))
+        assert len(os.listdir(dirname)) == 1
+
+        cache = DiscoverCache(dirname)
+        assert cache.get(key) == dshape('var * int32')
+        assert cache.get(('sql', 'url', 't')) is None
+
+        cache.forget(key)
+        assert DiscoverCache(dirname).get(key) is None
+
+
+def test_sql_tables_are_not_cached():
+    sa = pytest.importorskip('sqlalchemy')
+    from odo import discover, odo
+    with tmpfile('db') as fn:
+        uri = 'sqlite:///%s::t' % fn
+        t = odo([(1, 'a')], uri, dshape='var * {x: int64, y: string}')
+        # a table may be altered behind our back, and its url holds secrets
+        assert fingerprint(t) is None
+        assert cached_discover(t) == discover(t)
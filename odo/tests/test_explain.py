@@ -0,0 +1,97 @@
+from __future__ import absolute_import, division, print_function
+
+import os
+from collections import Iterator
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from odo import convert, discover, explain, odo
+from odo.append import object_to_list
+from odo.backends.csv import CSV
+from odo.core import path_cost
+from odo.utils import tmpfile
+
+
+def test_explain_type_target():
+    e = explain(np.arange(5), list)
+    assert [(p.convert_from, p.convert_to) for p in e.path] == [(np.ndarray,
+                                                                  list)]
+    assert e.cost == path_cost(e.path)
+    assert 'ndarray -> list' in e.render()
+
+
+def test_explain_ranks_alternatives():
+    with tmpfile('.csv') as fn:
+        odo(pd.DataFrame({'a': [1, 2]}), fn)
+        e = explain(fn, pd.DataFrame, k=3)
+        assert isinstance(e.source, CSV)
+        assert str(e.dshape) == 'var * {a: int64}'
+        assert len(e.paths) == 3
+        costs = [path_cost(p) for p in e.paths]
+        assert costs == sorted(costs)
+        assert all(p[0].convert_from is CSV for p in e.paths)
+        assert all(p[-1].convert_to is pd.DataFrame for p in e.paths)
+
+
+def test_explain_path_is_the_path_odo_takes():
+    with tmpfile('.csv') as fn:
+        odo(pd.DataFrame({'a': [1, 2]}), fn)
+        e = explain(fn, pd.DataFrame)
+        _, t = odo(fn, pd.DataFrame, trace=True)
+        taken = [(s.convert_from, s.convert_to) for s in t.spans
+                 if not s.depth]
+        assert [(p.convert_from, p.convert_to) for p in e.path] == taken
+        # a small file is read in one go
+        assert taken == [(CSV, pd.DataFrame)]
+
+
+def test_explain_does_not_execute():
+    L = [1]
+    e = explain((2, 3), L)
+    assert L == [1]
+    assert e.append is object_to_list
+    assert e.via is list
+    assert e.path[-1].convert_to is list
+    assert 'object_to_list' in str(e)
+
+
+def test_explain_target_that_does_not_exist():
+    sa = pytest.importorskip('sqlalchemy')
+    with tmpfile('.db') as fn:
+        e = explain([(1, 'a')], 'sqlite:///%s::t' % fn,
+                    dshape='var * {x: int64, y: string}')
+        assert not os.path.exists(fn)
+        assert e.target == 'sqlite:///%s::t' % fn
+        assert e.resource is not None
+        assert e.target_type is sa.Table
+        assert e.via is Iterator
+        assert e.path[-1].convert_to is Iterator
+        assert 'Table' in str(e)
+
+
+def test_explain_shows_the_path_inside_append():
+    pytest.importorskip('sqlalchemy')
+    with tmpfile('.csv') as fn:
+        odo(pd.DataFrame({'a': [1, 2]}), fn)
+        with tmpfile('.db') as db:
+            e = explain(fn, 'sqlite:///%s::t' % db)
+            assert not os.path.exists(db)
+            assert e.path[0].convert_from is CSV
+            assert e.path[-1].convert_to is Iterator
+            assert 'CSV -> ' in str(e)
+
+
+def test_explain_avoids_failed_edges():
+    e = explain(np.arange(5), list)
+    convert.mark_failed(np.ndarray, list, 'NotImplementedError: test',
+                        dshape=discover(np.arange(5)))
+    try:
+        f = explain(np.arange(5), list)
+    finally:
+        convert.clear_failed_edges()
+    assert (e.path[0].convert_from, e.path[0].convert_to) == (np.ndarray,
+                                                               list)
+    assert [(p.convert_from, p.convert_to) for p in f.path] != \
+        [(p.convert_from, p.convert_to) for p in e.path]
@@ -0,0 +1,75 @@
+from __future__ import absolute_import, division, print_function
+
+import subprocess
+import sys
+
+import pytest
+
+from odo.graph import Graph, NoPath
+
+
+@pytest.fixture
+def g():
+    g = Graph()
+    g.add_edge('a', 'b', cost=1.0)
+    g.add_edge('b', 'd', cost=1.0)
+    g.add_edge('a', 'c', cost=1.0)
+    g.add_edge('c', 'd', cost=1.0)
+    g.add_edge('a', 'd', cost=3.0)
+    return g
+
+
+def test_structure(g):
+    assert g.nodes() == ['a', 'b', 'd', 'c']
+    assert len(g) == 4 and 'a' in g and 'e' not in g
+    assert g.edges() == [('a', 'b'), ('a', 'c'), ('a', 'd'), ('b', 'd'),
+                         ('c', 'd')]
+    assert g['a']['d'] == {'cost': 3.0}
+    assert g.successors('a') == ['b', 'c', 'd']
+    assert sorted(g.predecessors('d')) == ['a', 'b', 'c']
+    assert g.has_edge('a', 'b') and not g.has_edge('b', 'a')
+
+    s = g.subgraph(['a', 'b', 'd'])
+    assert s.edges() == [('a', 'b'), ('a', 'd'), ('b', 'd')]
+    assert g.copy().edges(data=True) == g.edges(data=True)
+
+
+def test_shortest_path(g):
+    # ties go to the path found first
+    assert g.shortest_path('a', 'd') == ['a', 'b', 'd']
+    assert g.shortest_path('a', 'a') == ['a']
+    assert g.shortest_path('a', 'd',
+                           excluded_edges=[('a', 'b')]) == ['a', 'c', 'd']
+    assert g.shortest_path('a', 'd',
+                           weight=lambda a, b, d: 1.0) == ['a', 'd']
+    with pytest.raises(NoPath):
+        g.shortest_path('d', 'a')
+    with pytest.raises(NoPath):
+        g.shortest_path('a', 'e')
+
+
+def test_routes_follow_changes(g):
+    g.precompute()
+    assert g.shortest_path('a', 'd') == ['a', 'b', 'd']
+    g.set_edge_data('a', 'd', {'cost': 0.5})
+    assert g.shortest_path('a', 'd') == ['a', 'd']
+    g.remove_edge('a', 'd')
+    assert g.shortest_path('a', 'd') == ['a', 'b', 'd']
+    g.add_edge('a', 'b', cost=10.0)
+    assert g.shortest_path('a', 'd') == ['a', 'c', 'd']
+
+
+def test_shortest_paths(g):
+    assert g.shortest_paths('a', 'd', 5) == [['a', 'b', 'd'],
+                                             ['a', 'c', 'd'],
+                                             ['a', 'd']]
+    assert g.shortest_paths('a', 'd', 1) == [['a', 'b', 'd']]
+    assert g.shortest_paths('a', 'd', 5, excluded_edges=[('a', 'd')]) == [
+        ['a', 'b', 'd'], ['a', 'c', 'd']]
+    assert g.shortest_paths('d', 'a', 5) == []
+
+
+def test_import_does_not_import_networkx():
+    code = 'import sys, odo; print("networkx" in sys.modules)'
+    out = subprocess.check_output([sys.executable, '-c', code])
+    assert out.strip() == b'False'
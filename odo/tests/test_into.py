@@ -56,6 +56,12 @@ def test_into_string_dshape():
                                   np.array([1, 2, 3], dtype='float64'))
 
 
+def test_into_string_dshape_is_parsed_once():
+    from odo.into import parse_dshape
+    assert parse_dshape('var * float64') is parse_dshape('var * float64')
+    assert odo((1, 2), list, dshape='var * float64') == [1.0, 2.0]
+
+
 @pytest.mark.parametrize('dshape', [1, object()])
 def test_into_invalid_dshape(dshape):
     with pytest.raises(TypeError):
@@ -0,0 +1,47 @@
+from __future__ import absolute_import, division, print_function
+
+import numpy as np
+import pandas as pd
+
+from odo import memory, odo
+from odo.chunks import chunks
+from odo.memory import chunk_rows, row_nbytes
+
+
+def test_row_nbytes():
+    assert row_nbytes('var * int32') == 4
+    assert row_nbytes('var * 3 * float64') == 24
+    assert row_nbytes('var * 2 * string') == 16 + 2 * memory.object_nbytes
+    assert row_nbytes('var * {a: ?string, b: int8}') == 9 + 64
+    assert row_nbytes('var * var * int64') is None
+
+
+def test_chunk_rows():
+    ds = 'var * {a: int64, b: float64}'
+    assert chunk_rows(ds, memory_limit=1600) == 100
+    assert chunk_rows(ds, memory_limit=1) == 1
+    assert chunk_rows(ds, memory_limit=1600, maxrows=10) == 10
+    assert chunk_rows(ds, chunksize=7, memory_limit=1600) == 7
+    assert chunk_rows(None, default=5) == 5
+    assert chunk_rows(data=np.zeros(10), memory_limit=80) == 10
+
+
+def test_global_memory_limit(monkeypatch):
+    monkeypatch.setattr(memory, 'default_memory_limit', 800)
+    assert chunk_rows('var * int64') == 100
+    c = odo(np.arange(1000), chunks(np.ndarray))
+    assert [len(x) for x in c] == [100] * 10
+
+
+def test_memory_limit_drives_chunk_sizes():
+    x = np.zeros(1000, dtype=[('a', 'i8'), ('b', 'f8')])
+    c = odo(x, chunks(np.ndarray), memory_limit=1600)
+    assert [len(chunk) for chunk in c] == [100] * 10
+
+    df = pd.DataFrame(x)
+    c = odo(df, chunks(pd.DataFrame), memory_limit=16000)
+    assert [len(chunk) for chunk in c] == [1000]
+
+    c = odo(iter(x.tolist()), chunks(pd.DataFrame),
+            dshape='var * {a: int64, b: float64}', memory_limit=3200)
+    assert [len(chunk) for chunk in c] == [200] * 5
@@ -0,0 +1,120 @@
+from __future__ import absolute_import, division, print_function
+
+import time
+from functools import partial
+
+import numpy as np
+import pytest
+from datashape import discover, dshape
+
+from odo import chunks, odo
+from odo.pipeline import pipelined, prefetch
+
+
+def wait_for(cond, timeout=5):
+    end = time.time() + timeout
+    while not cond() and time.time() < end:
+        time.sleep(0.001)
+    return cond()
+
+
+def counting(n, produced):
+    for i in range(n):
+        produced.append(i)
+        yield i
+
+
+def test_prefetch_runs_ahead_up_to_depth():
+    produced = []
+    it = prefetch(counting(10, produced), depth=3)
+    assert next(it) == 0
+    # one item handed over, three buffered and one waiting to be put
+    assert wait_for(lambda: len(produced) == 5)
+    time.sleep(0.01)
+    assert len(produced) == 5
+    assert list(it) == list(range(1, 10))
+
+
+def test_prefetch_nbytes():
+    produced = []
+
+    def arrays():
+        for i in range(10):
+            produced.append(i)
+            yield np.zeros(100, dtype='i8')  # 800 bytes
+
+    it = prefetch(arrays(), depth=100, nbytes=1600)
+    next(it)
+    assert wait_for(lambda: len(produced) >= 3)
+    time.sleep(0.01)
+    assert len(produced) <= 4
+    assert len(list(it)) == 9
+
+
+def test_prefetch_raises():
+    def fail():
+        yield 1
+        raise ValueError('fail')
+
+    it = prefetch(fail())
+    assert next(it) == 1
+    with pytest.raises(ValueError):
+        next(it)
+
+
+def test_prefetch_close_stops_producer():
+    produced = []
+    it = prefetch(counting(1000, produced), depth=1)
+    next(it)
+    it.close()
+    time.sleep(0.01)
+    assert len(produced) < 5
+
+
+def test_prefetch_close_closes_source():
+    closed = []
+
+    def source():
+        try:
+            for i in range(1000):
+                yield i
+        finally:
+            closed.append(True)
+
+    it = prefetch(source(), depth=1)
+    next(it)
+    it.close()
+    assert wait_for(lambda: closed)
+
+
+def test_pipelined_chunks():
+    c = chunks(list)([[1, 2], [3]])
+    p = pipelined(c)
+    assert type(p) is type(c)
+    assert list(p) == [[1, 2], [3]]
+    assert list(p) == [[1, 2], [3]]
+    assert pipelined([1, 2]) == [1, 2]
+
+
+def test_pipelined_keeps_chunks_attributes():
+    calls = []
+
+    def load(i):
+        calls.append(i)
+        return [[1, 2], [3]][i]
+
+    c = chunks(list)([partial(load, 0), partial(load, 1)],
+                     scheduler='threads')
+    assert discover(c) == dshape('var * int64')
+    p = pipelined(c)
+    assert p.scheduler == 'threads'
+    assert discover(p) == dshape('var * int64')
+    assert list(p) == [[1, 2], [3]]
+    assert calls == [0, 1]
+
+
+def test_odo_pipeline():
+    c = chunks(list)([[1, 2], [3]])
+    assert odo(c, list, pipeline=True) == [1, 2, 3]
+    L = [0]
+    assert odo(c, L, pipeline=True, pipeline_depth=1) == [0, 1, 2, 3]
@@ -0,0 +1,95 @@
+from __future__ import absolute_import, division, print_function
+
+import pickle
+import warnings
+
+import numpy as np
+import pandas as pd
+import pandas.util.testing as tm
+import pytest
+
+from odo import odo, plan, Plan, discover, convert
+from odo.backends.csv import CSV
+from odo.chunks import chunks
+from odo.core import FailedConversionWarning, PathPart
+from odo.plan import _edge_kwargs
+from odo.utils import tmpfile
+
+
+@pytest.yield_fixture
+def csvs():
+    with tmpfile('.csv') as a, tmpfile('.csv') as b:
+        odo(pd.DataFrame({'x': [1, 2], 'y': [1.0, 2.0]}), a)
+        odo(pd.DataFrame({'x': [3], 'y': [3.0]}), b)
+        yield a, b
+
+
+def test_plan_from_example(csvs):
+    a, b = csvs
+    p = plan(a, pd.DataFrame)
+    assert p.source_type is CSV
+    assert p.dshape == discover(CSV(a))
+    assert p.path[-1].convert_to is pd.DataFrame
+    assert len(p.edge_kwargs) == len(p.path)
+
+    tm.assert_frame_equal(p.run(b), odo(b, pd.DataFrame))
+    tm.assert_frame_equal(p.run(CSV(a)), odo(a, pd.DataFrame))
+
+
+def test_plan_is_picklable(csvs):
+    a, b = csvs
+    p = plan(CSV, pd.DataFrame, dshape='var * {x: int64, y: float64}')
+    assert any(issubclass(part.convert_to, chunks(pd.DataFrame))
+               for part in p.path)
+    q = pickle.loads(pickle.dumps(p))
+    assert q.path == p.path
+    assert q.dshape == p.dshape
+    tm.assert_frame_equal(q.run(b), odo(b, pd.DataFrame))
+
+
+def test_plan_appends_to_string_target(csvs):
+    a, b = csvs
+    with tmpfile('.db') as db:
+        p = plan(a, 'sqlite:///%s::t' % db)
+        p.run(a)
+        p.run(b)
+        p = pickle.loads(pickle.dumps(p))
+        p.run(b)
+        assert odo('sqlite:///%s::t' % db, list) == [(1, 1.0), (2, 2.0),
+                                                     (3, 3.0), (3, 3.0)]
+
+
+def test_plan_filters_kwargs():
+    def f(x, a=1, dshape=None, excluded_edges=None):
+        return [a] * len(x)
+
+    p = plan(np.ndarray, list, a=2, b=3)
+    assert p.edge_kwargs == ({'a': 2, 'b': 3},)
+
+    p.path = (PathPart(np.ndarray, list, f, 1.0),)
+    p.edge_kwargs = (_edge_kwargs(f, p.kwargs),)
+    assert p.edge_kwargs == ({'a': 2},)
+    assert p.run(np.arange(2)) == [2, 2]
+
+
+def test_plan_source_type_mismatch():
+    p = plan(np.ndarray, list)
+    with pytest.raises(TypeError):
+        p.run((1, 2))
+
+
+def test_plan_reroutes_failing_edges():
+    def fails(x, **kwargs):
+        raise NotImplementedError()
+
+    p = Plan(tuple, list, path=[PathPart(tuple, list, fails, 1.0)],
+             edge_kwargs=[{}])
+    try:
+        with warnings.catch_warnings(record=True) as ws:
+            warnings.simplefilter('always')
+            assert p.run((1, 2)) == [1, 2]
+        assert any(isinstance(w.message, FailedConversionWarning)
+                   for w in ws)
+        assert (tuple, list) in convert.failed_edges()
+    finally:
+        convert.clear_failed_edges()
@@ -0,0 +1,82 @@
+from __future__ import absolute_import, division, print_function
+
+from collections import Iterator
+
+import numpy as np
+import pandas as pd
+import pandas.util.testing as tm
+import pytest
+from datashape import dshape
+
+from odo import RecordBatch, chunks, convert, discover, odo
+from odo.recordbatch import rows_to_record_batch
+from odo.utils import measure
+
+
+x = np.array([(1, 1.5, 'a'), (2, 2.5, 'b'), (3, 3.5, 'c')],
+             dtype=[('i', 'i8'), ('f', 'f8'), ('s', 'O')])
+
+
+def test_record_batch():
+    b = RecordBatch([('a', [1, 2]), ('b', np.array([1.0, 2.0]))])
+    assert len(b) == 2
+    assert b.names == ['a', 'b']
+    assert b['a'].tolist() == [1, 2]
+    assert measure(b) == (2, 32)
+    with pytest.raises(KeyError):
+        b['c']
+    assert RecordBatch({'a': [1], 'b': [2]}, names=['b', 'a']).names == [
+        'b', 'a']
+    with pytest.raises(ValueError):
+        RecordBatch([('a', [1, 2]), ('b', [1])])
+    assert len(RecordBatch([])) == 0
+
+
+def test_discover():
+    assert discover(convert(RecordBatch, x)) == dshape(
+        '3 * {i: int64, f: float64, s: ?string}')
+
+
+def test_numpy_round_trip_shares_memory():
+    b = convert(RecordBatch, x)
+    assert np.may_share_memory(b['i'], x)
+    y = convert(np.ndarray, b)
+    assert y.dtype == x.dtype
+    assert y.tolist() == x.tolist()
+
+
+def test_dataframe_round_trip():
+    df = pd.DataFrame(x)
+    b = convert(RecordBatch, df)
+    assert b.names == ['i', 'f', 's']
+    tm.assert_frame_equal(convert(pd.DataFrame, b), df)
+
+
+def test_iterator():
+    b = convert(RecordBatch, x)
+    assert list(convert(Iterator, b)) == x.tolist()
+
+
+def test_rows_to_record_batch():
+    b = rows_to_record_batch([(1, None), (None, 'a')], ['a', 'b'],
+                             dshape='var * {a: ?int32, b: ?string}')
+    assert b['a'].dtype == np.dtype('f4')
+    assert np.isnan(b['a'][1])
+    assert b['b'].tolist() == [None, 'a']
+    b = rows_to_record_batch([], ['a', 'b'],
+                             dshape='var * {a: int32, b: ?string}')
+    assert len(b) == 0 and b['a'].dtype == np.dtype('i4')
+
+
+def test_chunks():
+    df = pd.DataFrame({'a': np.arange(10), 'b': np.arange(10) * 0.5})
+    c = odo(df, chunks(RecordBatch), chunksize=4)
+    assert [len(b) for b in c] == [4, 4, 2]
+    tm.assert_frame_equal(odo(c, pd.DataFrame), df)
+    assert eq(odo(odo(c, chunks(np.ndarray)), np.ndarray),
+              odo(df, np.ndarray))
+    assert list(odo(c, Iterator)) == list(odo(df, Iterator))
+
+
+def eq(a, b):
+    return (a == b).all()
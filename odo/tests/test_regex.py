@@ -4,6 +4,8 @@ from odo.regex import RegexDispatcher
 
 import re
 
+import pytest
+
 
 def test_regex_dispatcher():
     foo = RegexDispatcher('foo')
@@ -33,3 +35,45 @@ def test_regex_dispatcher():
     assert foo('0123') == '0123'
 
     assert a.__doc__ in foo.__doc__
+
+
+def test_add_lazy():
+    foo = RegexDispatcher('foo')
+    loaded = []
+
+    def load():
+        loaded.append(True)
+        foo.add(r'lazy://.*', lambda s: 'lazy')
+
+    foo.add(r'.*', lambda s: 'default', priority=1)
+    foo.add_lazy(r'lazy://.*', load)
+
+    assert foo('other') == 'default'
+    assert not loaded
+    assert foo('lazy://x') == 'lazy'
+    assert foo('lazy://y') == 'lazy'
+    assert loaded == [True]
+
+
+def test_first_match_in_priority_order():
+    for combine in [True, False]:
+        foo = RegexDispatcher('foo', combine=combine)
+        foo.add(r'(a)(.*)', lambda s: 'first')
+        foo.add(r'a.*', lambda s: 'second')
+        foo.add(r'ab', lambda s: 'high', priority=11)
+        foo.add(r'(b)\1', lambda s: 'backreference')
+        assert foo('ab') == 'high'
+        assert foo('ac') == 'first'
+        assert foo('bb') == 'backreference'
+        with pytest.raises(ValueError):
+            foo('c')
+
+
+def test_dispatch_cache():
+    foo = RegexDispatcher('foo', cache_size=2)
+    foo.add(r'.*', lambda s: 'default', priority=1)
+    assert foo('a') == foo('b') == foo('c') == 'default'
+    assert list(foo._cache) == ['b', 'c']
+
+    foo.add(r'c', lambda s: 'c')
+    assert foo('c') == 'c'
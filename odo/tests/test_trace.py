@@ -0,0 +1,104 @@
+from __future__ import absolute_import, division, print_function
+
+import json
+import warnings
+from functools import partial
+from multiprocessing.pool import ThreadPool
+from threading import current_thread
+
+import numpy as np
+
+from odo import odo, convert, chunks
+from odo.core import NetworkDispatcher, edge_observers
+from odo.pipeline import pipelined
+from odo.trace import Trace, trace
+
+
+def test_odo_trace_true():
+    result, t = odo(np.arange(5), list, trace=True)
+    assert result == [0, 1, 2, 3, 4]
+    assert isinstance(t, Trace)
+    [span] = t.spans
+    assert (span.convert_from, span.convert_to) == (np.ndarray, list)
+    assert span.rows_in == 5
+    assert span.nbytes_in == np.arange(5).nbytes
+    assert span.rows_out == 5
+    assert span.wall >= 0 and span.cpu >= 0
+    assert span.depth == 0
+    assert not span.rerouted
+
+
+def test_odo_trace_instance():
+    t = Trace()
+    assert odo((1, 2), list, trace=t) == [1, 2]
+    assert odo((1, 2), set, trace=t) == set([1, 2])
+    assert len(t.spans) == 2
+
+
+def test_trace_reroute():
+    d = NetworkDispatcher('test_trace_reroute')
+
+    @d.register(list, tuple, cost=1.0)
+    def fails(x, **kwargs):
+        raise NotImplementedError('nope')
+
+    @d.register(set, tuple, cost=1.0)
+    def to_set(x, **kwargs):
+        return set(x)
+
+    @d.register(list, set, cost=1.0)
+    def to_list(x, **kwargs):
+        return list(x)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        with trace() as t:
+            assert sorted(d(list, (1, 2))) == [1, 2]
+
+    failed, = t.reroutes
+    assert (failed.convert_from, failed.convert_to) == (tuple, list)
+    assert 'nope' in failed.error
+    assert [(s.convert_from, s.convert_to) for s in t.spans] == [
+        (tuple, list), (tuple, set), (set, list)]
+    assert 'failed' in t.render()
+
+
+def test_trace_export():
+    with trace() as t:
+        convert(list, np.arange(3))
+    d = json.loads(t.to_json())
+    [span] = d['spans']
+    assert span['convert_from'] == 'numpy.ndarray'
+    assert span['convert_to'] == 'builtins.list'
+    assert span['func'] == 'odo.convert.numpy_to_list'
+    assert 'ndarray -> list' in t.render()
+
+
+def test_trace_is_thread_local():
+    pool = ThreadPool(2)
+    try:
+        with trace() as t:
+            pool.map(lambda x: convert(list, x), [(1,), (2,)])
+    finally:
+        pool.close()
+        pool.join()
+    assert not t.spans
+    assert t not in edge_observers
+
+
+def test_trace_follows_worker_threads():
+    # chunks computed by the thread pool of imap_windowed
+    c = chunks(list)([partial(convert, list, (i,)) for i in range(3)])
+
+    # chunks produced in the thread of a pipeline
+    def produce():
+        return (convert(list, x) for x in [(0,), (1,)])
+    p = pipelined(chunks(list)(produce))
+
+    with trace() as t:
+        assert list(c) == [[0], [1], [2]]
+        assert list(p) == [[0], [1]]
+    assert len(t.spans) == 5
+    assert all(s.thread != current_thread().name for s in t.spans)
+    assert t.wall == 0
+    assert 'odo-prefetch' in t.render()
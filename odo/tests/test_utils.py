@@ -1,4 +1,13 @@
-from odo.utils import ext, iter_except, keywords, gentemp, records_to_tuples
+import pickle
+import time
+from functools import partial
+from threading import Lock
+
+import numpy as np
+import pytest
+
+from odo.utils import (ext, iter_except, keywords, gentemp, records_to_tuples,
+                       imap_windowed, pack, release, unpack)
 
 
 def test_ext():
@@ -24,6 +33,17 @@ def test_keywords():
     assert keywords(keywords) == ["func"]
 
 
+def test_keywords_are_memoized():
+    class A(object):
+        def __init__(self, a, b=1):
+            pass
+
+    kws = keywords(A)
+    assert kws == ['self', 'a', 'b']
+    kws.append('c')  # callers can not corrupt the cache
+    assert keywords(A) == ['self', 'a', 'b']
+
+
 def test_gentemp():
     i, _, data = next(gentemp([[1, 2], [3, 4]], start=1))
     assert i == 1 and data == [1, 2]
@@ -37,3 +57,106 @@ def test_records_to_tuples():
 
 def test_records_to_tuples_mismatch_passthrough():
     assert records_to_tuples('var * int', 'dummy') == 'dummy'
+
+
+def test_imap_windowed():
+    lock = Lock()
+    running = [0, 0]  # current, maximum
+
+    def f(i):
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        time.sleep(0.001)
+        with lock:
+            running[0] -= 1
+        return i
+
+    it = imap_windowed([partial(f, i) for i in range(20)], window=3)
+    assert list(it) == list(range(20))
+    assert 1 <= running[1] <= 3
+
+
+def test_imap_windowed_bounds_unconsumed_results():
+    started = []
+
+    def f(i):
+        started.append(i)
+        return i
+
+    it = imap_windowed([partial(f, i) for i in range(10)], window=2)
+    assert next(it) == 0
+    time.sleep(0.05)
+    assert len(started) <= 3
+
+
+def test_imap_windowed_nested():
+    def inner(i):
+        return list(imap_windowed([partial(pow, i, 2)] * 2, window=1))
+
+    funcs = [partial(inner, i) for i in range(10)]
+    assert list(imap_windowed(funcs, window=2)) == [[i ** 2] * 2
+                                                    for i in range(10)]
+
+
+def test_imap_windowed_raises():
+    def f():
+        raise ValueError('fail')
+
+    with pytest.raises(ValueError):
+        list(imap_windowed([f]))
+
+
+def _nested(i):
+    return list(imap_windowed([partial(pow, i, 2)] * 2, scheduler='processes'))
+
+
+def test_imap_windowed_schedulers():
+    from concurrent.futures import ThreadPoolExecutor
+    from multiprocessing.pool import ThreadPool
+
+    funcs = [partial(pow, 2, i) for i in range(6)]
+    expected = [2 ** i for i in range(6)]
+    pool, executor = ThreadPool(2), ThreadPoolExecutor(2)
+    try:
+        for scheduler in ['threads', 'processes', pool, executor]:
+            assert list(imap_windowed(funcs, scheduler=scheduler)) == expected
+    finally:
+        pool.terminate()
+        executor.shutdown()
+
+    assert (list(imap_windowed([partial(_nested, i) for i in range(3)],
+                               scheduler='processes')) ==
+            [[i ** 2] * 2 for i in range(3)])
+
+    with pytest.raises(ValueError):
+        list(imap_windowed(funcs, scheduler='fibers'))
+
+
+@pytest.mark.parametrize('n', [10, 100000])
+def test_pack(n):
+    import pandas as pd
+    df = pd.DataFrame({'a': np.arange(n), 'b': np.arange(n) * 0.5})
+    packed = pickle.loads(pickle.dumps(pack(df)))
+    assert unpack(packed).equals(df)
+
+
+def test_imap_windowed_releases_results_left_behind(monkeypatch):
+    import odo.utils
+    released = []
+    monkeypatch.setattr(odo.utils, 'release', released.append)
+    funcs = [partial(pow, 2, i) for i in range(6)]
+    results = imap_windowed(funcs, window=3, scheduler='processes')
+    assert next(results) == 1
+    results.close()
+    assert released == [2, 4]
+
+
+def test_release_frees_shared_memory():
+    shared_memory = pytest.importorskip('multiprocessing.shared_memory')
+    packed = pack(np.arange(100000))
+    assert packed.segment is not None
+    release(packed)
+    with pytest.raises(OSError):
+        shared_memory.SharedMemory(name=packed.segment)
+    release(packed)  # twice is fine
@@ -0,0 +1,212 @@
+from __future__ import absolute_import, division, print_function
+
+import json
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from threading import Lock, current_thread
+from timeit import default_timer
+
+from .core import edge_observers, type_name
+from .utils import active_traces, measure, traced_by
+
+__all__ = 'Span', 'Trace', 'trace'
+
+
+try:
+    cpu_time = time.thread_time  # py37+
+except AttributeError:
+    try:
+        cpu_time = time.process_time
+    except AttributeError:  # py2
+        cpu_time = time.clock
+
+
+class Span(namedtuple('Span', ['dispatcher', 'convert_from', 'convert_to',
+                               'func', 'depth', 'start', 'wall', 'cpu',
+                               'rows_in', 'nbytes_in', 'rows_out',
+                               'nbytes_out', 'error', 'thread'])):
+    """ The record of one edge run while tracing
+
+    ``start`` is the number of seconds since the trace began, ``wall`` and
+    ``cpu`` are the wall and CPU time spent in the edge. Rows and bytes are
+    ``None`` when they can not be measured cheaply, e.g. for iterators.
+    ``error`` describes the exception raised by the edge, if any; an edge that
+    raised ``NotImplementedError`` is routed around (see ``rerouted``).
+    ``depth`` is greater than zero for edges run by a conversion nested in
+    another edge of the same thread. ``thread`` is the name of the thread that
+    ran the edge.
+    """
+    __slots__ = ()
+
+    @property
+    def rerouted(self):
+        return self.error is not None
+
+    def to_dict(self):
+        d = self._asdict()
+        d['convert_from'] = type_name(self.convert_from)
+        d['convert_to'] = type_name(self.convert_to)
+        d['func'] = '%s.%s' % (getattr(self.func, '__module__', None),
+                               getattr(self.func, '__name__',
+                                       repr(self.func)))
+        return d
+
+
+class Trace(object):
+    """ The spans of every edge run by ``odo`` for the conversions of one
+    thread
+
+    Conversions run from the thread which started tracing are recorded, and
+    so are the edges that odo runs for them in its worker threads: those
+    producing pipelined chunks (see ``odo.pipeline.prefetch``) and those of
+    the thread pool of ``odo.utils.imap_windowed``. Edges run in worker
+    processes, or in threads started by other code, are not. Note that an
+    edge producing a lazy result, such as an ``Iterator``, is only timed
+    until it returns; the work is attributed to the edge that consumes it.
+
+    >>> from odo import odo
+    >>> with trace() as t:
+    ...     _ = odo((1, 2, 3), list)
+    >>> [(s.convert_from.__name__, s.convert_to.__name__) for s in t.spans]
+    [('tuple', 'list')]
+
+    See Also
+    --------
+    trace
+    odo.utils.measure
+    """
+    def __init__(self):
+        self.thread = None
+        self.started = None
+        self._spans = []
+        self._depths = {}
+        self._count = 0
+        self._lock = Lock()
+
+    @property
+    def spans(self):
+        return [span for _, span in sorted(self._spans, key=lambda x: x[0])]
+
+    @property
+    def reroutes(self):
+        """ The spans whose edges failed and were routed around """
+        return [span for span in self.spans if span.rerouted]
+
+    @property
+    def wall(self):
+        """ Total wall time of the top level edges of the thread which started
+        tracing
+        """
+        name = self.thread.name if self.thread is not None else None
+        return sum(span.wall for span in self.spans
+                   if not span.depth and span.thread == name)
+
+    # Edge observer protocol, see odo.core.edge_observers
+
+    def start(self, dispatcher, convert_from, convert_to, func, data):
+        if self not in active_traces():
+            return None
+        rows, nbytes = measure(data)
+        thread = current_thread()
+        with self._lock:
+            seq = self._count
+            self._count += 1
+            depth = self._depths.get(thread, 0)
+            self._depths[thread] = depth + 1
+        return (seq, dispatcher.name, convert_from, convert_to, func, depth,
+                rows, nbytes, default_timer(), cpu_time(), thread)
+
+    def finish(self, token, result):
+        self._record(token, measure(result), None)
+
+    def error(self, token, exception):
+        error = '%s: %s' % (type(exception).__name__, exception)
+        self._record(token, (None, None), error)
+
+    def _record(self, token, out, error):
+        if token is None:
+            return
+        end, cpu_end = default_timer(), cpu_time()
+        (seq, name, convert_from, convert_to, func, depth, rows, nbytes,
+         start, cpu_start, thread) = token
+        span = Span(name, convert_from, convert_to, func, depth,
+                    start - self.started, end - start, cpu_end - cpu_start,
+                    rows, nbytes, out[0], out[1], error, thread.name)
+        with self._lock:
+            if depth:
+                self._depths[thread] = depth
+            else:
+                del self._depths[thread]
+            self._spans.append((seq, span))
+
+    # Output
+
+    def to_dict(self):
+        return {'wall': self.wall,
+                'spans': [span.to_dict() for span in self.spans]}
+
+    def to_json(self, **kwargs):
+        """ The trace as a JSON string, ``kwargs`` are passed to json.dumps """
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def render(self):
+        """ A plain text table of the spans in this trace """
+        def fmt(x):
+            return '-' if x is None else str(x)
+
+        header = ('wall (s)', 'cpu (s)', 'rows in', 'rows out', 'bytes in',
+                  'bytes out', 'edge')
+        rows = [header]
+        for span in self.spans:
+            edge = '%s%s -> %s' % ('  ' * span.depth,
+                                   span.convert_from.__name__,
+                                   span.convert_to.__name__)
+            if self.thread is not None and span.thread != self.thread.name:
+                edge += '  [%s]' % span.thread
+            if span.rerouted:
+                edge += '  [failed: %s]' % span.error
+            rows.append(('%.6f' % span.wall, '%.6f' % span.cpu,
+                         fmt(span.rows_in), fmt(span.rows_out),
+                         fmt(span.nbytes_in), fmt(span.nbytes_out), edge))
+        widths = [max(len(row[i]) for row in rows)
+                  for i in range(len(header) - 1)]
+        return '\n'.join('  '.join([c.rjust(w) for c, w in zip(row, widths)] +
+                                   [row[-1]])
+                         for row in rows)
+
+    def __str__(self):
+        return self.render()
+
+    def __repr__(self):
+        return '<%s: %d spans, %.6fs>' % (type(self).__name__,
+                                          len(self._spans), self.wall)
+
+
+@contextmanager
+def trace(t=None):
+    """ Record a span for every conversion edge run in this block
+
+    >>> from odo import odo
+    >>> with trace() as t:  # doctest: +SKIP
+    ...     odo('myfile.csv', 'postgresql://hostname::tablename')
+    >>> print(t.render())  # doctest: +SKIP
+    >>> t.to_json()  # doctest: +SKIP
+
+    ``odo`` also accepts ``trace=True`` or ``trace=Trace()``.
+
+    See Also
+    --------
+    Trace
+    """
+    if t is None:
+        t = Trace()
+    t.thread = current_thread()
+    if t.started is None:
+        t.started = default_timer()
+    edge_observers.append(t)
+    try:
+        with traced_by([t]):
+            yield t
+    finally:
+        edge_observers.remove(t)
@@ -7,10 +7,14 @@ import datetime
 import tempfile
 import os
 import shutil
+import pickle
 import numpy as np
 
+from collections import deque
 from contextlib import contextmanager
-from multiprocessing.pool import ThreadPool
+from multiprocessing import cpu_count
+from multiprocessing.pool import Pool, ThreadPool
+from threading import Lock, local
 
 from multipledispatch import Dispatcher
 
@@ -21,7 +25,42 @@ from toolz import pluck, get, curry, keyfilter
 
 from .compatibility import unicode
 
+try:
+    from multiprocessing import shared_memory  # py38+, with pickle protocol 5
+except ImportError:
+    shared_memory = None
+
 sample = Dispatcher('sample')
+measure = Dispatcher('measure')
+
+
+@measure.register(object)
+def measure_object(data):
+    """ The number of rows and the number of bytes in ``data``
+
+    Only cheaply available information is reported; anything that can not be
+    found without consuming or scanning the data is ``None``. Conversions
+    call ``measure`` on their source every time they look up a path, so
+    implementations must not query databases or read data.
+
+    >>> measure([1, 2, 3])
+    (3, None)
+    >>> measure(np.zeros(4))
+    (4, 32)
+    >>> measure(iter([1, 2, 3]))
+    (None, None)
+    """
+    return None, None
+
+
+@measure.register((list, tuple, set))
+def measure_builtin(data):
+    return len(data), None
+
+
+@measure.register(np.ndarray)
+def measure_ndarray(x):
+    return (len(x) if x.ndim else 1), x.nbytes
 
 
 def iter_except(func, exception, first=None):
@@ -116,18 +155,57 @@ def tmpfile(extension='', dir=None):
                     pass
 
 
+try:
+    _getargspec = inspect.getfullargspec
+except AttributeError:  # py2
+    _getargspec = inspect.getargspec
+
+
+_keywords = {}
+
+
 def keywords(func):
     """ Get the argument names of a function
 
+    Results are memoized on ``func``.
+
     >>> def f(x, y=2):
     ...     pass
 
     >>> keywords(f)
     ['x', 'y']
     """
+    try:
+        return list(_keywords[func])
+    except (KeyError, TypeError):
+        pass
     if isinstance(func, type):
-        return keywords(func.__init__)
-    return inspect.getargspec(func).args
+        result = tuple(keywords(func.__init__))
+    else:
+        spec = _getargspec(func)
+        result = tuple(spec.args) + tuple(getattr(spec, 'kwonlyargs', ()))
+    try:
+        if len(_keywords) > 1024:
+            _keywords.clear()
+        _keywords[func] = result
+    except TypeError:
+        pass
+    return list(result)
+
+
+def accepts_kwargs(func):
+    """ Whether a function takes arbitrary keyword arguments
+
+    >>> accepts_kwargs(lambda x, **kwargs: x)
+    True
+    >>> accepts_kwargs(lambda x, y=1: x)
+    False
+    """
+    try:
+        spec = _getargspec(func)
+    except TypeError:
+        return False
+    return bool(getattr(spec, 'varkw', getattr(spec, 'keywords', None)))
 
 
 def cls_name(cls):
@@ -301,6 +379,266 @@ def pmap(f, iterable):
     return result
 
 
+_pools = {}
+_pool_lock = Lock()
+_worker = local()
+
+
+def _init_process_worker():
+    # calls made by a task run one after the other in the worker
+    _worker.active = True
+
+
+def thread_pool():
+    """ The thread pool shared by ``imap_windowed``, one per process """
+    return _shared_pool(ThreadPool)
+
+
+def process_pool():
+    """ The process pool used by ``imap_windowed(..., scheduler='processes')``
+    """
+    return _shared_pool(Pool)
+
+
+def _shared_pool(cls):
+    with _pool_lock:
+        pid, pool = _pools.get(cls, (None, None))
+        # neither threads nor pools survive a fork, start new ones in the child
+        if pool is None or pid != os.getpid():
+            if cls is Pool:
+                pool = Pool(cpu_count(), initializer=_init_process_worker)
+            else:
+                pool = cls(cpu_count())
+            _pools[cls] = os.getpid(), pool
+        return pool
+
+
+def _call_in_worker(func, traces=()):
+    _worker.active = True
+    with traced_by(traces):
+        return func()
+
+
+_tracing = local()
+
+
+def active_traces():
+    """ The traces recording the edges run in this thread, see ``odo.trace``
+    """
+    return getattr(_tracing, 'traces', ())
+
+
+@contextmanager
+def traced_by(traces):
+    """ Record the edges run in this thread in the block into ``traces`` too
+
+    Worker threads started by odo run their work with the traces active in
+    the thread that handed the work over.
+    """
+    old = active_traces()
+    _tracing.traces = old + tuple(t for t in traces if t not in old)
+    try:
+        yield
+    finally:
+        _tracing.traces = old
+
+
+def _call_in_process(func):
+    return pack(func())
+
+
+# results with at least this many bytes of out-of-band buffers are sent back
+# from worker processes through shared memory
+shared_memory_threshold = 2 ** 16
+
+
+class Packed(object):
+    """ A pickled object and its out-of-band buffers, see ``pack`` """
+    __slots__ = 'payload', 'buffers', 'segment', 'spans'
+
+    def __init__(self, payload, buffers=None, segment=None, spans=None):
+        self.payload = payload
+        self.buffers = buffers
+        self.segment = segment
+        self.spans = spans
+
+    def __getstate__(self):
+        return self.payload, self.buffers, self.segment, self.spans
+
+    def __setstate__(self, state):
+        self.payload, self.buffers, self.segment, self.spans = state
+
+
+def pack(obj):
+    """ Prepare ``obj`` to be sent back from a worker process
+
+    With pickle protocol 5 (Python 3.8+) the buffers of numpy arrays and
+    pandas blocks are pickled out-of-band and, when they are large, written
+    to a shared memory segment instead of being sent through the pool's
+    pipe. ``unpack`` copies them out of the segment, frees it and restores
+    the object; results that are not unpacked must be given to ``release``.
+    Without protocol 5 ``obj`` is returned as is.
+
+    >>> unpack(pack([1, 2, 3]))
+    [1, 2, 3]
+    """
+    if shared_memory is None:
+        return obj
+    buffers = []
+    payload = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    views = [b.raw() for b in buffers]
+    total = sum(v.nbytes for v in views)
+    if total < shared_memory_threshold:
+        return Packed(payload, buffers=[v.tobytes() for v in views])
+    segment = shared_memory.SharedMemory(create=True, size=total)
+    try:
+        spans, offset = [], 0
+        for v in views:
+            segment.buf[offset:offset + v.nbytes] = v
+            spans.append((offset, v.nbytes))
+            offset += v.nbytes
+    except BaseException:
+        segment.close()
+        segment.unlink()
+        raise
+    # the receiving process unlinks the segment
+    segment.close()
+    return Packed(payload, segment=segment.name, spans=spans)
+
+
+def unpack(obj):
+    """ The object packed by ``pack`` """
+    if not isinstance(obj, Packed):
+        return obj
+    if obj.segment is None:
+        return pickle.loads(obj.payload, buffers=obj.buffers)
+    segment = shared_memory.SharedMemory(name=obj.segment)
+    try:
+        buffers = [bytearray(segment.buf[offset:offset + n])
+                   for offset, n in obj.spans]
+    finally:
+        segment.close()
+        segment.unlink()
+    return pickle.loads(obj.payload, buffers=buffers)
+
+
+def release(obj):
+    """ Free the shared memory of a result of ``pack`` which will not be
+    unpacked
+    """
+    if not isinstance(obj, Packed) or obj.segment is None:
+        return
+    try:
+        segment = shared_memory.SharedMemory(name=obj.segment)
+    except OSError:  # already freed
+        return
+    segment.close()
+    segment.unlink()
+
+
+class _Ready(object):
+    """ The ``AsyncResult`` interface over a ``concurrent.futures.Future`` """
+    def __init__(self, future):
+        self.future = future
+
+    def get(self):
+        return self.future.result()
+
+
+def uses_processes(scheduler):
+    """ Whether ``imap_windowed`` runs functions in other processes with
+    ``scheduler``
+
+    >>> uses_processes('processes'), uses_processes('threads')
+    (True, False)
+    """
+    if scheduler is None or scheduler == 'threads':
+        return False
+    if scheduler == 'processes':
+        return True
+    if not (hasattr(scheduler, 'apply_async') or hasattr(scheduler, 'submit')):
+        raise ValueError("scheduler must be 'threads', 'processes' or a pool "
+                         "with an apply_async or submit method, got %r" %
+                         (scheduler,))
+    return not (isinstance(scheduler, ThreadPool) or
+                type(scheduler).__name__ == 'ThreadPoolExecutor')
+
+
+def _submitter(scheduler):
+    """ A function submitting ``func`` to ``scheduler`` and the function that
+    turns the result into the value of ``func()``
+    """
+    processes = uses_processes(scheduler)
+    if scheduler is None or scheduler == 'threads':
+        pool = thread_pool()
+    elif scheduler == 'processes':
+        pool = process_pool()
+    else:
+        pool = scheduler
+    if processes:
+        call, args = _call_in_process, lambda func: (func,)
+    else:
+        # edges run by the threads are traced like those of the caller
+        call, args = _call_in_worker, lambda func: (func, active_traces())
+    if hasattr(pool, 'apply_async'):
+        def submit(func):
+            return pool.apply_async(call, args(func))
+    else:
+        def submit(func):
+            return _Ready(pool.submit(call, *args(func)))
+    return submit, (unpack if processes else None)
+
+
+def imap_windowed(funcs, window=None, scheduler=None):
+    """ Call the functions ``funcs`` in a pool and yield their results in
+    order
+
+    At most ``window`` calls, by default one per CPU, are running or waiting
+    to be consumed at any time, so only that many results are held in memory.
+    Results are not kept once they have been yielded. Calls made from inside
+    one of the functions run one after the other in the calling thread.
+    When the consumer stops early, results still pending in processes are
+    waited for and their shared memory is freed.
+
+    ``scheduler`` is ``'threads'`` (the default) for a shared thread pool,
+    ``'processes'`` for a shared process pool, or a
+    ``multiprocessing.Pool``, ``ThreadPool`` or ``concurrent.futures``
+    executor. Functions sent to processes and their results must be
+    picklable; results are sent back with ``pack``.
+
+    >>> from functools import partial
+    >>> list(imap_windowed([partial(pow, 2, i) for i in range(5)], window=2))
+    [1, 2, 4, 8, 16]
+    """
+    funcs = iter(funcs)
+    if getattr(_worker, 'active', False):
+        for func in funcs:
+            yield func()
+        return
+
+    window = max(window or cpu_count(), 1)
+    submit, finish = _submitter(scheduler)
+    pending = deque()
+    try:
+        for func in funcs:
+            pending.append(submit(func))
+            if len(pending) >= window:
+                result = pending.popleft().get()
+                yield finish(result) if finish else result
+        while pending:
+            result = pending.popleft().get()
+            yield finish(result) if finish else result
+    finally:
+        # results of processes hold shared memory until they are unpacked,
+        # free those the consumer stopped before
+        while finish is not None and pending:
+            try:
+                result = pending.popleft().get()
+            except Exception:
+                continue
+            release(result)
+
+
 @curry
 def write(triple, writer):
     """Write a file using the input from `gentemp` using `writer` and return
@@ -40,6 +40,7 @@ def extras_require():
                           'bcolz',
                           'bokeh',
                           'ci',
+                          'dot',
                           'h5py',
                           'mongo',
                           'mysql',